@@ -0,0 +1,50 @@
+"""
+Compares solving every scraped puzzle one after another with `solve_puzzles_in_parallel`, including the time it takes
+the workers to start and load their radix trees. The parallel solver only pays off with enough CPUs to spread the
+puzzles over.
+"""
+import os
+import time
+
+from tabulate import tabulate
+
+from data.index_utils import get_cached_index
+from data.puzzles_utils import get_puzzles_from_file
+from spelling_bee_batch_solver import solve_puzzles_in_parallel
+from spelling_bee_solvers import get_bee_solutions_radix_tree
+
+repetitions = 3
+worker_counts = [1, 2, 4]
+
+
+def time_serial(puzzles) -> float:
+    start = time.perf_counter()
+    radix_tree = get_cached_index('radix_tree')
+    for p in puzzles:
+        get_bee_solutions_radix_tree(p.get_center(), p.get_others(), radix_tree)
+    return time.perf_counter() - start
+
+
+def time_parallel(puzzles, max_workers: int) -> float:
+    start = time.perf_counter()
+    for _ in solve_puzzles_in_parallel(puzzles, max_workers=max_workers):
+        pass
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    all_puzzles = list(get_puzzles_from_file().values())
+    # make sure the radix tree has been cached, so that the first run isn't counted as a cold cache
+    get_cached_index('radix_tree')
+
+    serial_min = min(time_serial(all_puzzles) for _ in range(repetitions))
+    rows = [['Serial', serial_min, 1.0]]
+    for workers in worker_counts:
+        parallel_min = min(time_parallel(all_puzzles, workers) for _ in range(repetitions))
+        rows.append([f'Parallel ({workers} workers)', parallel_min, serial_min / parallel_min])
+
+    print(f"Puzzles:\t\t{len(all_puzzles)}")
+    print(f"CPUs:\t\t\t{os.cpu_count()}")
+    print(f"Repetitions:\t{repetitions}")
+    print()
+    print(tabulate(rows, headers=['Strategy', 'Min Time (s)', 'Speedup']))
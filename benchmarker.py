@@ -2,21 +2,28 @@ import timeit
 
 from tabulate import tabulate
 
-from data.dictionary_utils import get_benchmarking_dictionary
+from data.dictionary_utils import get_benchmarking_dictionary, BENCHMARKING_DICTIONARY_PATH
+from data.index_utils import get_cached_index
 # noinspection PyUnresolvedReferences
-from spelling_bee_solvers import preprocess_get_bit_to_word_dict, preprocess_get_prefix_tree, \
-    preprocess_get_radix_tree, get_bee_solutions_naive, get_bee_solutions_bitwise, get_bee_solutions_prefix_tree, \
-    get_bee_solutions_radix_tree, preprocess_get_nested_prefix_tree, get_bee_solutions_nested_prefix_tree
+from spelling_bee_solvers import get_bee_solutions_naive, get_bee_solutions_bitwise, get_bee_solutions_prefix_tree, \
+    get_bee_solutions_radix_tree, get_bee_solutions_nested_prefix_tree, get_bee_solutions_bitwise_submask, \
+    get_bee_solutions_annotated_radix_tree, get_bee_solutions_compact_trie, get_bee_solutions_dawg
+# noinspection PyUnresolvedReferences
+from spelling_bee_solvers_numpy import preprocess_get_numpy_word_masks, get_bee_solutions_numpy
 
 # NYT Spelling Bee Puzzle from 2019/06/08 which had the most official solutions
 benchmark_center = 'o'
 benchmark_others = 'ctpnme'
 benchmarking_word_list = get_benchmarking_dictionary()
 
-bit_to_word_dict = preprocess_get_bit_to_word_dict(benchmarking_word_list)
-prefix_tree = preprocess_get_prefix_tree(benchmarking_word_list)
-nested_prefix_tree = preprocess_get_nested_prefix_tree('', benchmarking_word_list, {})
-radix_tree = preprocess_get_radix_tree(benchmarking_word_list, {})
+bit_to_word_dict = get_cached_index('bit_to_word_dict', BENCHMARKING_DICTIONARY_PATH)
+numpy_word_masks, numpy_words = preprocess_get_numpy_word_masks(benchmarking_word_list)
+prefix_tree = get_cached_index('prefix_tree', BENCHMARKING_DICTIONARY_PATH)
+nested_prefix_tree = get_cached_index('nested_prefix_tree', BENCHMARKING_DICTIONARY_PATH)
+radix_tree = get_cached_index('radix_tree', BENCHMARKING_DICTIONARY_PATH)
+annotated_radix_tree = get_cached_index('annotated_radix_tree', BENCHMARKING_DICTIONARY_PATH)
+compact_trie = get_cached_index('compact_trie', BENCHMARKING_DICTIONARY_PATH)
+dawg = get_cached_index('dawg', BENCHMARKING_DICTIONARY_PATH)
 
 naive_solution_stmt = """
 get_bee_solutions_naive(benchmark_center, benchmark_others, benchmarking_word_list)
@@ -26,6 +33,14 @@ bitwise_solution_stmt = """
 get_bee_solutions_bitwise(benchmark_center, benchmark_others, bit_to_word_dict)
 """
 
+bitwise_submask_solution_stmt = """
+get_bee_solutions_bitwise_submask(benchmark_center, benchmark_others, bit_to_word_dict)
+"""
+
+numpy_solution_stmt = """
+get_bee_solutions_numpy(benchmark_center, benchmark_others, numpy_word_masks, numpy_words)
+"""
+
 prefix_tree_solution_stmt = """
 get_bee_solutions_prefix_tree(benchmark_center, benchmark_others, prefix_tree)
 """
@@ -38,6 +53,18 @@ radix_tree_solution_stmt = """
 get_bee_solutions_radix_tree(benchmark_center, benchmark_others, radix_tree)
 """
 
+annotated_radix_tree_solution_stmt = """
+get_bee_solutions_annotated_radix_tree(benchmark_center, benchmark_others, annotated_radix_tree)
+"""
+
+compact_trie_solution_stmt = """
+get_bee_solutions_compact_trie(benchmark_center, benchmark_others, compact_trie)
+"""
+
+dawg_solution_stmt = """
+get_bee_solutions_dawg(benchmark_center, benchmark_others, dawg)
+"""
+
 iterations = 10000
 repetitions = 5  # default
 
@@ -47,6 +74,13 @@ naive_min = min([r / iterations for r in naive_results])
 bitwise_results = timeit.repeat(stmt=bitwise_solution_stmt, number=iterations, repeat=repetitions, globals=globals())
 bitwise_min = min([r / iterations for r in bitwise_results])
 
+bitwise_submask_results = timeit.repeat(stmt=bitwise_submask_solution_stmt, number=iterations, repeat=repetitions,
+                                        globals=globals())
+bitwise_submask_min = min([r / iterations for r in bitwise_submask_results])
+
+numpy_results = timeit.repeat(stmt=numpy_solution_stmt, number=iterations, repeat=repetitions, globals=globals())
+numpy_min = min([r / iterations for r in numpy_results])
+
 prefix_tree_results = timeit.repeat(stmt=prefix_tree_solution_stmt, number=iterations, repeat=repetitions,
                                     globals=globals())
 prefix_tree_min = min([r / iterations for r in prefix_tree_results])
@@ -59,14 +93,31 @@ radix_tree_results = timeit.repeat(stmt=radix_tree_solution_stmt, number=iterati
                                    globals=globals())
 radix_tree_min = min([r / iterations for r in radix_tree_results])
 
+annotated_radix_tree_results = timeit.repeat(stmt=annotated_radix_tree_solution_stmt, number=iterations,
+                                             repeat=repetitions, globals=globals())
+annotated_radix_tree_min = min([r / iterations for r in annotated_radix_tree_results])
+
+compact_trie_results = timeit.repeat(stmt=compact_trie_solution_stmt, number=iterations, repeat=repetitions,
+                                     globals=globals())
+compact_trie_min = min([r / iterations for r in compact_trie_results])
+
+dawg_results = timeit.repeat(stmt=dawg_solution_stmt, number=iterations, repeat=repetitions,
+                             globals=globals())
+dawg_min = min([r / iterations for r in dawg_results])
+
 print(f"Iterations:\t\t{iterations}")
 print(f"Repetitions:\t{repetitions}")
 print()
 print(tabulate([['Naive', naive_min, naive_min / naive_min],
                 ['Bitwise', bitwise_min, naive_min / bitwise_min],
+                ['Bitwise Submask', bitwise_submask_min, naive_min / bitwise_submask_min],
+                ['Bitwise NumPy', numpy_min, naive_min / numpy_min],
                 ['Prefix Tree', prefix_tree_min, naive_min / prefix_tree_min],
                 ['Nested Prefix Tree', nested_prefix_tree_min, naive_min / nested_prefix_tree_min],
-                ['Radix Tree', radix_tree_min, naive_min / radix_tree_min]],
+                ['Radix Tree', radix_tree_min, naive_min / radix_tree_min],
+                ['Annotated Radix Tree', annotated_radix_tree_min, naive_min / annotated_radix_tree_min],
+                ['Compact Trie', compact_trie_min, naive_min / compact_trie_min],
+                ['DAWG', dawg_min, naive_min / dawg_min]],
                headers=['Strategy', 'Min Time (s)', 'Speedup']))
 
 """
@@ -0,0 +1,167 @@
+"""
+Binary dictionary format. The letter bits of every word (in the same format as the keys generated by
+`preprocess_get_bit_to_word_dict`) are computed once when the file is written, so loading a dictionary is just memory
+mapping the file, with no line splitting or bit calculations.
+
+Layout. All integers are in native byte order (the file is a local build artifact, like the answer table).
+    header:     magic, word count, blob length (u32 each)
+    masks:      u32[word count], letter bits of each word
+    lengths:    u8[word count], length of each word in bytes
+    offsets:    u32[word count + 1], word i is blob[offsets[i]:offsets[i + 1]]
+    blob:       all words encoded as utf-8 and concatenated
+"""
+import struct
+from array import array
+from collections.abc import Iterator
+from itertools import compress
+
+from spelling_bee_solvers import get_letter_bits, get_valid_word_bits, validate_character_args
+
+BINARY_DICTIONARY_MAGIC = b'NYTD'
+_BINARY_DICTIONARY_HEADER = struct.Struct('=4s2I')
+
+
+def preprocess_get_binary_dictionary(dictionary: list[str]) -> bytes:
+    """
+    Packs a list of words into the binary dictionary format. The words keep their order.
+
+    :param dictionary: list of words
+    :return: binary dictionary as bytes, which can be written straight to a file
+    """
+    masks = array('I')
+    lengths = bytearray()
+    offsets = array('I', [0])
+    blob = bytearray()
+    for word in dictionary:
+        encoded_word = word.encode('utf-8')
+        if len(encoded_word) > 255:
+            raise ValueError(f"Words can be at most 255 bytes long. Got {len(encoded_word)} - {word}.")
+
+        masks.append(get_letter_bits(word))
+        lengths.append(len(encoded_word))
+        blob.extend(encoded_word)
+        offsets.append(len(blob))
+
+    header = _BINARY_DICTIONARY_HEADER.pack(BINARY_DICTIONARY_MAGIC, len(masks), len(blob))
+    return b''.join([header, masks.tobytes(), bytes(lengths), offsets.tobytes(), bytes(blob)])
+
+
+def get_binary_dictionary_size(buffer: bytes | memoryview) -> int:
+    """
+    :param buffer: binary dictionary bytes or any other buffer (e.g. mmap) containing the dictionary
+    :return: size in bytes of the dictionary described by its header
+    :raises ValueError: if the buffer doesn't start with a binary dictionary header
+    """
+    if len(buffer) < _BINARY_DICTIONARY_HEADER.size:
+        raise ValueError(f"Binary dictionary is too short for its header: {len(buffer)} bytes.")
+    magic, word_count, blob_length = _BINARY_DICTIONARY_HEADER.unpack_from(buffer, 0)
+    if magic != BINARY_DICTIONARY_MAGIC:
+        raise ValueError(f"Binary dictionary has unexpected magic bytes: {magic}.")
+
+    return _BINARY_DICTIONARY_HEADER.size + 4 * word_count + word_count + 4 * (word_count + 1) + blob_length
+
+
+class BinaryDictionary:
+    """
+    Read only view of a binary dictionary generated by `preprocess_get_binary_dictionary`. The masks, lengths, offsets
+    and words all point straight into the underlying buffer, e.g. a memory map from
+    `get_cached_index('binary_dictionary')`, so nothing is copied until a word is decoded.
+    """
+    __masks: memoryview
+    __lengths: memoryview
+    __offsets: memoryview
+    __blob: memoryview
+
+    def __init__(self, buffer: bytes | memoryview):
+        """
+        :param buffer: binary dictionary bytes or any other buffer (e.g. mmap) containing the dictionary
+        """
+        magic, word_count, blob_length = _BINARY_DICTIONARY_HEADER.unpack_from(buffer, 0)
+        if magic != BINARY_DICTIONARY_MAGIC:
+            raise ValueError(f"Binary dictionary has unexpected magic bytes: {magic}.")
+
+        view = memoryview(buffer)
+        start = _BINARY_DICTIONARY_HEADER.size
+        self.__masks = view[start:start + 4 * word_count].cast('I')
+        start += 4 * word_count
+        self.__lengths = view[start:start + word_count]
+        start += word_count
+        self.__offsets = view[start:start + 4 * (word_count + 1)].cast('I')
+        start += 4 * (word_count + 1)
+        self.__blob = view[start:start + blob_length]
+
+    def __len__(self) -> int:
+        return len(self.__masks)
+
+    def __getitem__(self, index: int) -> str:
+        return str(self.get_word_bytes(index), 'utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def get_masks(self) -> memoryview:
+        """
+        :return: u32 view of the letter bits of each word
+        """
+        return self.__masks
+
+    def get_lengths(self) -> memoryview:
+        """
+        :return: u8 view of the length of each word in bytes
+        """
+        return self.__lengths
+
+    def get_word_bytes(self, index: int) -> memoryview:
+        """
+        :return: utf-8 bytes of a word, without copying them
+        """
+        return self.__blob[self.__offsets[index]:self.__offsets[index + 1]]
+
+    def get_words(self) -> list[str]:
+        """
+        :return: list of every word, in the same order as `get_masks`
+        """
+        text = str(self.__blob, 'utf-8')
+        if len(text) != len(self.__blob):
+            # there are multibyte characters, so the byte offsets can't be used on the decoded text
+            return list(self)
+
+        offsets = self.__offsets
+        return list(map(text.__getitem__, map(slice, offsets[:-1], offsets[1:])))
+
+
+def preprocess_get_bit_to_word_dict_from_binary(binary_dictionary: BinaryDictionary) -> dict[int, [str]]:
+    """
+    Generates the same dictionary as `preprocess_get_bit_to_word_dict`, using the precomputed masks instead of
+    calculating the bits of every word again.
+
+    :param binary_dictionary: binary dictionary to read
+    :return: dict of bit representation to list of words
+    """
+    bit_dict = {}
+    for word, word_bits in zip(binary_dictionary.get_words(), binary_dictionary.get_masks()):
+        if word_bits in bit_dict:
+            bit_dict[word_bits].append(word)
+        else:
+            bit_dict[word_bits] = [word]
+
+    return bit_dict
+
+
+def get_bee_solutions_binary_dictionary(center: str, others: str, binary_dictionary: BinaryDictionary) -> list[str]:
+    """
+    Scans the precomputed masks for the 64 bit representations a valid word could have (see `get_valid_word_bits`) and
+    only decodes the words that match, so nothing has to be built in memory before solving. This works for any letters,
+    including ones that aren't in the answer table.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :param binary_dictionary: binary dictionary to scan
+    :return: list of solutions, in dictionary order
+    """
+    validate_character_args(center, others)
+
+    valid_word_bits = set(get_valid_word_bits(center, others))
+    matches = compress(range(len(binary_dictionary)), map(valid_word_bits.__contains__, binary_dictionary.get_masks()))
+    return list(map(binary_dictionary.__getitem__, matches))
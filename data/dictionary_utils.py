@@ -1,31 +1,173 @@
+import os
 from pathlib import Path
 
 from util.project_path import project_path
 
+CUSTOM_DICTIONARY_PATH = 'data/custom/nyt_spelling_bee_dictionary.txt'
+# Use the biggest dictionary for benchmarking
+BENCHMARKING_DICTIONARY_PATH = 'data/raw_word_lists/words_alpha.txt'
+
 
 def get_custom_dictionary() -> list[str]:
     """
     :return: list of words from custom dictionary
     """
-    return get_dictionary_from_path(f'data/custom/nyt_spelling_bee_dictionary.txt')
+    return get_dictionary_from_path(CUSTOM_DICTIONARY_PATH)
 
 
 def get_benchmarking_dictionary() -> list[str]:
     """
     :return: list of words from dictionary used for benchmarking
     """
-    # Use the biggest dictionary for benchmarking
-    return get_dictionary_from_path('data/raw_word_lists/words_alpha.txt')
+    return get_dictionary_from_path(BENCHMARKING_DICTIONARY_PATH)
 
 
 def get_dictionary_from_path(path: str | Path) -> list[str]:
     """
-    Returns a list of words from the file specified by path.
+    Returns a list of words from the file specified by path. If the dictionary has a journal of edits that haven't been
+    compacted yet (see `append_to_dictionary_journal`), the edits are applied, so this is always the current view of
+    the dictionary.
     :param path: Path relative to project root.
     :return: List of words
     """
+    # the journal is read before the dictionary, so if it's compacted in between, the dictionary already has its edits
+    # (applying them again gives the same result)
+    journal = get_dictionary_journal(path)
     with open(project_path(path), 'r') as f:
-        return f.read().splitlines()
+        words = f.read().splitlines()
+
+    if not journal:
+        return words
+    return _apply_journal(words, journal)
+
+
+def _apply_journal(words: list[str], journal: list[tuple[str, str]]) -> list[str]:
+    """
+    :return: sorted words after the edits in the journal
+    """
+    word_set = set(words)
+    for operation, word in journal:
+        if operation == '+':
+            word_set.add(word)
+        else:
+            word_set.discard(word)
+    return sorted(word_set)
+
+
+def get_journal_path(path: str | Path) -> Path:
+    """
+    :param path: Path of dictionary relative to project root
+    :return: Path of the dictionary's journal relative to project root
+    """
+    return Path(path).with_suffix('.journal')
+
+
+def get_compacting_journal_path(path: str | Path) -> Path:
+    """
+    :param path: Path of dictionary relative to project root
+    :return: Path the journal is moved to while it's being compacted (see `compact_dictionary`), relative to project root
+    """
+    return Path(path).with_suffix('.compacting')
+
+
+def get_dictionary_journal(path: str | Path) -> list[tuple[str, str]]:
+    """
+    Reads the journal of edits for a dictionary. Each line of the journal is a '+' (add) or '-' (delete) followed by a
+    word. A last line without a newline can only come from a crash part way through an append, so it is ignored. Edits
+    in a journal that is being compacted come before the edits appended since.
+
+    :param path: Path of dictionary relative to project root
+    :return: list of (operation, word) in the order they were made, empty if there is no journal
+    """
+    # the journal is read first, so edits can't be missed if it's moved for compaction in between
+    journal = _read_journal(get_journal_path(path))
+    return _read_journal(get_compacting_journal_path(path)) + journal
+
+
+def _read_journal(journal_path: Path) -> list[tuple[str, str]]:
+    try:
+        with open(project_path(journal_path), 'r') as f:
+            lines = f.read().split('\n')
+    except FileNotFoundError:
+        return []
+
+    # the last element is either empty or an incomplete record
+    return [(line[0], line[1:]) for line in lines[:-1] if line[:1] in ('+', '-')]
+
+
+def append_to_dictionary_journal(words_to_add: list[str] | set[str], words_to_delete: list[str] | set[str],
+                                 path: str) -> None:
+    """
+    Records edits to a dictionary in its journal instead of rewriting the whole dictionary. Added words go through the
+    same filters as `write_words_to_dictionary`. The journal is only appended to, and is synced to disk before this
+    returns, so a crash can never leave the dictionary half written. An incomplete last record left by a crash is cut
+    off first, otherwise it would be joined with the first new record. If the journal is moved aside for compaction
+    while appending, the records are appended again to the new journal, since the compaction may have missed them.
+
+    :param words_to_add: words to add
+    :param words_to_delete: words to delete
+    :param path: Path of dictionary relative to project root
+    """
+    words_to_add = _remove_impossible_words(_remove_long_words(_remove_small_words(list(words_to_add))))
+    records = [f'-{word.lower()}\n' for word in sorted(words_to_delete)]
+    records.extend(f'+{word.lower()}\n' for word in sorted(words_to_add))
+    if not records:
+        return
+
+    journal_path = project_path(get_journal_path(path))
+    while True:
+        with open(journal_path, 'ab+') as f:
+            _truncate_incomplete_record(f)
+            f.write(''.join(records).encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+            written_stat = os.fstat(f.fileno())
+        try:
+            if os.path.samestat(written_stat, os.stat(journal_path)):
+                return
+        except FileNotFoundError:
+            pass
+
+
+def _truncate_incomplete_record(f) -> None:
+    """
+    Truncates a journal opened in binary mode to just after its last newline.
+    """
+    size = end = f.seek(0, os.SEEK_END)
+    while end > 0:
+        start = max(end - 4096, 0)
+        f.seek(start)
+        newline_index = f.read(end - start).rfind(b'\n')
+        if newline_index != -1:
+            end = start + newline_index + 1
+            break
+        end = start
+    if end != size:
+        f.truncate(end)
+
+
+def compact_dictionary(path: str) -> None:
+    """
+    Merges the journal into the dictionary and removes the journal. The merged dictionary replaces the old one in a
+    single step (see `write_words_to_dictionary`). If there is a crash before the journal is removed, the journal is
+    simply applied again the next time the dictionary is read, which gives the same result.
+
+    The journal is moved aside before it's read, so edits appended while compacting go to a new journal instead of
+    being removed with the old one. A journal left aside by a crash is compacted first.
+
+    :param path: Path of dictionary relative to project root
+    """
+    compacting_journal_path = project_path(get_compacting_journal_path(path))
+    if not compacting_journal_path.exists():
+        try:
+            os.replace(project_path(get_journal_path(path)), compacting_journal_path)
+        except FileNotFoundError:
+            return
+
+    with open(project_path(path), 'r') as f:
+        words = f.read().splitlines()
+    _write_words(_apply_journal(words, _read_journal(get_compacting_journal_path(path))), path)
+    compacting_journal_path.unlink()
 
 
 def write_words_to_dictionary(word_list: list[str] | set[str], path: str) -> None:
@@ -34,22 +176,38 @@ def write_words_to_dictionary(word_list: list[str] | set[str], path: str) -> Non
 
     Also removes any words smaller than 4 letters and any words that have more than 7 unique letters.
 
+    The words are written to a temporary file which then replaces the old file, so readers never see a half written
+    dictionary. Since the file now has the full list of words, any journal of edits for it is removed.
+
     :param word_list: List of words to write
     :param path: Path relative to project root
     """
+    _write_words(word_list, path)
+    project_path(get_journal_path(path)).unlink(missing_ok=True)
+    project_path(get_compacting_journal_path(path)).unlink(missing_ok=True)
+
+
+def _write_words(word_list: list[str] | set[str], path: str) -> None:
+    """
+    Writes the dictionary file in a single step, see `write_words_to_dictionary`. Leaves its journal alone.
+    """
     word_list = list(set(word_list))  # remove dupes
     word_list = _remove_small_words(word_list)
     word_list = _remove_long_words(word_list)
     word_list = _remove_impossible_words(word_list)
-    with open(project_path(path), 'w+') as writefile:
+    tmp_path = project_path(f'{path}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w+') as writefile:
         writefile.writelines(word.lower() + '\n' for word in sorted(word_list))
+        writefile.flush()
+        os.fsync(writefile.fileno())
+    os.replace(tmp_path, project_path(path))
 
 
 def write_words_to_custom_dictionary(word_list: list[str] | set[str]) -> None:
     """
     Writes words to the custom NYT spelling bee dictionary.
     """
-    write_words_to_dictionary(word_list, f'data/custom/nyt_spelling_bee_dictionary.txt')
+    write_words_to_dictionary(word_list, CUSTOM_DICTIONARY_PATH)
 
 
 def _remove_small_words(dictionary: list[str]) -> list[str]:
@@ -75,17 +233,21 @@ def _remove_impossible_words(dictionary: list[str]) -> list[str]:
 
 def add_words_to_custom(new_words: list[str] | set[str]) -> None:
     """
-    Adds words to custom dictionary.
+    Adds words to custom dictionary. The words are appended to the journal, see `compact_custom_dictionary`.
     """
-    updated_word_set = set(get_custom_dictionary())
-    updated_word_set.update(new_words)
-    write_words_to_custom_dictionary(updated_word_set)
+    append_to_dictionary_journal(new_words, [], CUSTOM_DICTIONARY_PATH)
 
 
 def delete_words_from_custom(delete_list: list[str] | set[str]):
     """
-    Deletes words from custom dictionary.
+    Deletes words from custom dictionary. The words are appended to the journal, see `compact_custom_dictionary`.
+    """
+    append_to_dictionary_journal([], delete_list, CUSTOM_DICTIONARY_PATH)
+
+
+def compact_custom_dictionary() -> None:
+    """
+    Merges the journal of edits into the custom dictionary file. Readers already see the edits before this, but the
+    dictionary file is what gets committed, so this should be run after a batch of edits.
     """
-    updated_word_set = set(get_custom_dictionary())
-    updated_word_set = updated_word_set - set(delete_list)
-    write_words_to_custom_dictionary(updated_word_set)
+    compact_dictionary(CUSTOM_DICTIONARY_PATH)
@@ -0,0 +1,231 @@
+# json and pickle are imported where they are used. Loading a memory mapped index doesn't need either of them, and
+# solve_nyt_bee.py only loads the answer table, so this keeps its startup time down.
+import hashlib
+import mmap
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+from data.binary_dictionary import BinaryDictionary, preprocess_get_binary_dictionary, get_binary_dictionary_size
+from data.dictionary_utils import CUSTOM_DICTIONARY_PATH, get_dictionary_from_path, get_journal_path, \
+    get_compacting_journal_path
+from spelling_bee_solvers import NestedStrDict, preprocess_get_bit_to_word_dict, preprocess_get_prefix_tree, \
+    preprocess_get_nested_prefix_tree, preprocess_get_radix_tree, preprocess_get_annotated_radix_tree, \
+    preprocess_get_compact_trie, preprocess_get_dawg, preprocess_get_answer_table, get_answer_table_size
+from util.project_path import project_path
+
+INDEX_CACHE_DIRECTORY = 'data/cache'
+# Bump this whenever a preprocess function changes the structure it generates, so that old cached indexes are ignored
+INDEX_CACHE_VERSION = 1
+
+# Structure name to function that generates the structure from a list of words
+INDEX_BUILDERS: dict[str, Callable[[list[str]], object]] = {
+    'bit_to_word_dict': preprocess_get_bit_to_word_dict,
+    'prefix_tree': preprocess_get_prefix_tree,
+    'nested_prefix_tree': lambda words: preprocess_get_nested_prefix_tree('', words, {}),
+    'radix_tree': lambda words: preprocess_get_radix_tree(words, {}),
+    'annotated_radix_tree': lambda words: preprocess_get_annotated_radix_tree(preprocess_get_radix_tree(words, {})),
+    'compact_trie': preprocess_get_compact_trie,
+    'dawg': preprocess_get_dawg,
+    'answer_table': preprocess_get_answer_table,
+    'binary_dictionary': preprocess_get_binary_dictionary,
+}
+# Structures that are cached as raw bytes instead of being pickled, to the function that returns the size the cached
+# file should have according to its header. These are memory mapped when loaded from the cache.
+MEMORY_MAPPED_INDEXES: dict[str, Callable[[mmap.mmap], int]] = {
+    'answer_table': get_answer_table_size,
+    'binary_dictionary': get_binary_dictionary_size,
+}
+
+
+def _get_memory_mapped_file(path: str | Path) -> mmap.mmap:
+    """
+    Memory maps a file as read only. Pages are loaded lazily by the OS and shared between every process that maps the
+    same file.
+    """
+    with open(project_path(path), 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _serialize_dawg_node(node: NestedStrDict, node_ids: dict[int, int], nodes: list[dict[str, int | None]]) -> int:
+    """
+    Recursive function to add a node and all of its children to the list of serialized nodes. Children are always
+    added before their parents, and shared nodes are only added once.
+
+    :param node: DAWG node to serialize
+    :param node_ids: dict of id() of already serialized nodes to their index in nodes
+    :param nodes: list of serialized nodes, where each node maps letters to the index of the child node
+    :return: index of the node in nodes
+    """
+    if id(node) in node_ids:
+        return node_ids[id(node)]
+
+    serialized_node = {}
+    for letter, child in node.items():
+        serialized_node[letter] = None if child is None else _serialize_dawg_node(child, node_ids, nodes)
+
+    nodes.append(serialized_node)
+    node_ids[id(node)] = len(nodes) - 1
+    return len(nodes) - 1
+
+
+def serialize_dawg(dawg: NestedStrDict) -> str:
+    """
+    Converts a DAWG generated by `preprocess_get_dawg` to a JSON string. The JSON is a list of nodes where each node
+    maps letters to the index of the child node ('$' maps to null). Shared nodes are stored once, so the serialized
+    DAWG is as small as the DAWG itself. The root is the last node.
+
+    :param dawg: DAWG to serialize
+    :return: JSON string
+    """
+    import json
+
+    nodes = []
+    _serialize_dawg_node(dawg, {}, nodes)
+    return json.dumps(nodes, separators=(',', ':'))
+
+
+def deserialize_dawg(serialized_dawg: str) -> NestedStrDict:
+    """
+    Converts a JSON string generated by `serialize_dawg` back into a DAWG, with the same nodes shared.
+
+    :param serialized_dawg: JSON string
+    :return: DAWG represented by a NestedStrDict with shared nodes
+    """
+    import json
+
+    nodes = []
+    # children are always before their parents, so they have already been converted
+    for serialized_node in json.loads(serialized_dawg):
+        nodes.append({letter: None if child is None else nodes[child] for letter, child in serialized_node.items()})
+
+    return nodes[-1]
+
+
+def get_dictionary_hash(dictionary_path: str | Path) -> str:
+    """
+    :param dictionary_path: Path relative to project root
+    :return: hex digest of the contents of the dictionary file and its journals of edits (if it has any)
+    """
+    dictionary_hash = hashlib.sha256()
+    with open(project_path(dictionary_path), 'rb') as f:
+        dictionary_hash.update(f.read())
+    for journal_path in (get_compacting_journal_path(dictionary_path), get_journal_path(dictionary_path)):
+        try:
+            with open(project_path(journal_path), 'rb') as f:
+                dictionary_hash.update(b'\0journal\0')
+                dictionary_hash.update(f.read())
+        except FileNotFoundError:
+            pass
+    return dictionary_hash.hexdigest()
+
+
+def get_index_cache_path(structure: str, dictionary_path: str | Path = CUSTOM_DICTIONARY_PATH) -> Path:
+    """
+    Returns the path the structure is cached at for the current contents of the dictionary. Since the path contains a
+    hash of the dictionary, any change to the dictionary gives a new path, so an outdated index is never loaded.
+
+    :param structure: name of the structure, one of INDEX_BUILDERS
+    :param dictionary_path: Path of dictionary relative to project root
+    :return: Path relative to project root
+    """
+    if structure not in INDEX_BUILDERS:
+        raise ValueError(f"Unknown structure {structure}. Expected one of {list(INDEX_BUILDERS)}.")
+
+    dictionary_hash = get_dictionary_hash(dictionary_path)[:16]
+    extension = 'bin' if structure in MEMORY_MAPPED_INDEXES else 'pickle'
+    return Path(INDEX_CACHE_DIRECTORY) / f'{_get_index_cache_prefix(structure, dictionary_path)}' \
+                                         f'{INDEX_CACHE_VERSION}-{dictionary_hash}.{extension}'
+
+
+def _get_index_cache_prefix(structure: str, dictionary_path: str | Path) -> str:
+    """
+    Prefix shared by every cached version of the structure for one dictionary. It contains a hash of the dictionary's
+    path, so dictionaries with the same file name in different directories don't share (and evict) cached indexes.
+    """
+    path_hash = hashlib.sha256(Path(dictionary_path).as_posix().encode('utf-8')).hexdigest()[:8]
+    return f'{Path(dictionary_path).stem}-{path_hash}-{structure}-v'
+
+
+def _remove_outdated_cached_indexes(structure: str, dictionary_path: str | Path, cache_path: Path) -> None:
+    """
+    Removes cached versions of the same structure for the same dictionary, i.e. ones built from older versions of the
+    dictionary (or by an older INDEX_CACHE_VERSION).
+    """
+    pattern = f'{_get_index_cache_prefix(structure, dictionary_path)}*'
+    for old_path in project_path(cache_path.parent).glob(pattern):
+        # temporary files belong to other processes that are still writing
+        if old_path.name != cache_path.name and old_path.suffix != '.tmp':
+            old_path.unlink(missing_ok=True)
+
+
+def _write_to_index_cache(data: bytes, structure: str, dictionary_path: str | Path, cache_path: Path) -> None:
+    """
+    Writes to a temporary file first and then moves it into place, so that other processes never see a partially
+    written index.
+    """
+    project_path(cache_path.parent).mkdir(parents=True, exist_ok=True)
+    tmp_path = project_path(cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp'))
+    with open(tmp_path, 'wb') as tmp:
+        tmp.write(data)
+    os.replace(tmp_path, project_path(cache_path))
+    _remove_outdated_cached_indexes(structure, dictionary_path, cache_path)
+
+
+def get_cached_index(structure: str, dictionary_path: str | Path = CUSTOM_DICTIONARY_PATH):
+    """
+    Returns the structure generated from the dictionary, e.g. `get_cached_index('radix_tree')` returns the same tree as
+    `preprocess_get_radix_tree(get_custom_dictionary(), {})`. The structure is loaded from the cache if it has already
+    been generated for the current contents of the dictionary. Otherwise, it is generated and written to the cache.
+
+    Loading a cached index is much faster than generating it again, which matters for short scripts that only solve a
+    few puzzles. Structures in MEMORY_MAPPED_INDEXES (the answer table and the binary dictionary) are returned as a read
+    only memory map of the cached file, so loading them costs almost nothing. A cached file that can't be loaded (e.g.
+    it is empty or was truncated) is generated and written again.
+
+    :param structure: name of the structure, one of INDEX_BUILDERS
+    :param dictionary_path: Path of dictionary relative to project root
+    :return: the generated structure
+    """
+    cache_path = get_index_cache_path(structure, dictionary_path)
+
+    if structure in MEMORY_MAPPED_INDEXES:
+        try:
+            # mapping an empty file raises ValueError as well
+            index = _get_memory_mapped_file(cache_path)
+            if MEMORY_MAPPED_INDEXES[structure](index) == len(index):
+                return index
+            index.close()
+        except (FileNotFoundError, ValueError):
+            pass
+
+        index = INDEX_BUILDERS[structure](get_dictionary_from_path(dictionary_path))
+        _write_to_index_cache(index, structure, dictionary_path, cache_path)
+        return _get_memory_mapped_file(cache_path)
+
+    import pickle
+
+    try:
+        with open(project_path(cache_path), 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, TypeError, ValueError):
+        # the cached file is corrupt or was pickled from classes that no longer exist, so it is replaced below
+        pass
+
+    index = INDEX_BUILDERS[structure](get_dictionary_from_path(dictionary_path))
+    _write_to_index_cache(pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL), structure, dictionary_path, cache_path)
+    return index
+
+
+def get_cached_binary_dictionary(dictionary_path: str | Path = CUSTOM_DICTIONARY_PATH) -> BinaryDictionary:
+    """
+    Returns a binary dictionary view of the dictionary, memory mapped from the index cache. The letter bits of every
+    word are already in the file, so e.g. `preprocess_get_bit_to_word_dict_from_binary` doesn't need to calculate
+    them again.
+
+    :param dictionary_path: Path of dictionary relative to project root
+    :return: binary dictionary backed by the cached file
+    """
+    return BinaryDictionary(get_cached_index('binary_dictionary', dictionary_path))
@@ -0,0 +1,276 @@
+"""
+SQLite backed store of scraped puzzles. `scraped_puzzles.json` is still the file that is committed, but reading and
+writing it means parsing or serializing every puzzle. The store keeps the same puzzles in an indexed local database, so
+single puzzles can be read, upserted and queried (by date range, center or letter set) without loading everything.
+
+The store keeps track of which version of the JSON file it holds and replaces its puzzles with the file's whenever the
+file changes (e.g. after a git pull). Scripts that change puzzles should upsert them into the store and then call
+`export_to_json` once. If the file changes while the store has upserts that haven't been exported, syncing refuses to
+replace them, see `sync_from_json`.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from collections.abc import Iterator
+from datetime import date
+from pathlib import Path
+
+from data.puzzles_utils import NYTBeePuzzle, get_puzzles_from_file, PUZZLES_PATH
+from spelling_bee_solvers import get_letter_bits
+from util.project_path import project_path
+
+PUZZLE_STORE_PATH = 'data/puzzles/scraped_puzzles.sqlite3'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    puzzle_date TEXT PRIMARY KEY,
+    center TEXT NOT NULL,
+    others TEXT NOT NULL,
+    letter_bits INTEGER NOT NULL,
+    solutions TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS puzzles_by_center ON puzzles (center);
+CREATE INDEX IF NOT EXISTS puzzles_by_letter_bits ON puzzles (letter_bits);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+_COLUMNS = 'puzzle_date, center, others, solutions'
+_UNEXPORTED_KEY = 'has_unexported_upserts'
+
+
+class UnexportedPuzzlesError(RuntimeError):
+    """
+    Raised when the JSON file changed but the store has upserts that were never exported, so importing the file would
+    silently drop them.
+    """
+
+
+def _get_row(puzzle: NYTBeePuzzle) -> tuple[str, str, str, int, str]:
+    return (puzzle.get_puzzle_date().isoformat(), puzzle.get_center(), puzzle.get_others(),
+            get_letter_bits(puzzle.get_center() + puzzle.get_others()), '\n'.join(sorted(puzzle.get_solutions())))
+
+
+def _get_puzzle(row: tuple[str, str, str, str]) -> NYTBeePuzzle:
+    puzzle_date, center, others, solutions = row
+    return NYTBeePuzzle(date.fromisoformat(puzzle_date), center, others, solutions.split('\n') if solutions else [])
+
+
+def _get_file_hash(path: str | Path) -> str:
+    with open(project_path(path), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _get_file_stat(path: str | Path) -> str:
+    """
+    :return: size and modification time of the file, which is much cheaper to check than its hash
+    """
+    stat = project_path(path).stat()
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+
+class PuzzleStore:
+    """
+    Puzzles keyed by date. Dates are stored as ISO strings, so ordering by date is the same as ordering the strings.
+    Solutions are stored sorted and newline separated. The database is only opened when it is first used.
+    """
+    __path: str | Path
+    __connection: sqlite3.Connection | None
+
+    def __init__(self, path: str | Path = PUZZLE_STORE_PATH):
+        """
+        :param path: Path of database relative to project root
+        """
+        self.__path = path
+        self.__connection = None
+
+    def __enter__(self) -> 'PuzzleStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __get_connection(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(project_path(self.__path), timeout=30)
+            self.__connection.executescript(_SCHEMA)
+        return self.__connection
+
+    def close(self) -> None:
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def __len__(self) -> int:
+        return self.__get_connection().execute('SELECT COUNT(*) FROM puzzles').fetchone()[0]
+
+    def __contains__(self, puzzle_date: date) -> bool:
+        return self.__get_connection().execute('SELECT 1 FROM puzzles WHERE puzzle_date = ?',
+                                               (puzzle_date.isoformat(),)).fetchone() is not None
+
+    def get_puzzle(self, puzzle_date: date) -> NYTBeePuzzle | None:
+        """
+        :return: puzzle for the date, or None if the store doesn't have it
+        """
+        row = self.__get_connection().execute(f'SELECT {_COLUMNS} FROM puzzles WHERE puzzle_date = ?',
+                                              (puzzle_date.isoformat(),)).fetchone()
+        return None if row is None else _get_puzzle(row)
+
+    def iter_puzzles(self, start: date | None = None, end: date | None = None) -> Iterator[NYTBeePuzzle]:
+        """
+        Lazily yields the puzzles between start and end (both inclusive), in date order. Puzzles are only built as they
+        are read from the database.
+
+        :param start: first date, or None for no lower bound
+        :param end: last date, or None for no upper bound
+        :return: iterator of puzzles in date order
+        """
+        cursor = self.__get_connection().execute(
+            f'SELECT {_COLUMNS} FROM puzzles WHERE puzzle_date >= ? AND puzzle_date <= ? ORDER BY puzzle_date',
+            (start.isoformat() if start else '', end.isoformat() if end else '9999-12-31'))
+        for row in cursor:
+            yield _get_puzzle(row)
+
+    def get_puzzles_by_center(self, center: str) -> list[NYTBeePuzzle]:
+        """
+        :return: every puzzle with the center letter, in date order
+        """
+        cursor = self.__get_connection().execute(
+            f'SELECT {_COLUMNS} FROM puzzles WHERE center = ? ORDER BY puzzle_date', (center,))
+        return [_get_puzzle(row) for row in cursor]
+
+    def get_puzzles_by_letters(self, letters: str | set[str]) -> list[NYTBeePuzzle]:
+        """
+        :param letters: all 7 letters of the puzzle, in any order
+        :return: every puzzle with exactly these letters (with any center), in date order
+        """
+        cursor = self.__get_connection().execute(
+            f'SELECT {_COLUMNS} FROM puzzles WHERE letter_bits = ? ORDER BY puzzle_date', (get_letter_bits(letters),))
+        return [_get_puzzle(row) for row in cursor]
+
+    def get_puzzle_dates(self) -> set[date]:
+        """
+        :return: dates of every puzzle in the store, without loading the puzzles
+        """
+        return {date.fromisoformat(row[0]) for row in self.__get_connection().execute('SELECT puzzle_date FROM puzzles')}
+
+    def upsert_puzzle(self, puzzle: NYTBeePuzzle) -> None:
+        """
+        Adds the puzzle, or replaces the puzzle with the same date.
+        """
+        self.upsert_puzzles([puzzle])
+
+    def upsert_puzzles(self, puzzles: list[NYTBeePuzzle]) -> None:
+        """
+        Adds or replaces the puzzles in a single transaction.
+        """
+        with self.__get_connection() as connection:
+            connection.executemany('INSERT OR REPLACE INTO puzzles VALUES (?, ?, ?, ?, ?)',
+                                   (_get_row(puzzle) for puzzle in puzzles))
+            connection.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?)', (_UNEXPORTED_KEY, '1'))
+
+    def has_unexported_upserts(self) -> bool:
+        """
+        :return: whether puzzles were upserted since the store was last imported from or exported to JSON
+        """
+        return self.__get_connection().execute('SELECT 1 FROM metadata WHERE key = ?',
+                                               (_UNEXPORTED_KEY,)).fetchone() is not None
+
+    def import_from_json(self, json_path: str | Path = PUZZLES_PATH) -> None:
+        """
+        Replaces every puzzle in the store with the puzzles from a JSON file written by `write_puzzles_to_file`, in a
+        single transaction, and remembers which version of the file was imported. Upserts that weren't exported are
+        discarded.
+
+        :param json_path: Path of JSON file relative to project root
+        """
+        exists = project_path(json_path).exists()
+        json_hash, json_stat = (_get_file_hash(json_path), _get_file_stat(json_path)) if exists else ('', '')
+        puzzles = list(get_puzzles_from_file(json_path).values())
+        with self.__get_connection() as connection:
+            connection.execute('DELETE FROM puzzles')
+            connection.executemany('INSERT INTO puzzles VALUES (?, ?, ?, ?, ?)',
+                                   (_get_row(puzzle) for puzzle in puzzles))
+            # the store no longer matches any other file it was synced with
+            connection.execute("DELETE FROM metadata WHERE key LIKE 'json_%'")
+            connection.execute('DELETE FROM metadata WHERE key = ?', (_UNEXPORTED_KEY,))
+            connection.executemany('INSERT INTO metadata VALUES (?, ?)',
+                                   [(f'json_hash:{json_path}', json_hash), (f'json_stat:{json_path}', json_stat)])
+
+    def sync_from_json(self, json_path: str | Path = PUZZLES_PATH) -> None:
+        """
+        Imports the JSON file if it has changed since it was last imported or exported. The file is only hashed if
+        its size or modification time changed.
+
+        :param json_path: Path of JSON file relative to project root
+        :raises UnexportedPuzzlesError: if the file changed and the store has upserts that weren't exported. Export
+            them (overwriting the changes to the file) or import the file (discarding the upserts) instead.
+        """
+        if not project_path(json_path).exists():
+            return
+
+        connection = self.__get_connection()
+        metadata = dict(connection.execute('SELECT key, value FROM metadata WHERE key IN (?, ?)',
+                                           (f'json_hash:{json_path}', f'json_stat:{json_path}')))
+        json_stat = _get_file_stat(json_path)
+        if metadata.get(f'json_stat:{json_path}') == json_stat:
+            return
+        if metadata.get(f'json_hash:{json_path}') == _get_file_hash(json_path):
+            # e.g. touched by a checkout, but the same contents
+            with connection:
+                connection.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?)',
+                                   (f'json_stat:{json_path}', json_stat))
+            return
+
+        if self.has_unexported_upserts():
+            raise UnexportedPuzzlesError(f"{json_path} changed, but the puzzle store has upserts that weren't "
+                                         f"exported. Call export_to_json to keep them, or import_from_json to discard "
+                                         f"them.")
+        self.import_from_json(json_path)
+
+    def export_to_json(self, json_path: str | Path = PUZZLES_PATH) -> None:
+        """
+        Writes every puzzle in the store to a JSON file, in the same format as `write_puzzles_to_file`.
+
+        :param json_path: Path of JSON file relative to project root
+        """
+        json_dict = {}
+        for puzzle_date, center, others, solutions in self.__get_connection().execute(
+                f'SELECT {_COLUMNS} FROM puzzles ORDER BY puzzle_date'):
+            json_dict[puzzle_date.replace('-', '')] = {'center': center,
+                                                       'others': others,
+                                                       'solutions': solutions.split('\n') if solutions else []}
+        # written to a temporary file which then replaces the old one, so a crash never leaves a truncated file that
+        # would be imported the next time the store is synced
+        tmp_path = project_path(f'{json_path}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w+') as f:
+            json.dump(json_dict, f, indent=4, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, project_path(json_path))
+
+        with self.__get_connection() as connection:
+            connection.executemany('INSERT OR REPLACE INTO metadata VALUES (?, ?)',
+                                   [(f'json_hash:{json_path}', _get_file_hash(json_path)),
+                                    (f'json_stat:{json_path}', _get_file_stat(json_path))])
+            connection.execute('DELETE FROM metadata WHERE key = ?', (_UNEXPORTED_KEY,))
+
+
+def get_puzzle_store(path: str | Path = PUZZLE_STORE_PATH, json_path: str | Path = PUZZLES_PATH) -> PuzzleStore:
+    """
+    Opens the puzzle store and brings it up to date with the JSON file first, if needed.
+
+    :param path: Path of database relative to project root
+    :param json_path: Path of JSON file relative to project root
+    :return: puzzle store
+    :raises UnexportedPuzzlesError: see `PuzzleStore.sync_from_json`
+    """
+    puzzle_store = PuzzleStore(path)
+    try:
+        puzzle_store.sync_from_json(json_path)
+    except BaseException:
+        puzzle_store.close()
+        raise
+    return puzzle_store
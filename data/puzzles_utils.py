@@ -1,34 +1,65 @@
 import json
+from array import array
+from collections.abc import Iterable
 from datetime import date, datetime
+from pathlib import Path
 
+from data.vocabulary import SHARED_VOCABULARY
 from spelling_bee_solvers import validate_character_args
 from util.project_path import project_path
 
+PUZZLES_PATH = 'data/puzzles/scraped_puzzles.json'
+
 
 class NYTBeePuzzle:
+    """
+    Immutable puzzle. Solutions are stored as a sorted array of word IDs into `SHARED_VOCABULARY` instead of a set of
+    strings, so puzzles are small, can be compared and hashed by ID and share one copy of every word. The set of
+    solution strings is only built the first time it's asked for.
+    """
+    __slots__ = ('__center', '__others', '__solution_ids', '__puzzle_date', '__hash', '__solutions')
     __center: str
     __others: str
-    __solutions: set[str]
+    __solution_ids: array
     __puzzle_date: date
+    __hash: int
+    __solutions: frozenset[str] | None
 
     def __init__(self, puzzle_data: date, center: str, others: str | list[str] | set[str],
-                 solutions: list[str] | set[str]):
+                 solutions: Iterable[str]):
         others = ''.join(sorted(others))
 
         validate_character_args(center, others)
 
-        self.__puzzle_date = puzzle_data
-        self.__center = center
-        self.__others = others
-        self.__solutions = set(solutions.copy())
+        solution_ids = array('I', sorted(set(SHARED_VOCABULARY.get_word_ids(solutions))))
+        object.__setattr__(self, '_NYTBeePuzzle__puzzle_date', puzzle_data)
+        object.__setattr__(self, '_NYTBeePuzzle__center', center)
+        object.__setattr__(self, '_NYTBeePuzzle__others', others)
+        object.__setattr__(self, '_NYTBeePuzzle__solution_ids', solution_ids)
+        object.__setattr__(self, '_NYTBeePuzzle__hash',
+                           hash((puzzle_data, center, others, solution_ids.tobytes())))
+        object.__setattr__(self, '_NYTBeePuzzle__solutions', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __reduce__(self):
+        # word IDs are only meaningful in this process, so pickle the words themselves
+        return NYTBeePuzzle, (self.__puzzle_date, self.__center, self.__others, self.get_solutions())
 
     def __eq__(self, other):
         if not isinstance(other, NYTBeePuzzle):
             # don't attempt to compare against unrelated types
             return NotImplemented
 
-        return (self.__center == other.get_center() and self.__others == other.get_others() and self.__solutions ==
-                other.get_solutions() and self.__puzzle_date == other.get_puzzle_date())
+        return (self.__hash == other.__hash and self.__center == other.__center and self.__others == other.__others
+                and self.__puzzle_date == other.__puzzle_date and self.__solution_ids == other.__solution_ids)
+
+    def __hash__(self):
+        return self.__hash
 
     def get_center(self) -> str:
         return self.__center
@@ -36,25 +67,98 @@ class NYTBeePuzzle:
     def get_others(self) -> str:
         return self.__others
 
-    def get_solutions(self) -> set[str]:
-        return self.__solutions.copy()
+    def get_solutions(self) -> frozenset[str]:
+        if self.__solutions is None:
+            # a race only builds the same set twice
+            object.__setattr__(self, '_NYTBeePuzzle__solutions',
+                               frozenset(SHARED_VOCABULARY.get_words(self.__solution_ids)))
+        return self.__solutions
+
+    def get_solution_ids(self) -> memoryview:
+        """
+        :return: read only view of the sorted IDs of every solution in `SHARED_VOCABULARY`, without copying them
+        """
+        return memoryview(self.__solution_ids).toreadonly()
+
+    def get_solution_count(self) -> int:
+        return len(self.__solution_ids)
 
     def get_puzzle_date(self) -> date:
         return self.__puzzle_date
 
-
-def write_puzzles_to_file(puzzle_list: list[NYTBeePuzzle]) -> None:
+    def get_common_solutions(self, other: 'NYTBeePuzzle') -> frozenset[str]:
+        """
+        :return: solutions of both puzzles
+        """
+        return frozenset(SHARED_VOCABULARY.get_words(
+            _merge_sorted_ids(self.__solution_ids, other.__solution_ids, keep_first=False, keep_second=False)))
+
+    def get_all_solutions(self, other: 'NYTBeePuzzle') -> frozenset[str]:
+        """
+        :return: solutions of either puzzle
+        """
+        return frozenset(SHARED_VOCABULARY.get_words(
+            _merge_sorted_ids(self.__solution_ids, other.__solution_ids, keep_first=True, keep_second=True)))
+
+    def get_solutions_not_in(self, other: 'NYTBeePuzzle') -> frozenset[str]:
+        """
+        :return: solutions of this puzzle that aren't solutions of the other puzzle
+        """
+        return frozenset(SHARED_VOCABULARY.get_words(
+            _merge_sorted_ids(self.__solution_ids, other.__solution_ids, keep_first=True, keep_both=False)))
+
+
+def _merge_sorted_ids(first: array, second: array, keep_first: bool, keep_second: bool = False,
+                      keep_both: bool = True) -> list[int]:
+    """
+    Merges two sorted arrays of unique IDs in a single pass, without building sets.
+
+    :param first: sorted IDs
+    :param second: sorted IDs
+    :param keep_first: whether to keep IDs only in first
+    :param keep_second: whether to keep IDs only in second
+    :param keep_both: whether to keep IDs in both
+    :return: sorted IDs that were kept
+    """
+    merged = []
+    append = merged.append
+    first_ids, second_ids = iter(first), iter(second)
+    # iterating is much faster than indexing in Python, and None marks the end since IDs are never None
+    first_id, second_id = next(first_ids, None), next(second_ids, None)
+    while first_id is not None and second_id is not None:
+        if first_id < second_id:
+            if keep_first:
+                append(first_id)
+            first_id = next(first_ids, None)
+        elif first_id > second_id:
+            if keep_second:
+                append(second_id)
+            second_id = next(second_ids, None)
+        else:
+            if keep_both:
+                append(first_id)
+            first_id, second_id = next(first_ids, None), next(second_ids, None)
+    if keep_first and first_id is not None:
+        append(first_id)
+        merged.extend(first_ids)
+    if keep_second and second_id is not None:
+        append(second_id)
+        merged.extend(second_ids)
+    return merged
+
+
+def write_puzzles_to_file(puzzle_list: list[NYTBeePuzzle], path: str | Path = PUZZLES_PATH) -> None:
     json_dict = {}
     for puzzle in puzzle_list:
         json_dict[puzzle.get_puzzle_date().strftime('%Y%m%d')] = {'center': puzzle.get_center(),
                                                                   'others': puzzle.get_others(),
-                                                                  'solutions': sorted(list(puzzle.get_solutions()))}
-    with open(project_path('data/puzzles/scraped_puzzles.json'), 'w+') as f:
+                                                                  'solutions': sorted(puzzle.get_solutions())}
+    with open(project_path(path), 'w+') as f:
         json.dump(json_dict, f, indent=4, sort_keys=True)
 
 
-def get_puzzles_from_file() -> dict[date, NYTBeePuzzle]:
-    scraped_puzzles_path = project_path('data/puzzles/scraped_puzzles.json')
+def get_puzzles_from_file(path: str | Path = PUZZLES_PATH) -> dict[date, NYTBeePuzzle]:
+    scraped_puzzles_path = project_path(path)
     if not scraped_puzzles_path.exists():
         return {}
 
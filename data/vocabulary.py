@@ -0,0 +1,61 @@
+"""
+Interns words as integer IDs, so collections of words (e.g. the solutions of every scraped puzzle) can be stored as
+compact arrays of IDs instead of each holding their own strings. IDs are assigned in the order words are first seen and
+never change, so they are only meaningful within the vocabulary (and process) that assigned them.
+"""
+import threading
+from collections.abc import Iterable
+
+
+class Vocabulary:
+    __word_ids: dict[str, int]
+    __words: list[str]
+    __lock: threading.Lock
+
+    def __init__(self, words: Iterable[str] = ()):
+        """
+        :param words: words to intern up front, in order
+        """
+        self.__word_ids = {}
+        self.__words = []
+        self.__lock = threading.Lock()
+        self.get_word_ids(words)
+
+    def __len__(self) -> int:
+        return len(self.__words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.__word_ids
+
+    def get_word_id(self, word: str) -> int:
+        """
+        :return: ID of the word, interning it first if it hasn't been seen before
+        """
+        word_id = self.__word_ids.get(word)
+        if word_id is None:
+            with self.__lock:
+                word_id = self.__word_ids.get(word)
+                if word_id is None:
+                    word_id = len(self.__words)
+                    self.__words.append(word)
+                    self.__word_ids[word] = word_id
+        return word_id
+
+    def get_word_ids(self, words: Iterable[str]) -> list[int]:
+        """
+        :return: ID of every word, in the same order
+        """
+        return [self.get_word_id(word) for word in words]
+
+    def get_word(self, word_id: int) -> str:
+        return self.__words[word_id]
+
+    def get_words(self, word_ids: Iterable[int]) -> list[str]:
+        """
+        :return: word for every ID, in the same order
+        """
+        return list(map(self.__words.__getitem__, word_ids))
+
+
+# every puzzle stores its solutions as IDs into this vocabulary, so solutions of different puzzles can be compared by ID
+SHARED_VOCABULARY = Vocabulary()
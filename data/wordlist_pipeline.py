@@ -0,0 +1,160 @@
+"""
+Generator based pipeline for processing raw word lists of any size in bounded memory. Each step takes an iterator of
+words and yields words, so a word list is never held in memory as a whole. e.g.
+    write_words(sort_words(filter_words(normalize_words(read_words(source)))), destination)
+
+Sorting is the only step that needs to see every word, so it is done as an external merge sort: words are sorted in
+runs of at most `run_size` words, each run is written to a temporary file and the runs are then merged lazily.
+"""
+import heapq
+import json
+import os
+import re
+import tempfile
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+
+from util.project_path import project_path
+
+# a JSON string, optionally followed by a colon if it's the key of an object
+_JSON_STRING_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"(\s*:)?')
+
+
+def read_words(path: str | Path) -> Iterator[str]:
+    """
+    :param path: Path of word list (one word per line) relative to project root
+    :return: iterator of lines in the file, without line endings
+    """
+    with open(project_path(path), 'r') as f:
+        for line in f:
+            yield line.rstrip('\r\n')
+
+
+def read_json_words(path: str | Path, chunk_size: int = 1 << 20) -> Iterator[str]:
+    """
+    Reads every string inside the arrays of a JSON file (e.g. a dict of category to list of words), without parsing
+    the whole file at once. Strings that are object keys are skipped. The file is read in chunks of chunk_size
+    characters, so memory use doesn't depend on the size of the file.
+
+    :param path: Path of JSON file relative to project root
+    :param chunk_size: number of characters read at a time
+    :return: iterator of strings in the order they appear in the file
+    """
+    buffer = ''
+    with open(project_path(path), 'r') as f:
+        while chunk := f.read(chunk_size):
+            buffer += chunk
+            consumed = 0
+            for match in _JSON_STRING_PATTERN.finditer(buffer):
+                # the string (or the colon after it) might continue in the next chunk
+                if buffer[match.end():].strip() == '':
+                    break
+                consumed = match.end()
+                if match.group(2) is None:
+                    yield json.loads(f'"{match.group(1)}"')
+            buffer = buffer[consumed:]
+
+    for match in _JSON_STRING_PATTERN.finditer(buffer):
+        if match.group(2) is None:
+            yield json.loads(f'"{match.group(1)}"')
+
+
+def normalize_words(words: Iterable[str]) -> Iterator[str]:
+    """
+    Strips whitespace and lowercases every word. Empty lines are skipped.
+    """
+    for word in words:
+        word = word.strip().lower()
+        if word:
+            yield word
+
+
+def filter_words(words: Iterable[str]) -> Iterator[str]:
+    """
+    Skips words that cannot be played in the NYT spelling bee, using the same rules as `write_words_to_dictionary`:
+    words smaller than 4 letters, longer than 19 letters or with more than 7 unique letters.
+    """
+    for word in words:
+        if 3 < len(word) < 20 and len(set(word)) <= 7:
+            yield word
+
+
+def _write_run(run: list[str], directory: str) -> str:
+    with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.run', delete=False) as run_file:
+        run_file.writelines(word + '\n' for word in run)
+        return run_file.name
+
+
+def _read_run(run_path: str) -> Iterator[str]:
+    with open(run_path, 'r') as f:
+        for line in f:
+            yield line[:-1]
+
+
+def sort_words(words: Iterable[str], unique: bool = True, run_size: int = 100_000,
+               tmp_dir: str | None = None) -> Iterator[str]:
+    """
+    External merge sort. At most run_size words are held in memory at a time. If all the words fit in a single run,
+    nothing is written to disk.
+
+    :param words: words to sort
+    :param unique: if True, duplicate words are only yielded once
+    :param run_size: max number of words sorted in memory at a time
+    :param tmp_dir: directory for the temporary run files, defaults to the system temp directory
+    :return: iterator of words in sorted order
+    """
+    if run_size < 1:
+        raise ValueError(f"Run size must be at least 1. Got {run_size}.")
+
+    words = iter(words)
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        run_paths = []
+        while run := list(islice(words, run_size)):
+            is_last_run = len(run) < run_size
+            run = sorted(set(run)) if unique else sorted(run)
+            if not run_paths and is_last_run:
+                # the first run is also the last one, so there's no need to merge
+                yield from run
+                return
+            run_paths.append(_write_run(run, run_dir))
+
+        previous_word = None
+        for word in heapq.merge(*(_read_run(run_path) for run_path in run_paths)):
+            if not unique or word != previous_word:
+                yield word
+            previous_word = word
+
+
+def write_words(words: Iterable[str], path: str) -> int:
+    """
+    Writes one word per line to a temporary file which then replaces the file at path, so a partially processed word
+    list is never left behind.
+
+    :param words: words to write
+    :param path: Path relative to project root
+    :return: number of words written
+    """
+    count = 0
+    tmp_path = project_path(f'{path}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w+') as writefile:
+        for word in words:
+            writefile.write(word + '\n')
+            count += 1
+    os.replace(tmp_path, project_path(path))
+    return count
+
+
+def process_wordlist(source_path: str, destination_path: str, run_size: int = 100_000) -> int:
+    """
+    Processes a raw word list into a sorted list of unique, lowercase words that can be played in the NYT spelling bee.
+    For a lowercase word list, this gives the same result as
+    `write_words_to_dictionary(get_dictionary_from_path(source), destination)`, in bounded memory.
+
+    :param source_path: Path of raw word list relative to project root
+    :param destination_path: Path of processed word list relative to project root
+    :param run_size: max number of words sorted in memory at a time
+    :return: number of words written
+    """
+    return write_words(sort_words(filter_words(normalize_words(read_words(source_path))), run_size=run_size),
+                       destination_path)
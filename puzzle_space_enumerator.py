@@ -0,0 +1,134 @@
+"""
+Enumerates every puzzle that can be generated from the custom dictionary and writes the solution count, max score and
+pangram count for each one to a table.
+
+A puzzle can be generated from any 7 letter set that has at least one pangram, and each letter set gives 7 puzzles (one
+per center letter). Rather than solving each of these puzzles, the statistics are calculated from the per bit
+representation totals of `preprocess_get_bit_to_score_dict` with a sum over subsets pass for each letter set.
+"""
+import argparse
+import string
+from concurrent.futures import ProcessPoolExecutor
+
+from data.dictionary_utils import get_custom_dictionary
+from spelling_bee_scoring import preprocess_get_bit_to_score_dict
+from spelling_bee_solvers import get_letter_bits, preprocess_get_bit_to_word_dict
+from util.project_path import project_path
+
+# letters, center, number of solutions, max score, number of pangrams
+type PuzzleStatistics = tuple[str, str, int, int, int]
+
+_worker_bit_score_dictionary: dict[int, tuple[int, int, int]] = {}
+
+
+def get_letter_set_statistics(letter_bits: int, bit_score_dictionary: dict[int, tuple[int, int, int]]) -> \
+        list[PuzzleStatistics]:
+    """
+    Calculates the statistics for all 7 puzzles of a letter set.
+
+    Each of the 2^7 = 128 subsets of the letters is given a local 7 bit index. After a sum over subsets pass, the
+    totals at index i are the totals for every word whose letters are a subset of i. The valid words for center c are
+    the words made from the puzzle's letters, minus the words made without c, so their totals are
+    totals[all letters] - totals[all letters except c].
+
+    :param letter_bits: bit representation of the 7 letters
+    :param bit_score_dictionary: dict generated by `preprocess_get_bit_to_score_dict`
+    :return: statistics for each center, in alphabetical order of center letter
+    """
+    letters = [c for c in string.ascii_lowercase if get_letter_bits(c) & letter_bits]
+    if len(letters) != 7:
+        raise ValueError(f"Letter set must have exactly 7 letters. Got {len(letters)} - {''.join(letters)}.")
+
+    all_letters = (1 << 7) - 1
+    scores = [0] * (all_letters + 1)
+    counts = [0] * (all_letters + 1)
+    pangrams = [0] * (all_letters + 1)
+    word_bits = [0] * (all_letters + 1)
+    for local_bits in range(1, all_letters + 1):
+        # bits for local_bits = bits for local_bits without its lowest letter + bits for its lowest letter
+        lowest = (local_bits & -local_bits).bit_length() - 1
+        word_bits[local_bits] = word_bits[local_bits & (local_bits - 1)] | get_letter_bits(letters[lowest])
+        if word_bits[local_bits] in bit_score_dictionary:
+            scores[local_bits], counts[local_bits], pangrams[local_bits] = bit_score_dictionary[word_bits[local_bits]]
+
+    for i in range(7):
+        letter_bit = 1 << i
+        for local_bits in range(all_letters + 1):
+            if local_bits & letter_bit:
+                scores[local_bits] += scores[local_bits ^ letter_bit]
+                counts[local_bits] += counts[local_bits ^ letter_bit]
+                pangrams[local_bits] += pangrams[local_bits ^ letter_bit]
+
+    statistics = []
+    for i, center in enumerate(letters):
+        without_center = all_letters ^ (1 << i)
+        statistics.append((''.join(letters), center, counts[all_letters] - counts[without_center],
+                           scores[all_letters] - scores[without_center],
+                           pangrams[all_letters] - pangrams[without_center]))
+
+    return statistics
+
+
+def _init_worker(bit_score_dictionary: dict[int, tuple[int, int, int]]) -> None:
+    global _worker_bit_score_dictionary
+    _worker_bit_score_dictionary = bit_score_dictionary
+
+
+def _get_chunk_statistics(letter_bits_chunk: list[int]) -> list[PuzzleStatistics]:
+    statistics = []
+    for letter_bits in letter_bits_chunk:
+        statistics.extend(get_letter_set_statistics(letter_bits, _worker_bit_score_dictionary))
+    return statistics
+
+
+def get_puzzle_space_statistics(dictionary: list[str], max_workers: int | None = None, chunk_size: int = 500) -> \
+        list[PuzzleStatistics]:
+    """
+    Calculates the statistics for every puzzle that can be generated from the dictionary. The letter sets are split
+    into chunks which are processed in a process pool. Each worker receives the score dictionary once, when it starts.
+
+    :param dictionary: list of words
+    :param max_workers: number of worker processes, defaults to the number of CPUs
+    :param chunk_size: number of letter sets sent to a worker at a time
+    :return: statistics for every puzzle, sorted by letters and then center
+    """
+    bit_score_dictionary = preprocess_get_bit_to_score_dict(preprocess_get_bit_to_word_dict(dictionary))
+    # sorting the bit representations in descending order sorts the letter sets alphabetically
+    pangram_bits = sorted((b for b in bit_score_dictionary if b.bit_count() == 7), reverse=True)
+    chunks = [pangram_bits[i:i + chunk_size] for i in range(0, len(pangram_bits), chunk_size)]
+
+    statistics = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(bit_score_dictionary,)) as executor:
+        for chunk_statistics in executor.map(_get_chunk_statistics, chunks):
+            statistics.extend(chunk_statistics)
+
+    return statistics
+
+
+def write_puzzle_space_statistics_to_file(statistics: list[PuzzleStatistics], path: str) -> None:
+    """
+    Writes the statistics as a tab separated table with a header row.
+
+    :param statistics: statistics generated by `get_puzzle_space_statistics`
+    :param path: Path relative to project root
+    """
+    with open(project_path(path), 'w+') as writefile:
+        writefile.write('letters\tcenter\tsolutions\tscore\tpangrams\n')
+        writefile.writelines('\t'.join(str(column) for column in row) + '\n' for row in statistics)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Calculates the number of solutions, max score and number of pangrams for every puzzle that can be "
+                    "generated from the custom dictionary.",
+        add_help=True)
+    parser.add_argument("-w", "--workers", type=int, default=None, dest="workers",
+                        help="Number of worker processes. Defaults to the number of CPUs.")
+    parser.add_argument("-o", "--output", default='data/processed/puzzle_space_statistics.tsv', dest="output",
+                        help="Output path relative to the project root.")
+    args = parser.parse_args()
+
+    all_statistics = get_puzzle_space_statistics(get_custom_dictionary(), max_workers=args.workers)
+    write_puzzle_space_statistics_to_file(all_statistics, args.output)
+    print(f"Wrote statistics for {len(all_statistics)} puzzles to {args.output}")
@@ -0,0 +1,315 @@
+"""
+Minimal HTTP client for fetching pages. Connections are kept alive and reused per host, and the ETag and Last-Modified
+headers of every page are stored (optionally on disk), so fetching a page again sends a conditional request and an
+unchanged page (304 Not Modified) is returned from the cache without transferring it again.
+"""
+import hashlib
+import http.client
+import json
+import os
+import threading
+from collections import OrderedDict
+from email.message import Message
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.parse import urlsplit, urljoin
+
+from util.project_path import project_path
+
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+_MAX_REDIRECTS = 5
+
+
+def _get_cache_key(url: str) -> str:
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+class HttpClient:
+    """
+    Thread safe. Each thread takes an idle connection from the pool for the host (or opens a new one) and puts it back
+    once the response has been read, unless the server asked to close it.
+
+    Cached pages are evicted least recently used first once there are more than max_cache_entries pages, or once their
+    bodies take up more than max_cache_bytes (if set). Pages cached on disk by earlier runs count towards the limits, in
+    the order they were last used.
+    """
+    __headers: dict[str, str]
+    __timeout: float
+    __max_idle_connections: int
+    __cache_dir: str | Path | None
+    __max_cache_entries: int
+    __max_cache_bytes: int | None
+    __idle_connections: dict[tuple[str, str], list[http.client.HTTPConnection]]
+    # keyed by `_get_cache_key`, only has the entries that have been used since they were loaded when on disk
+    __cache: dict[str, dict[str, str | bytes]]
+    # size of the body of every cached page, least recently used first
+    __cache_sizes: OrderedDict[str, int]
+    __cache_bytes: int
+    __lock: threading.Lock
+
+    def __init__(self, headers: dict[str, str] | None = None, timeout: float = 30, max_idle_connections: int = 8,
+                 cache_dir: str | Path | None = None, max_cache_entries: int = 256,
+                 max_cache_bytes: int | None = 32 * 1024 ** 2):
+        """
+        :param headers: headers sent with every request
+        :param timeout: socket timeout in seconds
+        :param max_idle_connections: max number of idle connections kept per host
+        :param cache_dir: Path relative to project root to store pages and their validators in, so they are kept
+            across runs. If None, they are only kept in memory.
+        :param max_cache_entries: max number of cached pages
+        :param max_cache_bytes: max total size of the bodies of cached pages, or None for no limit
+        """
+        if max_cache_entries < 1:
+            raise ValueError(f"Max cache entries must be at least 1. Got {max_cache_entries}.")
+
+        self.__headers = dict(headers or {})
+        self.__timeout = timeout
+        self.__max_idle_connections = max_idle_connections
+        self.__cache_dir = cache_dir
+        self.__max_cache_entries = max_cache_entries
+        self.__max_cache_bytes = max_cache_bytes
+        self.__idle_connections = {}
+        self.__cache = {}
+        self.__cache_sizes = OrderedDict()
+        self.__cache_bytes = 0
+        self.__lock = threading.Lock()
+        if cache_dir is not None:
+            project_path(cache_dir).mkdir(parents=True, exist_ok=True)
+            self.__load_cache_sizes()
+
+    def __enter__(self) -> 'HttpClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes every idle connection.
+        """
+        with self.__lock:
+            idle_connections, self.__idle_connections = self.__idle_connections, {}
+        for connections in idle_connections.values():
+            for connection in connections:
+                connection.close()
+
+    def get(self, url: str) -> bytes:
+        """
+        Fetches a page, following redirects. If the page was fetched before, it's only transferred again if it changed.
+
+        :param url: url to fetch
+        :return: body of the page
+        :raises HTTPError: if the server responds with an error status, the same as `urlopen`
+        """
+        for _ in range(_MAX_REDIRECTS + 1):
+            cached = self.__get_cached(url)
+            headers = dict(self.__headers)
+            if cached is not None:
+                if 'etag' in cached:
+                    headers['If-None-Match'] = cached['etag']
+                if 'last_modified' in cached:
+                    headers['If-Modified-Since'] = cached['last_modified']
+
+            status, reason, response_headers, body = self.__request(url, headers)
+            if status == 304:
+                if cached is None:
+                    raise HTTPError(url, status, "Not Modified without a conditional request.", response_headers, None)
+                cached_body = self.__read_cached_body(url, cached)
+                if cached_body is not None:
+                    return cached_body
+                # the cached body is gone, so the validators are dropped and the page is fetched again
+                self.__drop_cached(url)
+                status, reason, response_headers, body = self.__request(url, dict(self.__headers))
+
+            if status in _REDIRECT_CODES and response_headers.get('Location'):
+                url = urljoin(url, response_headers['Location'])
+            elif status >= 400 or status == 304:
+                raise HTTPError(url, status, reason, response_headers, None)
+            else:
+                self.__put_cached(url, response_headers, body)
+                return body
+
+        raise HTTPError(url, status, f"More than {_MAX_REDIRECTS} redirects.", response_headers, None)
+
+    def __request(self, url: str, headers: dict[str, str]) -> tuple[int, str, Message, bytes]:
+        parts = urlsplit(url)
+        host_key = (parts.scheme, parts.netloc)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+        connection = self.__take_idle_connection(host_key)
+        is_reused = connection is not None
+        while True:
+            if connection is None:
+                connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else \
+                    http.client.HTTPConnection
+                connection = connection_class(parts.netloc, timeout=self.__timeout)
+            is_complete = False
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                # the whole body has to be read before the connection can be reused
+                body = response.read()
+                is_complete = True
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not is_reused:
+                    raise
+                # the server closed the idle connection, so try once more on a new one
+            finally:
+                # whatever went wrong (e.g. a timeout part way through the body), the connection can't be reused
+                if not is_complete:
+                    connection.close()
+            if is_complete:
+                break
+            connection = None
+            is_reused = False
+
+        if response.will_close:
+            connection.close()
+        else:
+            self.__put_idle_connection(host_key, connection)
+        return response.status, response.reason, response.headers, body
+
+    def __take_idle_connection(self, host_key: tuple[str, str]) -> http.client.HTTPConnection | None:
+        with self.__lock:
+            connections = self.__idle_connections.get(host_key)
+            return connections.pop() if connections else None
+
+    def __put_idle_connection(self, host_key: tuple[str, str], connection: http.client.HTTPConnection) -> None:
+        with self.__lock:
+            connections = self.__idle_connections.setdefault(host_key, [])
+            if len(connections) < self.__max_idle_connections:
+                connections.append(connection)
+                return
+        connection.close()
+
+    def __get_cache_path(self, key: str) -> Path:
+        return project_path(self.__cache_dir) / key
+
+    def __load_cache_sizes(self) -> None:
+        """
+        Picks up the pages cached on disk by earlier runs, least recently used first, and evicts any over the limits.
+        """
+        entries = []
+        for json_path in project_path(self.__cache_dir).glob('*.json'):
+            try:
+                last_used = json_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            try:
+                size = json_path.with_suffix('.body').stat().st_size
+            except FileNotFoundError:
+                size = 0
+            entries.append((last_used, json_path.stem, size))
+
+        with self.__lock:
+            for _, key, size in sorted(entries):
+                self.__cache_sizes[key] = size
+                self.__cache_bytes += size
+            evicted_keys = self.__evict()
+        self.__remove_cache_files(evicted_keys)
+
+    def __get_cached(self, url: str) -> dict[str, str | bytes] | None:
+        key = _get_cache_key(url)
+        with self.__lock:
+            cached = self.__cache.get(key)
+        if cached is not None or self.__cache_dir is None:
+            return cached
+
+        try:
+            with open(self.__get_cache_path(key).with_suffix('.json'), 'r') as f:
+                cached = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        with self.__lock:
+            if key not in self.__cache_sizes:
+                # evicted since it was read
+                return None
+            self.__cache[key] = cached
+        return cached
+
+    def __read_cached_body(self, url: str, cached: dict[str, str | bytes]) -> bytes | None:
+        """
+        Marks the page as the most recently used one.
+
+        :return: cached body of the page, or None if it's gone
+        """
+        key = _get_cache_key(url)
+        with self.__lock:
+            if key not in self.__cache_sizes:
+                return None
+            self.__cache_sizes.move_to_end(key)
+        if 'body' in cached:
+            return cached['body']
+
+        cache_path = self.__get_cache_path(key)
+        try:
+            with open(cache_path.with_suffix('.body'), 'rb') as f:
+                body = f.read()
+            # the modification time of the validators keeps track of when the page was last used across runs
+            os.utime(cache_path.with_suffix('.json'))
+        except FileNotFoundError:
+            return None
+        return body
+
+    def __drop_cached(self, url: str) -> None:
+        key = _get_cache_key(url)
+        with self.__lock:
+            self.__cache.pop(key, None)
+            self.__cache_bytes -= self.__cache_sizes.pop(key, 0)
+        self.__remove_cache_files([key])
+
+    def __put_cached(self, url: str, response_headers: Message, body: bytes) -> None:
+        cached = {}
+        if response_headers.get('ETag'):
+            cached['etag'] = response_headers['ETag']
+        if response_headers.get('Last-Modified'):
+            cached['last_modified'] = response_headers['Last-Modified']
+        if not cached or (self.__max_cache_bytes is not None and len(body) > self.__max_cache_bytes):
+            # without validators there's nothing to send a conditional request with, and a page bigger than the whole
+            # cache isn't cached at all
+            self.__drop_cached(url)
+            return
+
+        key = _get_cache_key(url)
+        if self.__cache_dir is None:
+            cached['body'] = body
+        else:
+            cache_path = self.__get_cache_path(key)
+            tmp_suffix = f'.{os.getpid()}.{threading.get_ident()}.tmp'
+            for suffix, content in [('.body', body), ('.json', json.dumps(cached).encode('utf-8'))]:
+                # the body is replaced before its validators, so validators never point at an older body
+                tmp_path = cache_path.with_suffix(suffix + tmp_suffix)
+                with open(tmp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, cache_path.with_suffix(suffix))
+
+        with self.__lock:
+            self.__cache[key] = cached
+            self.__cache_bytes += len(body) - self.__cache_sizes.pop(key, 0)
+            self.__cache_sizes[key] = len(body)
+            evicted_keys = self.__evict()
+        self.__remove_cache_files(evicted_keys)
+
+    def __evict(self) -> list[str]:
+        """
+        Evicts least recently used pages from memory until the cache is within its limits. Must be called with the lock
+        held.
+
+        :return: keys of the evicted pages, whose files still have to be removed
+        """
+        evicted_keys = []
+        while len(self.__cache_sizes) > self.__max_cache_entries or \
+                (self.__max_cache_bytes is not None and self.__cache_bytes > self.__max_cache_bytes):
+            key, size = self.__cache_sizes.popitem(last=False)
+            self.__cache_bytes -= size
+            self.__cache.pop(key, None)
+            evicted_keys.append(key)
+        return evicted_keys
+
+    def __remove_cache_files(self, keys: list[str]) -> None:
+        if self.__cache_dir is None:
+            return
+        for key in keys:
+            # validators first, so there are never validators without a body
+            self.__get_cache_path(key).with_suffix('.json').unlink(missing_ok=True)
+            self.__get_cache_path(key).with_suffix('.body').unlink(missing_ok=True)
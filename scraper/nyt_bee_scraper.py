@@ -1,14 +1,79 @@
 import re
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 from urllib.error import HTTPError
-from urllib.request import urlopen, Request
 
 import backoff
 from bs4 import BeautifulSoup, NavigableString, Tag
 
+from scraper.http_client import HttpClient
 from util.project_path import project_path
 
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/103.0.0.0 Safari/537.36')
+
+_default_http_client: HttpClient | None = None
+_default_http_client_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket rate limiter. Tokens are added at a constant rate, up to capacity, and every request takes
+    one. Callers that find the bucket empty reserve the next token and sleep until it is added, so they are let through
+    in the order they arrived.
+    """
+    __rate: float
+    __capacity: float
+    __tokens: float
+    __updated: float
+    __lock: threading.Lock
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        :param rate: tokens added per second, i.e. the sustained number of requests per second
+        :param capacity: max number of tokens, i.e. how many requests can be made at once after being idle
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"Rate must be positive and capacity at least 1. Got {rate} and {capacity}.")
+
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__tokens = capacity
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Takes a token, blocking until one is available.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.__capacity, self.__tokens + (now - self.__updated) * self.__rate)
+            self.__updated = now
+            self.__tokens -= 1
+            wait = -self.__tokens / self.__rate
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+def get_default_http_client() -> HttpClient:
+    """
+    :return: client shared by every fetch, which keeps connections alive. The scrapers fetch the page of each date
+        once and never again, so only a few pages are cached, in memory, and nothing is written to disk.
+    """
+    global _default_http_client
+    with _default_http_client_lock:
+        if _default_http_client is None:
+            _default_http_client = HttpClient(headers={'User-Agent': USER_AGENT}, max_cache_entries=16,
+                                              max_cache_bytes=4 * 1024 ** 2)
+        return _default_http_client
+
 
 def _fatal_code(excep: Exception):
     if isinstance(excep, HTTPError) and excep.code == 404:
@@ -21,14 +86,53 @@ def _fatal_code(excep: Exception):
                       HTTPError,
                       max_tries=10,
                       giveup=_fatal_code)
-def get_raw_page(url: str) -> bytes:
-    req = Request(url)
+def get_raw_page(url: str, rate_limiter: TokenBucket | None = None, client: HttpClient | None = None) -> bytes:
+    """
+    :param url: url to fetch
+    :param rate_limiter: optional rate limiter shared between concurrent fetches
+    :param client: client to fetch with, defaults to `get_default_http_client()`
+    :return: raw page
+    """
+    # every try takes a token, so retries are rate limited too
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+
+    return (client or get_default_http_client()).get(url)
 
-    user_agent_header = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
-                         'Chrome/103.0.0.0 Safari/537.36')
-    req.add_header('user-agent', user_agent_header)
 
-    return urlopen(req).read()
+def get_raw_pages(urls: Iterable[str], max_workers: int = 4, requests_per_second: float = 4,
+                  window: int | None = None, client: HttpClient | None = None) -> Iterator[Future[bytes]]:
+    """
+    Fetches pages concurrently with `get_raw_page`, so each page keeps the same retries and gives up on 404. At most
+    window pages are fetched ahead of the page the caller is currently on, and requests (including retries) are
+    limited to requests_per_second across all workers.
+
+    Futures are yielded in the same order as urls, so callers can still process pages in order, e.g. in descending
+    date order. `future.result()` returns the page or raises the same exception as `get_raw_page`. Closing the iterator
+    early cancels the pages that haven't started being fetched, without waiting for the ones being fetched.
+
+    :param urls: urls to fetch, in the order they are needed
+    :param max_workers: number of pages fetched at the same time
+    :param requests_per_second: max sustained request rate
+    :param window: max number of pages fetched ahead, defaults to twice max_workers
+    :param client: client to fetch with, defaults to `get_default_http_client()`
+    :return: iterator of futures of the raw pages, in the same order as urls
+    """
+    rate_limiter = TokenBucket(requests_per_second)
+    window = window or 2 * max_workers
+    urls = iter(urls)
+    # not used as a context manager, since exiting it waits for every running fetch
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    try:
+        for url in urls:
+            pending.append(executor.submit(get_raw_page, url, rate_limiter, client))
+            if len(pending) >= window:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 def _get_answers_list_from_answers_div(answers_div: BeautifulSoup | Tag | NavigableString) -> list[str]:
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 from urllib.error import HTTPError
 
 from data.dictionary_utils import get_dictionary_from_path, write_words_to_dictionary
-from scraper.nyt_bee_scraper import get_date_string, get_url_from_date, get_raw_page, \
+from scraper.nyt_bee_scraper import get_date_string, get_url_from_date, get_raw_pages, \
     get_answer_list_from_nyt_page, get_url_date_dict_from_logfile, \
     write_url_date_dict_to_logfile, get_max_unique_words
 
@@ -17,19 +17,25 @@ scraped_urls = get_url_date_dict_from_logfile('scraper/logs/scraped_dates.txt')
 known_missing_urls = get_url_date_dict_from_logfile('scraper/logs/known_missing_pages.txt')
 unique_words = set(get_dictionary_from_path('data/raw_word_lists/nytbee_dot_com_scraped_answers.txt'))
 
+dates = []
+while date_object > datetime(year=2018, month=7, day=28):  # oldest nytbee.com page
+    date_object = date_object - timedelta(days=1)
+    dates.append(date_object)
+skipped_dates = {d for d in dates if get_url_from_date(d) in scraped_urls or get_url_from_date(d) in known_missing_urls}
+# pages are fetched concurrently ahead of time, but still processed one at a time in descending date order
+raw_pages = get_raw_pages(get_url_from_date(d) for d in dates if d not in skipped_dates)
+
 try:
     consecutive_404 = False
-    while date_object > datetime(year=2018, month=7, day=28):  # oldest nytbee.com page
-        date_object = date_object - timedelta(days=1)
-
+    for date_object in dates:
         current_url = get_url_from_date(date_object)
-        if current_url in scraped_urls or current_url in known_missing_urls:
+        if date_object in skipped_dates:
             consecutive_404 = False
             continue
 
         print("Processing - " + current_url)
         try:
-            raw_page = get_raw_page(current_url)
+            raw_page = next(raw_pages).result()
         except HTTPError as e:
             if e.code == 404 and consecutive_404 == False:
                 known_missing_urls[current_url] = get_date_string(date_object)
@@ -53,6 +59,8 @@ try:
 
         scraped_urls[current_url] = get_date_string(date_object)
 finally:
+    # stops fetching pages ahead if all unique words were found
+    raw_pages.close()
     write_words_to_dictionary(unique_words, 'data/raw_word_lists/nytbee_dot_com_scraped_answers.txt')
     write_url_date_dict_to_logfile(scraped_urls, 'scraper/logs/scraped_dates.txt')
     write_url_date_dict_to_logfile(known_missing_urls, 'scraper/logs/known_missing_pages.txt')
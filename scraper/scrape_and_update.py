@@ -5,12 +5,14 @@ from datetime import datetime, timedelta, date
 from urllib.error import HTTPError
 
 from data.dictionary_utils import get_dictionary_from_path, write_words_to_dictionary, \
-    get_custom_dictionary, add_words_to_custom, delete_words_from_custom
-from data.puzzles_utils import get_puzzles_from_file, NYTBeePuzzle, write_puzzles_to_file
-from scraper.nyt_bee_scraper import get_date_string, get_url_from_date, get_raw_page, \
+    add_words_to_custom, delete_words_from_custom, compact_custom_dictionary
+from data.index_utils import get_cached_index
+from data.puzzle_store import get_puzzle_store
+from data.puzzles_utils import NYTBeePuzzle
+from scraper.nyt_bee_scraper import get_date_string, get_url_from_date, get_raw_pages, \
     get_answer_list_from_nyt_page, get_url_date_dict_from_logfile, \
     write_url_date_dict_to_logfile, get_max_unique_words, get_non_official_answers_from_nyt_page
-from spelling_bee_solvers import preprocess_get_radix_tree, get_bee_solutions_radix_tree
+from spelling_bee_solvers import get_bee_solutions_radix_tree, update_radix_tree
 
 date_object = datetime.now().date()
 starting_date = date_object - timedelta(days=1)
@@ -21,25 +23,33 @@ scraped_urls = get_url_date_dict_from_logfile('scraper/logs/scraped_dates.txt')
 known_missing_urls = get_url_date_dict_from_logfile('scraper/logs/known_missing_pages.txt')
 undetermined_center_urls = get_url_date_dict_from_logfile('scraper/logs/undetermined_center_pages.txt')
 unique_words = set(get_dictionary_from_path('data/processed/nytbee_dot_com_scraped_answers.txt'))
-scraped_puzzles = get_puzzles_from_file()
+puzzle_store = get_puzzle_store()
 
-radix_tree = preprocess_get_radix_tree(get_custom_dictionary(), {})
+radix_tree = get_cached_index('radix_tree')
+
+dates = []
+while date_object > date(year=2018, month=7, day=28):  # oldest nytbee.com page
+    date_object = date_object - timedelta(days=1)
+    dates.append(date_object)
+stored_dates = puzzle_store.get_puzzle_dates()
+skipped_dates = {d for d in dates if get_url_from_date(d) in known_missing_urls or
+                 (get_url_from_date(d) in scraped_urls and d in stored_dates)}
+# pages are fetched concurrently ahead of time, but still processed one at a time in descending date order
+raw_pages = get_raw_pages(get_url_from_date(d) for d in dates if d not in skipped_dates)
 
 words_to_add = set()
 words_to_delete = set()
 try:
     consecutive_404 = False
-    while date_object > date(year=2018, month=7, day=28):  # oldest nytbee.com page
-        date_object = date_object - timedelta(days=1)
-
+    for date_object in dates:
         current_url = get_url_from_date(date_object)
-        if current_url in known_missing_urls or (current_url in scraped_urls and date_object in scraped_puzzles):
+        if date_object in skipped_dates:
             consecutive_404 = False
             continue
 
         print("Processing - " + current_url)
         try:
-            raw_page = get_raw_page(current_url)
+            raw_page = next(raw_pages).result()
         except HTTPError as e:
             if e.code == 404 and consecutive_404 == False:
                 known_missing_urls[current_url] = get_date_string(date_object)
@@ -84,38 +94,43 @@ try:
             solutions = set(get_bee_solutions_radix_tree(center_letter, ''.join(other_letters), radix_tree))
             print(f"Our solver found {len(solutions)} words.")
 
-            extra_words = solutions - set(answer_list) - words_to_delete
-            print(f"\t{extra_words} to be deleted.")
-            filtered_extra_words = []
+            answers = set(answer_list)
+            # The tree already has the edits from earlier pages, so words that are pending deletion aren't solutions
+            # anymore.
+            extra_words = solutions - answers
             # Handle the corner case that NYT started accepting words later that it didn't accept before. Since we
             # are going in descending order, this means that those words should be in our unique_words list. If they
             # exist there, do not delete them.
-            for w in extra_words:
-                if w not in unique_words:
-                    filtered_extra_words.append(w)
-            words_to_delete.update(filtered_extra_words)
+            filtered_extra_words = extra_words - unique_words
+            print(f"\t{filtered_extra_words} to be deleted.")
             if len(extra_words) > len(filtered_extra_words):
-                print(f"\t\tOnly {filtered_extra_words} will be deleted.")
+                print(f"\t\t{extra_words - filtered_extra_words} are accepted by later puzzles and will be kept.")
+            words_to_delete.update(filtered_extra_words)
 
-            new_words = set(answer_list) - solutions - words_to_add
+            new_words = answers - solutions - words_to_add
             print(f"\t{new_words} to be added.")
             words_to_add.update(new_words)
 
-            scraped_puzzles[date_object] = NYTBeePuzzle(date_object, center_letter, other_letters, answer_list)
+            # keep the tree in line with the pending edits instead of generating it again
+            update_radix_tree(radix_tree, new_words, filtered_extra_words)
+
+            puzzle_store.upsert_puzzle(NYTBeePuzzle(date_object, center_letter, other_letters, answer_list))
 
         unique_words.update(answer_list)
         print("Unique word count - " + str(len(unique_words)))
 
         scraped_urls[current_url] = get_date_string(date_object)
 finally:
+    raw_pages.close()
     try:
         write_words_to_dictionary(unique_words, 'data/processed/nytbee_dot_com_scraped_answers.txt')
-        write_puzzles_to_file([scraped_puzzles[p] for p in scraped_puzzles])
+        puzzle_store.export_to_json()
         write_url_date_dict_to_logfile(scraped_urls, 'scraper/logs/scraped_dates.txt')
         write_url_date_dict_to_logfile(known_missing_urls, 'scraper/logs/known_missing_pages.txt')
         write_url_date_dict_to_logfile(undetermined_center_urls, 'scraper/logs/undetermined_center_pages.txt')
         add_words_to_custom(words_to_add)
         delete_words_from_custom(words_to_delete)
+        compact_custom_dictionary()
     except Exception as e:
         print('-------------------------')
         print(
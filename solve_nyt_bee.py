@@ -1,26 +1,70 @@
-import argparse
-
-from data.dictionary_utils import get_custom_dictionary
-from spelling_bee_solvers import preprocess_get_radix_tree, get_bee_solutions_radix_tree
-
-parser = argparse.ArgumentParser(
-    description="Generates a list of solutions for the NYT Spelling Bee.",
-    epilog="Note: The list of solutions may contain extra words or be missing some words. NYT doesn't publish a set "
-           "dictionary for the Spelling Bee so this script uses a custom dictionary which may not be completely "
-           "accurate.",
-    add_help=True)
-parser.add_argument("-c", "--center", required=True, nargs=1, dest="center", metavar="letter",
-                    help="Central letter that must be used in the solutions (1 letter).")
-parser.add_argument("-o", "--others", required=True, nargs=1, dest="others", metavar="letters",
-                    help="Other letters that must be used in the solutions (6 letters).")
-args = parser.parse_args()
-# nargs returns a list
-center = args.center[0]
-others = args.others[0]
-
-radix_tree = preprocess_get_radix_tree(get_custom_dictionary(), {})
-solutions = get_bee_solutions_radix_tree(center, others, radix_tree)
-
-print(f"Spelling Bee Solutions - [{center.upper()} | {' '.join(c.upper() for c in others)}]:")
-for sol in sorted(solutions):
-    print(f"    {sol}")
+import sys
+
+
+def _parse_args_fast(argv: list[str]) -> tuple[str, str] | None:
+    """
+    Handles the usual `-c <letter> -o <letters>` arguments (in either order) without argparse, which takes about as long
+    to import as everything else in this script put together.
+
+    :param argv: command line arguments, excluding the script name
+    :return: (center, others) or None if the arguments need argparse (e.g. --help or anything malformed)
+    """
+    if len(argv) != 4 or argv[1].startswith('-') or argv[3].startswith('-'):
+        return None
+
+    flags = {argv[0]: argv[1], argv[2]: argv[3]}
+    center = flags.get('-c', flags.get('--center'))
+    others = flags.get('-o', flags.get('--others'))
+    if center is None or others is None:
+        return None
+    return center, others
+
+
+def _get_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Generates a list of solutions for the NYT Spelling Bee.",
+        epilog="Note: The list of solutions may contain extra words or be missing some words. NYT doesn't publish a "
+               "set dictionary for the Spelling Bee so this script uses a custom dictionary which may not be "
+               "completely accurate.",
+        add_help=True)
+    parser.add_argument("-c", "--center", required=True, nargs=1, dest="center", metavar="letter",
+                        help="Central letter that must be used in the solutions (1 letter).")
+    parser.add_argument("-o", "--others", required=True, nargs=1, dest="others", metavar="letters",
+                        help="Other letters that must be used in the solutions (6 letters).")
+    return parser
+
+
+def _parse_args() -> tuple[str, str]:
+    args = _get_parser().parse_args()
+    # nargs returns a list
+    return args.center[0], args.others[0]
+
+
+fast_args = _parse_args_fast(sys.argv[1:])
+center, others = fast_args if fast_args is not None else _parse_args()
+center, others = center.lower(), others.lower()
+
+# Imported after parsing the arguments so that --help and argument errors don't have to wait for them
+from data.binary_dictionary import get_bee_solutions_binary_dictionary
+from data.index_utils import get_cached_binary_dictionary, get_cached_index
+from spelling_bee_solvers import get_bee_solutions_answer_table, validate_character_args
+
+try:
+    if not (center + others).isascii() or not (center + others).isalpha():
+        raise ValueError(f"Letters must be between a and z. Got {center} and {others}.")
+    validate_character_args(center, others)
+except ValueError as e:
+    _get_parser().error(str(e))
+
+# The answer table is memory mapped, so solving is a single lookup without building anything. It only has puzzles that
+# have a pangram, so any other letters fall back to scanning the binary dictionary, which is memory mapped as well.
+try:
+    solutions = get_bee_solutions_answer_table(center, others, get_cached_index('answer_table'))
+except LookupError:
+    solutions = get_bee_solutions_binary_dictionary(center, others, get_cached_binary_dictionary())
+
+lines = [f"Spelling Bee Solutions - [{center.upper()} | {' '.join(c.upper() for c in others)}]:"]
+lines.extend(f"    {sol}" for sol in sorted(solutions))
+print('\n'.join(lines))
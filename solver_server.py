@@ -0,0 +1,334 @@
+"""
+Long running solver server. The radix tree for the custom dictionary is loaded once when the server starts, so each
+request only pays for the traversal.
+
+Puzzles are solved with an HTTP GET request, e.g.
+    curl 'http://127.0.0.1:8080/solve?center=o&others=ctpnme'
+which returns JSON with the solutions, pangrams, max score and rank thresholds.
+
+Requests that arrive within a short window of each other are solved together as one batch. Identical puzzles in a batch
+are only solved once, and puzzles with the same letters but different centers are solved with a single traversal (see
+`get_bee_solutions_all_centers_radix_tree`). Solutions are also kept in an LRU cache, so repeated puzzles (e.g. the
+day's puzzle) skip the batch entirely. GET /stats returns the batch and cache counters.
+"""
+import argparse
+import asyncio
+import json
+from collections.abc import Iterable
+from string import ascii_lowercase
+from urllib.parse import urlsplit, parse_qs
+
+from data.dictionary_utils import CUSTOM_DICTIONARY_PATH
+from data.index_utils import get_cached_index, get_dictionary_hash
+from spelling_bee_cache import BeeSolutionCache
+from spelling_bee_scoring import get_bee_score, get_bee_rank_thresholds
+from spelling_bee_solvers import NestedStrDict, validate_character_args, get_bee_solutions_radix_tree, \
+    get_bee_solutions_all_centers_radix_tree, is_bee_pangram, update_radix_tree
+
+_HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                 500: 'Internal Server Error'}
+_VALID_LETTERS = set(ascii_lowercase)
+
+
+class SolverServer:
+    """
+    Solves puzzles in batches against a preloaded radix tree, and serves them over HTTP on a TCP or Unix domain socket.
+    """
+    __radix_tree: NestedStrDict
+    __batch_window: float
+    __max_batch_size: int
+    __queue: asyncio.Queue | None
+    __batcher: asyncio.Task | None
+    __tree_lock: asyncio.Lock | None
+    __server: asyncio.Server | None
+    __cache: BeeSolutionCache | None
+    __dictionary_version: str
+    batch_count: int
+    puzzle_count: int
+
+    def __init__(self, radix_tree: NestedStrDict, batch_window: float = 0.005, max_batch_size: int = 256,
+                 cache: BeeSolutionCache | None = None, dictionary_version: str = ''):
+        """
+        :param radix_tree: radix tree generated by `preprocess_get_radix_tree`
+        :param batch_window: seconds to wait for more requests after the first request of a batch arrives
+        :param max_batch_size: max number of requests in a batch
+        :param cache: cache for solutions, or None to solve every request
+        :param dictionary_version: version of the dictionary the radix tree was generated from, used in the cache key
+        """
+        self.__radix_tree = radix_tree
+        self.__batch_window = batch_window
+        self.__max_batch_size = max_batch_size
+        self.__queue = None
+        self.__batcher = None
+        self.__tree_lock = None
+        self.__server = None
+        self.__cache = cache
+        self.__dictionary_version = dictionary_version
+        self.batch_count = 0
+        self.puzzle_count = 0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080, unix_socket_path: str | None = None) -> \
+            asyncio.Server:
+        """
+        Starts the batcher and starts listening for connections. If unix_socket_path is given, the server listens on
+        that Unix domain socket instead of host and port.
+
+        :return: the underlying asyncio server, e.g. to find out which port was bound when port is 0
+        """
+        self.__queue = asyncio.Queue()
+        self.__tree_lock = asyncio.Lock()
+        self.__batcher = asyncio.create_task(self.__run_batches())
+        if unix_socket_path is None:
+            self.__server = await asyncio.start_server(self.__handle_connection, host, port)
+        else:
+            self.__server = await asyncio.start_unix_server(self.__handle_connection, unix_socket_path)
+        return self.__server
+
+    async def stop(self) -> None:
+        """
+        Stops listening and stops the batcher. Puzzles that are queued or being solved fail instead of waiting forever.
+        """
+        self.__server.close()
+        self.__batcher.cancel()
+        try:
+            await self.__batcher
+        except asyncio.CancelledError:
+            pass
+        while not self.__queue.empty():
+            _, _, future = self.__queue.get_nowait()
+            _fail_stopped(future)
+        await self.__server.wait_closed()
+
+    async def solve(self, center: str, others: str) -> dict:
+        """
+        Returns the cached result for the puzzle if there is one. Otherwise, queues the puzzle for the next batch and
+        waits for its result.
+
+        :param center: Central character that must appear in word. Length = 1
+        :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+        :return: dict with center, others, solutions, pangrams, max_score and rank_thresholds
+        """
+        # checked before queueing, since a puzzle that can't be solved would otherwise fail in the middle of a batch
+        if not set(center + others) <= _VALID_LETTERS:
+            raise ValueError(f"Letters must be lowercase a-z. Got {center} and {others}.")
+        validate_character_args(center, others)
+        others = ''.join(sorted(others))
+
+        # the dictionary could be edited while this puzzle is waiting, so the result is cached under the version that
+        # was current when it was queued
+        dictionary_version = self.__dictionary_version
+        if self.__cache is not None:
+            solutions = self.__cache.get(center, others, dictionary_version)
+            if solutions is not None:
+                return _get_result(center, others, solutions)
+
+        future = asyncio.get_running_loop().create_future()
+        await self.__queue.put((center, others, future))
+        result = await future
+        if self.__cache is not None:
+            self.__cache.put(center, others, result['solutions'], dictionary_version)
+        return result
+
+    async def apply_dictionary_edits(self, words_to_add: Iterable[str], words_to_delete: Iterable[str],
+                                     dictionary_version: str) -> None:
+        """
+        Updates the radix tree in place (see `update_radix_tree`) between batches, so the server doesn't need to be
+        restarted when the dictionary changes. Cached solutions are dropped since they are for the old version.
+
+        :param words_to_add: words to add
+        :param words_to_delete: words to remove
+        :param dictionary_version: version of the dictionary after the edits
+        """
+        async with self.__tree_lock:
+            update_radix_tree(self.__radix_tree, words_to_add, words_to_delete)
+            self.__dictionary_version = dictionary_version
+            if self.__cache is not None:
+                self.__cache.clear()
+
+    def get_stats(self) -> dict:
+        """
+        :return: dict of number of batches, number of puzzles solved in batches and cache stats (None if no cache)
+        """
+        return {'batches': self.batch_count,
+                'puzzles': self.puzzle_count,
+                'cache': None if self.__cache is None else self.__cache.get_stats()}
+
+    async def __run_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self.__queue.get()]
+                deadline = loop.time() + self.__batch_window
+                while len(batch) < self.__max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.__queue.get(), timeout))
+                    except TimeoutError:
+                        break
+
+                # solve in a worker thread so that the server can keep accepting requests for the next batch
+                try:
+                    async with self.__tree_lock:
+                        results = await loop.run_in_executor(None, self.solve_batch, [(c, o) for c, o, _ in batch])
+                except Exception as e:
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for (_, _, future), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        except asyncio.CancelledError:
+            # the puzzles of the batch that was being gathered or solved would otherwise wait forever
+            for _, _, future in batch:
+                _fail_stopped(future)
+            raise
+
+    def solve_batch(self, puzzles: list[tuple[str, str]]) -> list[dict | Exception]:
+        """
+        Solves a batch of puzzles. Puzzles are grouped by their letters, and groups with more than one center are solved
+        with a single traversal. Each group is solved separately, so if one fails only its own puzzles fail.
+
+        :param puzzles: list of (center, others) tuples. Others must be sorted.
+        :return: list of results (see `solve`), in the same order as puzzles. A puzzle whose group failed has the
+            exception instead of a result.
+        """
+        centers_by_letters = {}
+        for center, others in puzzles:
+            centers_by_letters.setdefault(''.join(sorted(center + others)), set()).add(center)
+
+        solutions_by_puzzle = {}
+        for letters, centers in centers_by_letters.items():
+            try:
+                if len(centers) == 1:
+                    center = next(iter(centers))
+                    others = letters.replace(center, '')
+                    solutions_by_puzzle[(center, others)] = get_bee_solutions_radix_tree(center, others,
+                                                                                         self.__radix_tree)
+                else:
+                    all_solutions = get_bee_solutions_all_centers_radix_tree(letters, self.__radix_tree)
+                    for center in centers:
+                        solutions_by_puzzle[(center, letters.replace(center, ''))] = all_solutions[center]
+            except Exception as e:
+                for center in centers:
+                    solutions_by_puzzle[(center, letters.replace(center, ''))] = e
+
+        self.batch_count += 1
+        self.puzzle_count += len(solutions_by_puzzle)
+        results = []
+        for center, others in puzzles:
+            solutions = solutions_by_puzzle[(center, others)]
+            results.append(solutions if isinstance(solutions, Exception) else _get_result(center, others, solutions))
+        return results
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Minimal HTTP/1.1 handler. Connections are kept alive until the client closes them or asks to close them.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if 'content-length' in headers:
+                    await reader.readexactly(int(headers['content-length']))
+
+                request_parts = request_line.decode('latin-1').split()
+                if len(request_parts) == 3:
+                    method, target, version = request_parts
+                    status, body = await self.__get_response(method, target)
+                    keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                else:
+                    # the rest of the stream can't be trusted after a malformed request, so close the connection
+                    status, body = 400, {'error': "Malformed request line."}
+                    keep_alive = False
+
+                payload = json.dumps(body).encode('utf-8')
+                writer.write(f'HTTP/1.1 {status} {_HTTP_REASONS[status]}\r\n'
+                             f'Content-Type: application/json\r\n'
+                             f'Content-Length: {len(payload)}\r\n'
+                             f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+                             f'\r\n'.encode('latin-1') + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def __get_response(self, method: str, target: str) -> tuple[int, dict]:
+        url = urlsplit(target)
+        if url.path not in ('/solve', '/stats'):
+            return 404, {'error': f"Unknown path {url.path}."}
+        if method != 'GET':
+            return 405, {'error': f"Method {method} not allowed."}
+        if url.path == '/stats':
+            return 200, self.get_stats()
+
+        query = parse_qs(url.query)
+        try:
+            return 200, await self.solve(query.get('center', [''])[0], query.get('others', [''])[0])
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            # the client still gets a response, e.g. when an index fails to load
+            return 500, {'error': f"Failed to solve puzzle: {type(e).__name__}: {e}"}
+
+
+def _get_result(center: str, others: str, solutions: list[str]) -> dict:
+    max_score = get_bee_score(solutions)
+    return {'center': center,
+            'others': others,
+            'solutions': sorted(solutions),
+            'pangrams': sorted(s for s in solutions if is_bee_pangram(s)),
+            'max_score': max_score,
+            'rank_thresholds': get_bee_rank_thresholds(max_score)}
+
+
+def _fail_stopped(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_exception(RuntimeError("Server stopped before the puzzle was solved."))
+
+
+async def _serve(radix_tree: NestedStrDict, dictionary_version: str, host: str, port: int,
+                 unix_socket_path: str | None, batch_window: float, cache_size: int) -> None:
+    cache = BeeSolutionCache(max_entries=cache_size) if cache_size > 0 else None
+    solver_server = SolverServer(radix_tree, batch_window=batch_window, cache=cache,
+                                 dictionary_version=dictionary_version)
+    server = await solver_server.start(host, port, unix_socket_path)
+    print(f"Listening on {unix_socket_path or ', '.join(str(s.getsockname()) for s in server.sockets)}")
+    await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Serves solutions for the NYT Spelling Bee over HTTP, e.g. GET /solve?center=o&others=ctpnme.",
+        add_help=True)
+    parser.add_argument("--host", default='127.0.0.1', dest="host", help="Host to listen on.")
+    parser.add_argument("-p", "--port", type=int, default=8080, dest="port", help="Port to listen on.")
+    parser.add_argument("-u", "--unix-socket", default=None, dest="unix_socket",
+                        help="Listen on this Unix domain socket instead of host and port.")
+    parser.add_argument("-d", "--dictionary", default=CUSTOM_DICTIONARY_PATH, dest="dictionary",
+                        help="Path of dictionary relative to the project root.")
+    parser.add_argument("-w", "--batch-window", type=float, default=5, dest="batch_window",
+                        help="Milliseconds to wait for more requests before solving a batch.")
+    parser.add_argument("-c", "--cache-size", type=int, default=1024, dest="cache_size",
+                        help="Number of puzzles to keep in the solution cache. 0 disables the cache.")
+    args = parser.parse_args()
+
+    asyncio.run(_serve(get_cached_index('radix_tree', args.dictionary), get_dictionary_hash(args.dictionary), args.host,
+                       args.port, args.unix_socket, args.batch_window / 1000, args.cache_size))
@@ -0,0 +1,61 @@
+"""
+Solves many puzzles at once (e.g. every puzzle from `get_puzzles_from_file()`) across a pool of worker processes.
+"""
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from data.dictionary_utils import CUSTOM_DICTIONARY_PATH
+from data.index_utils import get_cached_index
+from data.puzzles_utils import NYTBeePuzzle
+from spelling_bee_solvers import NestedStrDict, get_bee_solutions_radix_tree
+
+_worker_radix_tree: NestedStrDict = {}
+
+
+def _init_worker(dictionary_path: str | Path, radix_tree: NestedStrDict | None) -> None:
+    """
+    Sets up the radix tree once per worker. Unless a tree was passed in, it is loaded from the index cache, so only the
+    path is sent to the worker, which is much cheaper than sending the whole dictionary or tree.
+    """
+    global _worker_radix_tree
+    _worker_radix_tree = radix_tree if radix_tree is not None else get_cached_index('radix_tree', dictionary_path)
+
+
+def _solve_puzzle(center_and_others: tuple[str, str]) -> list[str]:
+    center, others = center_and_others
+    return get_bee_solutions_radix_tree(center, others, _worker_radix_tree)
+
+
+def solve_puzzles_in_parallel(puzzles: Iterable[NYTBeePuzzle], dictionary_path: str | Path = CUSTOM_DICTIONARY_PATH,
+                              max_workers: int | None = None, chunk_size: int = 64,
+                              radix_tree: NestedStrDict | None = None) -> Iterator[tuple[NYTBeePuzzle, list[str]]]:
+    """
+    Solves the puzzles across a process pool. Each worker loads its own radix tree for the dictionary when it starts,
+    from the index cache (see `get_cached_index`). Only the center and other letters of each puzzle are sent to the
+    workers, in chunks to keep the inter-process overhead down.
+
+    Whether this is faster than solving the puzzles one after another depends on the number of CPUs, since every worker
+    pays for loading its tree first. batch_benchmarker.py compares the two.
+
+    Results are yielded in date order as soon as they (and every result before them) are ready. If the caller stops
+    iterating early, any puzzles that haven't been started yet are cancelled.
+
+    :param puzzles: puzzles to solve
+    :param dictionary_path: Path of dictionary relative to project root
+    :param max_workers: number of worker processes, defaults to the number of CPUs
+    :param chunk_size: number of puzzles sent to a worker at a time
+    :param radix_tree: tree to send to every worker instead of loading it from the index cache, e.g. one that was
+    already built for `dictionary_path`. It is pickled once per worker.
+    :return: iterator of (puzzle, solutions) in order of puzzle date
+    """
+    sorted_puzzles = sorted(puzzles, key=lambda p: p.get_puzzle_date())
+
+    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                   initargs=(dictionary_path, radix_tree))
+    try:
+        all_solutions = executor.map(_solve_puzzle, [(p.get_center(), p.get_others()) for p in sorted_puzzles],
+                                     chunksize=chunk_size)
+        yield from zip(sorted_puzzles, all_solutions)
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,125 @@
+import sys
+from collections import OrderedDict
+from collections.abc import Callable
+
+# (dictionary version, center, sorted others)
+type CacheKey = tuple[str, str, str]
+
+
+def _get_solutions_size(solutions: list[str]) -> int:
+    """
+    :return: approximate memory used by the list of solutions and the words in it, in bytes
+    """
+    return sys.getsizeof(solutions) + sum(sys.getsizeof(word) for word in solutions)
+
+
+class BeeSolutionCache:
+    """
+    Bounded LRU cache of puzzle solutions. Entries are keyed on the version of the dictionary that solved them (e.g. a
+    hash from `get_dictionary_hash`), the center and the sorted other letters, so the order of the other letters doesn't
+    matter and solutions from an old dictionary are never returned for a new one.
+
+    The least recently used entries are evicted once there are more than max_entries entries, or once the solutions
+    take up more than max_bytes (if set).
+    """
+    __entries: OrderedDict[CacheKey, tuple[list[str], int]]
+    __max_entries: int
+    __max_bytes: int | None
+    __total_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int | None = None):
+        """
+        :param max_entries: max number of puzzles in the cache
+        :param max_bytes: max approximate memory used by the cached solutions, or None for no limit
+        """
+        if max_entries < 1:
+            raise ValueError(f"Max entries must be at least 1. Got {max_entries}.")
+
+        self.__entries = OrderedDict()
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @staticmethod
+    def get_key(center: str, others: str, dictionary_version: str = '') -> CacheKey:
+        return dictionary_version, center, ''.join(sorted(others))
+
+    def get(self, center: str, others: str, dictionary_version: str = '') -> list[str] | None:
+        """
+        :return: copy of the cached solutions, or None if the puzzle isn't cached
+        """
+        key = self.get_key(center, others, dictionary_version)
+        if key not in self.__entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return self.__entries[key][0].copy()
+
+    def put(self, center: str, others: str, solutions: list[str], dictionary_version: str = '') -> None:
+        """
+        Caches a copy of the solutions and evicts least recently used entries until the cache is within its bounds.
+        Solutions bigger than max_bytes on their own aren't cached at all.
+        """
+        key = self.get_key(center, others, dictionary_version)
+        size = _get_solutions_size(solutions)
+        if self.__max_bytes is not None and size > self.__max_bytes:
+            return
+
+        if key in self.__entries:
+            self.__total_bytes -= self.__entries.pop(key)[1]
+        self.__entries[key] = (solutions.copy(), size)
+        self.__total_bytes += size
+
+        while len(self.__entries) > self.__max_entries or \
+                (self.__max_bytes is not None and self.__total_bytes > self.__max_bytes):
+            _, (_, evicted_size) = self.__entries.popitem(last=False)
+            self.__total_bytes -= evicted_size
+            self.evictions += 1
+
+    def get_or_solve(self, center: str, others: str, solver: Callable[[str, str], list[str]],
+                     dictionary_version: str = '') -> list[str]:
+        """
+        Returns the cached solutions, or solves the puzzle and caches the solutions if it isn't cached yet, e.g.
+            cache.get_or_solve(center, others, lambda c, o: get_bee_solutions_radix_tree(c, o, radix_tree))
+
+        :param center: Central character that must appear in word. Length = 1
+        :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+        :param solver: function that takes center and others and returns the solutions
+        :param dictionary_version: version of the dictionary the solver uses
+        :return: list of solutions
+        """
+        solutions = self.get(center, others, dictionary_version)
+        if solutions is None:
+            solutions = solver(center, others)
+            self.put(center, others, solutions, dictionary_version)
+        return solutions
+
+    def clear(self) -> None:
+        """
+        Removes every entry. The counters are not reset.
+        """
+        self.__entries.clear()
+        self.__total_bytes = 0
+
+    def get_stats(self) -> dict[str, int | float]:
+        """
+        :return: dict of entries, bytes, hits, misses, evictions and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {'entries': len(self.__entries),
+                'bytes': self.__total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,97 @@
+from spelling_bee_solvers import validate_character_args, get_valid_word_bits
+
+# Rank name and percentage of the max score needed to reach it
+RANKS = [('Beginner', 0), ('Good Start', 2), ('Moving Up', 5), ('Good', 8), ('Solid', 15), ('Nice', 25),
+         ('Great', 40), ('Amazing', 50), ('Genius', 70), ('Queen Bee', 100)]
+
+PANGRAM_BONUS = 7
+
+
+def get_word_score(word: str) -> int:
+    """
+    Scores a single (valid) solution as per the NYT rules. 4 letter words are worth 1 point, longer words are worth 1
+    point per letter and pangrams (words using all 7 letters) get 7 bonus points.
+
+    :param word: a valid solution for a puzzle
+    :return: score for the word
+    """
+    score = 1 if len(word) == 4 else len(word)
+    if len(set(word)) == 7:
+        score += PANGRAM_BONUS
+    return score
+
+
+def get_bee_score(solutions: list[str] | set[str]) -> int:
+    """
+    :param solutions: valid solutions for a puzzle
+    :return: total score for the solutions
+    """
+    return sum(get_word_score(word) for word in solutions)
+
+
+def preprocess_get_bit_to_score_dict(bit_dictionary: dict[int, [str]]) -> dict[int, tuple[int, int, int]]:
+    """
+    Scores every word in a bit dictionary generated by `preprocess_get_bit_to_word_dict` once, and sums the scores for
+    each bit representation. Whether a word is a pangram only depends on the number of letters in its bit
+    representation (a valid word with 7 different letters must use every letter in the puzzle), so the pangram bonus
+    can be included here too.
+
+    :param bit_dictionary: dict of bit representation to list of words
+    :return: dict of bit representation to (total score, number of words, number of pangrams)
+    """
+    bit_score_dict = {}
+    for word_bits, words in bit_dictionary.items():
+        pangram_count = len(words) if word_bits.bit_count() == 7 else 0
+        bit_score_dict[word_bits] = (sum(get_word_score(word) for word in words), len(words), pangram_count)
+
+    return bit_score_dict
+
+
+def get_bee_puzzle_totals(center: str, others: str, bit_score_dictionary: dict[int, tuple[int, int, int]]) -> \
+        tuple[int, int, int]:
+    """
+    Calculates the totals for a puzzle without looking at any words. The totals for every bit representation a valid
+    word could have (see `get_valid_word_bits`) are simply added up.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :param bit_score_dictionary: dict generated by `preprocess_get_bit_to_score_dict`
+    :return: (max score, number of solutions, number of pangrams)
+    """
+    validate_character_args(center, others)
+
+    max_score = 0
+    solution_count = 0
+    pangram_count = 0
+    for word_bits in get_valid_word_bits(center, others):
+        if word_bits in bit_score_dictionary:
+            score, word_count, pangrams = bit_score_dictionary[word_bits]
+            max_score += score
+            solution_count += word_count
+            pangram_count += pangrams
+
+    return max_score, solution_count, pangram_count
+
+
+def get_bee_rank_thresholds(max_score: int) -> dict[str, int]:
+    """
+    Calculates the minimum score needed for each rank. Thresholds are a percentage of the max score, rounded to the
+    nearest point (halves round up).
+
+    :param max_score: max score for the puzzle
+    :return: dict of rank name to minimum score, in order of increasing score
+    """
+    return {rank: (max_score * percentage + 50) // 100 for rank, percentage in RANKS}
+
+
+def get_bee_rank(score: int, max_score: int) -> str:
+    """
+    :param score: current score
+    :param max_score: max score for the puzzle
+    :return: name of the highest rank reached by the score
+    """
+    current_rank = RANKS[0][0]
+    for rank, threshold in get_bee_rank_thresholds(max_score).items():
+        if score >= threshold:
+            current_rank = rank
+    return current_rank
@@ -1,6 +1,20 @@
+import heapq
+import itertools
 import string
+import struct
+from array import array
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Iterable, Iterator
 
 type NestedStrDict = dict[str, NestedStrDict | None]
+# Same as NestedStrDict, but every node also has a '#' key whose value is a (union bits, intersection bits) tuple
+type AnnotatedRadixTree = dict[str, AnnotatedRadixTree | tuple[int, int] | None]
+# (first child index, child bits, terminal flags) arrays, indexed by node. See `preprocess_get_compact_trie`.
+type CompactTrie = tuple[array, array, bytearray]
+
+# int representation of binary number with 26 1s
+ALL_LETTER_BITS = 67108863
 
 
 def validate_character_args(center: str, others: str):
@@ -132,6 +146,245 @@ def get_bee_solutions_bitwise(center: str, others: str, bit_dictionary: dict[int
     return valid_bee_words
 
 
+def get_letter_bits(letters: str | set[str]) -> int:
+    """
+    Returns the 26 bit representation of a group of letters, in the same format as the keys generated by
+    `preprocess_get_bit_to_word_dict`. I.e. 'a' is the most significant bit and 'z' is the least significant bit.
+
+    :param letters: letters to convert. Duplicates and ordering are ignored.
+    :return: int representation of the bits
+    """
+    bits = 0
+    for c in letters:
+        bits |= 1 << (25 - string.ascii_lowercase.index(c))
+    return bits
+
+
+def get_valid_word_bits(center: str, others: str) -> list[int]:
+    """
+    Returns every bit representation that a valid word for the puzzle could have. A valid word must contain the
+    center letter and may contain any combination of the other letters, so these are the center bit combined with
+    each of the 2^6 = 64 submasks of the other letters' bits.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :return: list of 64 bit representations
+    """
+    center_bits = get_letter_bits(center)
+    other_bits = get_letter_bits(others)
+
+    # Standard trick for enumerating all submasks of a mask: (submask - 1) & mask gives the next smaller submask.
+    valid_word_bits = []
+    submask = other_bits
+    while True:
+        valid_word_bits.append(center_bits | submask)
+        if submask == 0:
+            break
+        submask = (submask - 1) & other_bits
+
+    return valid_word_bits
+
+
+def get_bee_solutions_bitwise_submask(center: str, others: str, bit_dictionary: dict[int, [str]]) -> list[str]:
+    """
+    Uses the same bit dictionary as `get_bee_solutions_bitwise`, but instead of checking every key in the dictionary,
+    we generate every bit representation a valid word could have and look each one up directly.
+
+    There are only 64 such representations (the center letter plus any subset of the 6 other letters), so this is a
+    fixed 64 dictionary lookups per puzzle regardless of how big the dictionary is.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :param bit_dictionary: Dictionary of words to look in, where the keys are the bit representations of the word and
+    the values are the string representation of the words
+    :return: list of solutions
+    """
+    validate_character_args(center, others)
+
+    valid_bee_words = []
+    for word_bits in get_valid_word_bits(center, others):
+        if word_bits in bit_dictionary:
+            valid_bee_words.extend(bit_dictionary[word_bits])
+
+    return valid_bee_words
+
+
+def insert_word_into_bit_to_word_dict(word: str, bit_dictionary: dict[int, [str]]) -> bool:
+    """
+    Adds a word to a bit dictionary generated by `preprocess_get_bit_to_word_dict` in place. The words for each bit
+    representation are kept in sorted order, so a dictionary generated from a sorted list of words stays the same as
+    one generated from scratch.
+
+    :param word: word to add
+    :param bit_dictionary: dict of bit representation to list of words
+    :return: True if the word was added, False if it was already in the dictionary
+    """
+    word_bits = get_letter_bits(word)
+    if word_bits not in bit_dictionary:
+        bit_dictionary[word_bits] = [word]
+        return True
+
+    words = bit_dictionary[word_bits]
+    index = bisect_left(words, word)
+    if index < len(words) and words[index] == word:
+        return False
+    insort(words, word)
+    return True
+
+
+def delete_word_from_bit_to_word_dict(word: str, bit_dictionary: dict[int, [str]]) -> bool:
+    """
+    Removes a word from a bit dictionary generated by `preprocess_get_bit_to_word_dict` in place. Bit representations
+    with no words left are removed.
+
+    :param word: word to remove
+    :param bit_dictionary: dict of bit representation to list of words
+    :return: True if the word was removed, False if it wasn't in the dictionary
+    """
+    word_bits = get_letter_bits(word)
+    if word_bits not in bit_dictionary or word not in bit_dictionary[word_bits]:
+        return False
+
+    bit_dictionary[word_bits].remove(word)
+    if not bit_dictionary[word_bits]:
+        del bit_dictionary[word_bits]
+    return True
+
+
+def update_bit_to_word_dict(bit_dictionary: dict[int, [str]], words_to_add: Iterable[str] = (),
+                            words_to_delete: Iterable[str] = ()) -> None:
+    """
+    Applies a set of dictionary edits to a bit dictionary in place, instead of generating it again. Words are deleted
+    before they are added.
+
+    :param bit_dictionary: dict of bit representation to list of words
+    :param words_to_add: words to add
+    :param words_to_delete: words to remove
+    """
+    for word in words_to_delete:
+        delete_word_from_bit_to_word_dict(word, bit_dictionary)
+    for word in words_to_add:
+        insert_word_into_bit_to_word_dict(word, bit_dictionary)
+
+
+# Answer table layout. All integers are unsigned 32 bit in native byte order (the table is a local build artifact).
+#   header:             magic, key count, solution id count, word count, blob length
+#   keys:               u32[key count], sorted. Each key is (letter bits << 5) | index of center letter in alphabet
+#   solution offsets:   u32[key count + 1], solutions for keys[i] are solution_ids[offsets[i]:offsets[i + 1]]
+#   solution ids:       u32[solution id count], ids of words in alphabetical order
+#   word offsets:       u32[word count + 1], word i is blob[offsets[i]:offsets[i + 1]]
+#   blob:               all words encoded as utf-8 and concatenated
+ANSWER_TABLE_MAGIC = b'NYTA'
+_ANSWER_TABLE_HEADER = struct.Struct('=4s4I')
+
+
+def _get_answer_table_key(center: str, letter_bits: int) -> int:
+    return (letter_bits << 5) | string.ascii_lowercase.index(center)
+
+
+def get_answer_table_size(answer_table: bytes | memoryview) -> int:
+    """
+    :param answer_table: answer table bytes or any other buffer (e.g. mmap) containing the table
+    :return: size in bytes of the table described by its header
+    :raises ValueError: if the buffer doesn't start with an answer table header
+    """
+    if len(answer_table) < _ANSWER_TABLE_HEADER.size:
+        raise ValueError(f"Answer table is too short for its header: {len(answer_table)} bytes.")
+    magic, key_count, solution_id_count, word_count, blob_length = _ANSWER_TABLE_HEADER.unpack_from(answer_table, 0)
+    if magic != ANSWER_TABLE_MAGIC:
+        raise ValueError(f"Answer table has unexpected magic bytes: {magic}.")
+
+    return _ANSWER_TABLE_HEADER.size + 4 * (2 * key_count + 1 + solution_id_count + word_count + 1) + blob_length
+
+
+def preprocess_get_answer_table(dictionary: list[str]) -> bytes:
+    """
+    Precomputes the solutions for every puzzle that can be generated from the dictionary and packs them into a single
+    binary table (see the layout above). A puzzle can be generated from any 7 letter set that has at least one pangram
+    in the dictionary, and each such set gives 7 puzzles, one per center letter.
+
+    The solutions for a letter set are found by looking up each of its submasks in the bit to word dictionary, similar
+    to `get_bee_solutions_bitwise_submask`.
+
+    :param dictionary: list of words
+    :return: answer table as bytes, which can be written straight to a file
+    """
+    words = sorted(set(dictionary))
+    blob = bytearray()
+    word_offsets = array('I', [0])
+    bit_to_word_ids = {}
+    for word_id, word in enumerate(words):
+        blob.extend(word.encode('utf-8'))
+        word_offsets.append(len(blob))
+        word_bits = get_letter_bits(word)
+        if word_bits in bit_to_word_ids:
+            bit_to_word_ids[word_bits].append(word_id)
+        else:
+            bit_to_word_ids[word_bits] = [word_id]
+
+    keys = array('I')
+    solution_offsets = array('I', [0])
+    solution_ids = array('I')
+    for letter_bits in sorted(b for b in bit_to_word_ids if b.bit_count() == 7):
+        letters = [c for c in string.ascii_lowercase if get_letter_bits(c) & letter_bits]
+        for center in letters:
+            others = ''.join(c for c in letters if c != center)
+            word_ids = []
+            for word_bits in get_valid_word_bits(center, others):
+                if word_bits in bit_to_word_ids:
+                    word_ids.extend(bit_to_word_ids[word_bits])
+
+            keys.append(_get_answer_table_key(center, letter_bits))
+            solution_ids.extend(sorted(word_ids))
+            solution_offsets.append(len(solution_ids))
+
+    header = _ANSWER_TABLE_HEADER.pack(ANSWER_TABLE_MAGIC, len(keys), len(solution_ids), len(words), len(blob))
+    return b''.join([header, keys.tobytes(), solution_offsets.tobytes(), solution_ids.tobytes(),
+                     word_offsets.tobytes(), bytes(blob)])
+
+
+def get_bee_solutions_answer_table(center: str, others: str, answer_table: bytes | memoryview) -> list[str]:
+    """
+    Looks up the precomputed solutions for the puzzle in an answer table generated by `preprocess_get_answer_table`.
+    This is a single binary search over the table keys, so no tree or dictionary needs to be built in memory. The
+    table can be a memory mapped file, in which case only the pages that are actually read get loaded.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :param answer_table: answer table bytes or any other buffer (e.g. mmap) containing the table
+    :return: list of solutions
+    """
+    validate_character_args(center, others)
+
+    magic, key_count, solution_id_count, word_count, blob_length = _ANSWER_TABLE_HEADER.unpack_from(answer_table, 0)
+    if magic != ANSWER_TABLE_MAGIC:
+        raise ValueError(f"Answer table has unexpected magic bytes: {magic}.")
+
+    table = memoryview(answer_table)
+    start = _ANSWER_TABLE_HEADER.size
+    keys = table[start:start + 4 * key_count].cast('I')
+    start += 4 * key_count
+    solution_offsets = table[start:start + 4 * (key_count + 1)].cast('I')
+    start += 4 * (key_count + 1)
+    solution_ids = table[start:start + 4 * solution_id_count].cast('I')
+    start += 4 * solution_id_count
+    word_offsets = table[start:start + 4 * (word_count + 1)].cast('I')
+    start += 4 * (word_count + 1)
+    blob = table[start:start + blob_length]
+
+    key = _get_answer_table_key(center, get_letter_bits(center + others))
+    index = bisect_left(keys, key)
+    if index == len(keys) or keys[index] != key:
+        raise LookupError(f"No puzzle with center {center} and others {others} in answer table. The letters do not "
+                          f"form a pangram with any word in the dictionary.")
+
+    valid_bee_words = []
+    for word_id in solution_ids[solution_offsets[index]:solution_offsets[index + 1]]:
+        valid_bee_words.append(str(blob[word_offsets[word_id]:word_offsets[word_id + 1]], 'utf-8'))
+
+    return valid_bee_words
+
+
 def preprocess_get_prefix_tree(dictionary: list[str]) -> dict[str, set[str]]:
     """
     Converts the list of words into a prefix tree (trie) where each node is a string prefix and each child represents
@@ -167,6 +420,45 @@ def preprocess_get_prefix_tree(dictionary: list[str]) -> dict[str, set[str]]:
     return big_massive_dict
 
 
+def _check_sorted(previous_word: str, word: str) -> None:
+    if word < previous_word:
+        raise ValueError(f"Words must be in sorted order, but got {word} after {previous_word}.")
+
+
+def preprocess_get_prefix_tree_from_sorted(sorted_words: Iterable[str]) -> dict[str, set[str]]:
+    """
+    Builds the same prefix tree as `preprocess_get_prefix_tree` in a single pass over an already sorted stream of
+    words.
+
+    Since the words are sorted, every prefix a word shares with the previous word already exists in the tree. So only
+    the prefix where the two words diverge gets a new next character, and only the prefixes after it have to be
+    created.
+
+    :param sorted_words: iterable of words in sorted order
+    :return: dictionary of prefix to list of next characters
+    """
+    prefix_tree = {}
+    previous_word = ''
+    for word in sorted_words:
+        _check_sorted(previous_word, word)
+        common_prefix_length = _get_common_prefix_length(previous_word, word)
+        if common_prefix_length == len(word):
+            continue  # duplicate
+
+        if common_prefix_length > 0:
+            prefix_tree[word[:common_prefix_length]].add(word[common_prefix_length])
+        for i in range(common_prefix_length + 1, len(word)):
+            prefix_tree[word[:i]] = {word[i]}
+        prefix_tree[word] = {'$'}  # gives us an ending character to know the word has finished
+
+        previous_word = word
+
+    # starting node
+    prefix_tree[''] = set(string.ascii_lowercase)
+
+    return prefix_tree
+
+
 def _traverse_prefix_tree(prefix: str, center: str, valid_letters: set[str],
                           prefix_tree: dict[str, set[str]]) -> list[str]:
     """
@@ -234,6 +526,36 @@ def preprocess_get_nested_prefix_tree(prefix: str, suffix_list: list[str], curr_
     return curr_tree
 
 
+def preprocess_get_nested_prefix_tree_from_sorted(sorted_words: Iterable[str]) -> NestedStrDict:
+    """
+    Builds the same nested prefix tree as `preprocess_get_nested_prefix_tree('', words, {})` in a single pass over an
+    already sorted stream of words, without recursion. See `preprocess_get_radix_tree_from_sorted`.
+
+    :param sorted_words: iterable of words in sorted order
+    :return: the full nested prefix tree
+    """
+    root = {}
+    # path[i] is the node for previous_word[:i]
+    path = [root]
+    previous_word = ''
+    for word in sorted_words:
+        _check_sorted(previous_word, word)
+        common_prefix_length = _get_common_prefix_length(previous_word, word)
+        del path[common_prefix_length + 1:]
+
+        node = path[common_prefix_length]
+        for i in range(common_prefix_length + 1, len(word) + 1):
+            child = {}
+            node[word[:i]] = child
+            path.append(child)
+            node = child
+        node['$'] = None  # '$' character to indicate end of word
+
+        previous_word = word
+
+    return root
+
+
 def _traverse_nested_prefix_tree(current_prefix: str, center: str, valid_letters: str | set[str],
                                  nested_prefix_tree: NestedStrDict) -> list[str]:
     """
@@ -309,6 +631,40 @@ def preprocess_get_radix_tree(suffix_list: list[str], curr_dict: NestedStrDict)
     return curr_dict
 
 
+def preprocess_get_radix_tree_from_sorted(sorted_words: Iterable[str]) -> NestedStrDict:
+    """
+    Builds the same radix tree as `preprocess_get_radix_tree(words, {})` in a single pass over an already sorted
+    stream of words, without recursion or slicing.
+
+    Since the words are sorted, a word can only share nodes with the words on the path to the previous word. So we keep
+    that path, cut it back to where the new word diverges from the previous word and add the rest of the new word from
+    there.
+
+    :param sorted_words: iterable of words in sorted order
+    :return: Generated tree represented by a NestedStrDict
+    """
+    root = {}
+    # path[i] is the node for previous_word[:i]
+    path = [root]
+    previous_word = ''
+    for word in sorted_words:
+        _check_sorted(previous_word, word)
+        common_prefix_length = _get_common_prefix_length(previous_word, word)
+        del path[common_prefix_length + 1:]
+
+        node = path[common_prefix_length]
+        for i in range(common_prefix_length, len(word)):
+            child = {}
+            node[word[i]] = child
+            path.append(child)
+            node = child
+        node['$'] = None  # '$' character to indicate end of word
+
+        previous_word = word
+
+    return root
+
+
 def _traverse_radix_tree(current_prefix: str, curr_dict: NestedStrDict, center, valid_letters: set[str]) -> \
         list[str]:
     """
@@ -344,3 +700,498 @@ def get_bee_solutions_radix_tree(center: str, others: str, radix_tree: NestedStr
     validate_character_args(center, others)
 
     return _traverse_radix_tree('', radix_tree, center, set(center + others))
+
+
+def insert_word_into_radix_tree(word: str, radix_tree: NestedStrDict) -> bool:
+    """
+    Adds a word to a radix tree generated by `preprocess_get_radix_tree` in place, creating any missing nodes along
+    the way.
+
+    Note: this must not be used on a DAWG (see `preprocess_get_dawg`). DAWG nodes are shared between words, so adding
+    a suffix under one word would add it under every word that shares the node. The annotations of an annotated radix
+    tree are not updated either, so it has to be annotated again afterwards.
+
+    :param word: word to add
+    :param radix_tree: word tree
+    :return: True if the word was added, False if it was already in the tree
+    """
+    curr_dict = radix_tree
+    for letter in word:
+        if letter not in curr_dict:
+            curr_dict[letter] = {}
+        curr_dict = curr_dict[letter]
+
+    if '$' in curr_dict:
+        return False
+    curr_dict['$'] = None
+    return True
+
+
+def delete_word_from_radix_tree(word: str, radix_tree: NestedStrDict) -> bool:
+    """
+    Removes a word from a radix tree generated by `preprocess_get_radix_tree` in place. Any nodes that no longer lead
+    to a word are pruned, so the tree ends up the same as one generated without the word.
+
+    Note: this must not be used on a DAWG, for the same reason as `insert_word_into_radix_tree`.
+
+    :param word: word to remove
+    :param radix_tree: word tree
+    :return: True if the word was removed, False if it wasn't in the tree
+    """
+    path = [radix_tree]
+    for letter in word:
+        if letter not in path[-1]:
+            return False
+        path.append(path[-1][letter])
+
+    if '$' not in path[-1]:
+        return False
+    del path[-1]['$']
+
+    # walk back up the path, removing nodes that are now empty
+    for depth in range(len(word), 0, -1):
+        if path[depth]:
+            break
+        del path[depth - 1][word[depth - 1]]
+
+    return True
+
+
+def update_radix_tree(radix_tree: NestedStrDict, words_to_add: Iterable[str] = (),
+                      words_to_delete: Iterable[str] = ()) -> None:
+    """
+    Applies a set of dictionary edits to a radix tree in place, instead of generating it again. Words are deleted
+    before they are added.
+
+    :param radix_tree: word tree
+    :param words_to_add: words to add
+    :param words_to_delete: words to remove
+    """
+    for word in words_to_delete:
+        delete_word_from_radix_tree(word, radix_tree)
+    for word in words_to_add:
+        insert_word_into_radix_tree(word, radix_tree)
+
+
+def _annotate_radix_tree(prefix_bits: int, curr_dict: NestedStrDict) -> tuple[int, int]:
+    """
+    Recursive function to add the '#' summary to every node of the radix tree.
+
+    :param prefix_bits: bit representation of the prefix leading to this node
+    :param curr_dict: Current NestedStrDict representing all possible next characters for the current prefix
+    :return: (union bits, intersection bits) of all words below this node
+    """
+    union_bits = 0
+    intersection_bits = ALL_LETTER_BITS
+
+    if '$' in curr_dict:
+        union_bits |= prefix_bits
+        intersection_bits &= prefix_bits
+
+    for letter in curr_dict:
+        if letter == '$' or letter == '#':
+            continue
+        child_union_bits, child_intersection_bits = _annotate_radix_tree(prefix_bits | get_letter_bits(letter),
+                                                                         curr_dict[letter])
+        union_bits |= child_union_bits
+        intersection_bits &= child_intersection_bits
+
+    curr_dict['#'] = (union_bits, intersection_bits)
+    return union_bits, intersection_bits
+
+
+def preprocess_get_annotated_radix_tree(radix_tree: NestedStrDict) -> AnnotatedRadixTree:
+    """
+    Adds a summary of the words below each node to a radix tree generated by `preprocess_get_radix_tree`. The summary
+    is stored under the '#' key as a tuple of:
+        union bits:         bit representation of every letter used by any word below the node
+        intersection bits:  bit representation of the letters used by every word below the node
+
+    If the intersection contains a letter that isn't in the puzzle, then every word below the node is invalid. If the
+    union doesn't contain the center letter, then no word below the node can be valid. Either way, the whole subtree
+    can be skipped.
+
+    The tree is modified in place. Since '#' is never a valid letter, the annotated tree can still be used with
+    `get_bee_solutions_radix_tree`.
+
+    :param radix_tree: tree generated by `preprocess_get_radix_tree`
+    :return: the same tree with annotations added
+    """
+    _annotate_radix_tree(0, radix_tree)
+    return radix_tree
+
+
+def _traverse_annotated_radix_tree(current_prefix: str, curr_dict: AnnotatedRadixTree, center: str,
+                                   valid_letters: set[str], center_bits: int, invalid_bits: int) -> list[str]:
+    """
+    Recursive function to traverse through the annotated radix tree. Same as `_traverse_radix_tree` except that
+    children are skipped if their annotations show that they can't contain any valid words.
+
+    :param current_prefix: Current prefix string
+    :param curr_dict: Current AnnotatedRadixTree representing all possible next characters for the current prefix
+    :param center: Central letter that must appear in a valid word
+    :param valid_letters: The list of valid letters from which we can form words
+    :param center_bits: bit representation of the center letter
+    :param invalid_bits: bit representation of every letter not in the puzzle
+    :return: list of valid words formed from the letters
+    """
+    valid_words = []
+
+    if '$' in curr_dict and center in current_prefix:
+        valid_words.append(current_prefix)
+
+    for letter in curr_dict:
+        if letter in valid_letters:
+            child_dict = curr_dict[letter]
+            union_bits, intersection_bits = child_dict['#']
+            if union_bits & center_bits and not intersection_bits & invalid_bits:
+                valid_words.extend(_traverse_annotated_radix_tree(current_prefix + letter, child_dict, center,
+                                                                  valid_letters, center_bits, invalid_bits))
+
+    return valid_words
+
+
+def get_bee_solutions_annotated_radix_tree(center: str, others: str, annotated_radix_tree: AnnotatedRadixTree) -> \
+        list[str]:
+    """
+    Same as `get_bee_solutions_radix_tree`, but uses the annotations from `preprocess_get_annotated_radix_tree` to
+    skip subtrees that can't contain any valid words.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :param annotated_radix_tree: word tree with annotations
+    :return: list of solutions
+    """
+    validate_character_args(center, others)
+
+    center_bits = get_letter_bits(center)
+    invalid_bits = ~(center_bits | get_letter_bits(others)) & ALL_LETTER_BITS
+    return _traverse_annotated_radix_tree('', annotated_radix_tree, center, set(center + others), center_bits,
+                                          invalid_bits)
+
+
+def preprocess_get_compact_trie(dictionary: list[str]) -> CompactTrie:
+    """
+    Converts the list of words into the same tree as `preprocess_get_radix_tree`, but stores it in flat arrays instead
+    of nested dictionaries. Every node is an index into three arrays:
+        first child:    index of the node's first child. All children of a node are stored next to each other in
+                        alphabetical order.
+        child bits:     bit representation (same format as the bitwise approach) of the letters the node has children
+                        for.
+        terminal:       1 if a word ends at the node, 0 otherwise.
+
+    The child for a letter is found by counting how many children come before it alphabetically, i.e. the number of set
+    bits in the child bits above the letter's bit. Node 0 is the root.
+
+    This takes a fraction of the memory of the nested dictionary, since each node is 9 bytes instead of a whole python
+    dictionary.
+
+    :param dictionary: list of words
+    :return: tuple of (first child array, child bits array, terminal flags)
+    """
+    words = sorted(set(dictionary))
+
+    first_child = array('I', [0])
+    child_bits = array('I', [0])
+    terminal = bytearray(1)
+
+    # Nodes are created in breadth first order, so that the children of a node are always next to each other. Each node
+    # in the queue is the range of (sorted) words that share the node's prefix.
+    queue = deque([(0, 0, len(words))])
+    node = 0
+    while queue:
+        depth, lo, hi = queue.popleft()
+
+        # a word that ends at this node sorts before every longer word with the same prefix
+        if lo < hi and len(words[lo]) == depth:
+            terminal[node] = 1
+            lo += 1
+
+        first_child[node] = len(terminal)
+        bits = 0
+        while lo < hi:
+            letter = words[lo][depth]
+            end = lo + 1
+            while end < hi and words[end][depth] == letter:
+                end += 1
+
+            bits |= get_letter_bits(letter)
+            first_child.append(0)
+            child_bits.append(0)
+            terminal.append(0)
+            queue.append((depth + 1, lo, end))
+            lo = end
+
+        child_bits[node] = bits
+        node += 1
+
+    return first_child, child_bits, terminal
+
+
+def _traverse_compact_trie(current_prefix: str, node: int, compact_trie: CompactTrie, center: str,
+                           valid_letter_shifts: list[tuple[str, int]]) -> list[str]:
+    """
+    Recursive function to traverse through the compact trie.
+
+    :param current_prefix: Current prefix string
+    :param node: index of the node for the current prefix
+    :param compact_trie: tree generated by `preprocess_get_compact_trie`
+    :param center: Central letter that must appear in a valid word
+    :param valid_letter_shifts: (letter, shift) for each valid letter in alphabetical order, where shift is the number
+    of bits to shift the child bits by to leave only the bits of letters before it
+    :return: list of valid words formed from the letters
+    """
+    first_child, child_bits, terminal = compact_trie
+    valid_words = []
+
+    if terminal[node] and center in current_prefix:
+        valid_words.append(current_prefix)
+
+    bits = child_bits[node]
+    for letter, shift in valid_letter_shifts:
+        # the letter's own bit is the lowest bit left after shifting by one less
+        if (bits >> (shift - 1)) & 1:
+            child = first_child[node] + (bits >> shift).bit_count()
+            valid_words.extend(
+                _traverse_compact_trie(current_prefix + letter, child, compact_trie, center, valid_letter_shifts))
+
+    return valid_words
+
+
+def get_bee_solutions_compact_trie(center: str, others: str, compact_trie: CompactTrie) -> list[str]:
+    """
+    Same as `get_bee_solutions_radix_tree`, but traverses the array based tree from `preprocess_get_compact_trie`.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :param compact_trie: tree generated by `preprocess_get_compact_trie`
+    :return: list of solutions
+    """
+    validate_character_args(center, others)
+
+    # letter at alphabet index i is bit (25 - i), so the letters before it are the bits from (26 - i) upwards
+    valid_letter_shifts = [(c, 26 - string.ascii_lowercase.index(c)) for c in sorted(center + others)]
+    return _traverse_compact_trie('', 0, compact_trie, center, valid_letter_shifts)
+
+
+def _get_common_prefix_length(word_a: str, word_b: str) -> int:
+    """
+    :return: length of the longest common prefix of the two words
+    """
+    length = 0
+    for char_a, char_b in zip(word_a, word_b):
+        if char_a != char_b:
+            break
+        length += 1
+    return length
+
+
+def _minimize_dawg_path(path: list[NestedStrDict], previous_word: str, common_prefix_length: int,
+                        register: dict[tuple, NestedStrDict]) -> None:
+    """
+    Replaces the nodes of the previous word that are past the common prefix with equivalent nodes already in the
+    register (or registers them if there are none). Goes from the deepest node upwards, so that by the time a node is
+    checked all of its children have already been replaced with their registered equivalents.
+
+    :param path: path[i] is the node for previous_word[:i]
+    :param previous_word: the last word that was added
+    :param common_prefix_length: length of the prefix shared by the previous word and the next word
+    :param register: dict of node signature to the single node with that signature
+    """
+    for i in range(len(previous_word), common_prefix_length, -1):
+        node = path[i]
+        # children are already registered, so two nodes are equivalent iff they have the same keys and child objects
+        signature = tuple((letter, id(child)) for letter, child in node.items())
+        if signature in register:
+            path[i - 1][previous_word[i - 1]] = register[signature]
+        else:
+            register[signature] = node
+    del path[common_prefix_length + 1:]
+
+
+def preprocess_get_dawg(dictionary: list[str]) -> NestedStrDict:
+    """
+    Converts the list of words into a DAWG (directed acyclic word graph), which is the minimal automaton that accepts
+    exactly the words in the dictionary. It's a radix tree where identical subtrees are merged, so common suffixes like
+    -ing, -ed or -tion are only stored once instead of once per word.
+
+    The DAWG uses the same NestedStrDict representation as `preprocess_get_radix_tree`, except that equivalent
+    subtrees are the same dictionary object. Words are added in sorted order, and each time a word is finished, the
+    part of it that can't be shared with the next word is merged with the existing nodes (Daciuk's incremental
+    algorithm for sorted input).
+
+    :param dictionary: list of words
+    :return: DAWG represented by a NestedStrDict with shared nodes
+    """
+    register = {}
+    root = {}
+    path = [root]
+    previous_word = ''
+    for word in sorted(set(dictionary)):
+        common_prefix_length = _get_common_prefix_length(previous_word, word)
+        _minimize_dawg_path(path, previous_word, common_prefix_length, register)
+
+        node = path[common_prefix_length]
+        for i in range(common_prefix_length, len(word)):
+            child = {}
+            node[word[i]] = child
+            path.append(child)
+            node = child
+        node['$'] = None  # '$' character to indicate end of word
+
+        previous_word = word
+    _minimize_dawg_path(path, previous_word, 0, register)
+
+    return root
+
+
+def get_bee_solutions_dawg(center: str, others: str, dawg: NestedStrDict) -> list[str]:
+    """
+    Uses a DAWG to find all valid words. Since the DAWG has the same representation as the radix tree, it is traversed
+    exactly the same way. Shared nodes don't matter because the prefix is built from the path taken to a node rather
+    than from the node itself.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :param dawg: DAWG generated by `preprocess_get_dawg`
+    :return: list of solutions
+    """
+    validate_character_args(center, others)
+
+    return _traverse_radix_tree('', dawg, center, set(center + others))
+
+
+def _iter_radix_tree(current_prefix: str, curr_dict: NestedStrDict, center: str, valid_letters: set[str]) -> \
+        Iterator[str]:
+    """
+    Generator version of `_traverse_radix_tree`. Yields words as soon as they are found instead of building up lists.
+
+    :param current_prefix: Current prefix string
+    :param curr_dict: Current NestedStrDict representing all possible next characters for the current prefix
+    :param center: Central letter that must appear in a valid word
+    :param valid_letters: The list of valid letters from which we can form words
+    :return: iterator of valid words formed from the letters
+    """
+    if '$' in curr_dict and center in current_prefix:
+        yield current_prefix
+
+    for letter in curr_dict:
+        if letter in valid_letters:
+            yield from _iter_radix_tree(current_prefix + letter, curr_dict[letter], center, valid_letters)
+
+
+def iter_bee_solutions_radix_tree(center: str, others: str, radix_tree: NestedStrDict) -> Iterator[str]:
+    """
+    Generator version of `get_bee_solutions_radix_tree`. Words are yielded as the tree is traversed, so the caller can
+    stop early (see `get_first_bee_pangram`, `get_first_n_bee_solutions`) without exploring the rest of the tree. Also
+    works for trees generated by `preprocess_get_annotated_radix_tree` and `preprocess_get_dawg`.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :param radix_tree: word tree
+    :return: iterator of solutions
+    """
+    # validate here rather than in the generator, so that invalid args raise straight away instead of on first next()
+    validate_character_args(center, others)
+
+    return _iter_radix_tree('', radix_tree, center, set(center + others))
+
+
+def iter_bee_solutions_bitwise_submask(center: str, others: str, bit_dictionary: dict[int, [str]]) -> Iterator[str]:
+    """
+    Generator version of `get_bee_solutions_bitwise_submask`.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :param bit_dictionary: Dictionary of words to look in, where the keys are the bit representations of the word and
+    the values are the string representation of the words
+    :return: iterator of solutions
+    """
+    validate_character_args(center, others)
+
+    return itertools.chain.from_iterable(
+        bit_dictionary[word_bits] for word_bits in get_valid_word_bits(center, others) if word_bits in bit_dictionary)
+
+
+def is_bee_pangram(solution: str) -> bool:
+    """
+    :param solution: a valid solution for a puzzle
+    :return: True if the solution uses all 7 letters of the puzzle
+    """
+    return len(set(solution)) == 7
+
+
+def get_first_bee_pangram(solutions: Iterable[str]) -> str | None:
+    """
+    Returns the first pangram from the solutions. If solutions is an iterator from one of the iter_bee_solutions_*
+    functions, the search stops as soon as a pangram is found.
+
+    :param solutions: solutions for a puzzle
+    :return: first pangram, or None if there aren't any
+    """
+    return next((s for s in solutions if is_bee_pangram(s)), None)
+
+
+def get_first_n_bee_solutions(solutions: Iterable[str], n: int) -> list[str]:
+    """
+    Returns the first n solutions. If solutions is an iterator from one of the iter_bee_solutions_* functions, the
+    search stops as soon as n solutions have been found.
+
+    :param solutions: solutions for a puzzle
+    :param n: number of solutions to return
+    :return: list of up to n solutions
+    """
+    return list(itertools.islice(solutions, n))
+
+
+def get_longest_bee_solutions(solutions: Iterable[str], k: int) -> list[str]:
+    """
+    Returns the k longest solutions, longest first. Unlike `get_first_n_bee_solutions`, this has to go through every
+    solution since the longest might be the last one found, but it only ever keeps k solutions in memory.
+
+    :param solutions: solutions for a puzzle
+    :param k: number of solutions to return
+    :return: list of up to k solutions
+    """
+    return heapq.nlargest(k, solutions, key=len)
+
+
+def _traverse_radix_tree_all_centers(current_prefix: str, prefix_bits: int, curr_dict: NestedStrDict,
+                                     letter_bits: dict[str, int], solutions: dict[str, list[str]]) -> None:
+    """
+    Recursive function to traverse through the radix tree once for a whole letter set, adding each word to the
+    solutions of every center letter it contains.
+
+    :param current_prefix: Current prefix string
+    :param prefix_bits: bit representation of the letters in the current prefix
+    :param curr_dict: Current NestedStrDict representing all possible next characters for the current prefix
+    :param letter_bits: dict of each of the 7 letters to its bit representation
+    :param solutions: dict of center letter to solutions, which is added to as words are found
+    """
+    if '$' in curr_dict:
+        for center, center_bits in letter_bits.items():
+            if prefix_bits & center_bits:
+                solutions[center].append(current_prefix)
+
+    for letter in curr_dict:
+        if letter in letter_bits:
+            _traverse_radix_tree_all_centers(current_prefix + letter, prefix_bits | letter_bits[letter],
+                                             curr_dict[letter], letter_bits, solutions)
+
+
+def get_bee_solutions_all_centers_radix_tree(letters: str, radix_tree: NestedStrDict) -> dict[str, list[str]]:
+    """
+    Finds the solutions for all 7 puzzles that can be made from a set of letters (one per center letter) with a single
+    traversal of the radix tree. Every puzzle has the same valid letters, so the traversal is the same for all of them
+    and only the center check differs. Each word found is added to the solutions of every center it contains.
+
+    :param letters: the 7 letters of the puzzle
+    :param radix_tree: word tree
+    :return: dict of center letter to list of solutions for that center
+    """
+    validate_character_args(letters[:1], letters[1:])
+
+    letter_bits = {c: get_letter_bits(c) for c in letters}
+    solutions = {c: [] for c in letters}
+    _traverse_radix_tree_all_centers('', 0, radix_tree, letter_bits, solutions)
+    return solutions
@@ -0,0 +1,129 @@
+"""
+NumPy versions of the bitwise solver. These live in their own module so that the main solvers (and the solver script)
+only need the standard library.
+"""
+from collections.abc import Iterator
+
+import numpy as np
+
+from data.binary_dictionary import BinaryDictionary
+from spelling_bee_solvers import validate_character_args, get_letter_bits
+
+# int representation of binary number with 26 1s
+NOT_MASK = np.uint32(67108863)
+
+
+def preprocess_get_numpy_word_masks(dictionary: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converts the list of words into an array of bit representations (in the same format as the keys generated by
+    `preprocess_get_bit_to_word_dict`) and a matching array of words, so that index i of both arrays refers to the same
+    word.
+
+    :param dictionary: list of words
+    :return: tuple of (uint32 array of word bits, object array of words)
+    """
+    word_masks = np.fromiter((get_letter_bits(word) for word in dictionary), dtype=np.uint32, count=len(dictionary))
+    words = np.array(dictionary, dtype=object)
+    return word_masks, words
+
+
+def preprocess_get_numpy_word_masks_from_binary(binary_dictionary: BinaryDictionary) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Same as `preprocess_get_numpy_word_masks`, but the word bits come straight from a binary dictionary. The array of
+    word bits is a view of the binary dictionary's buffer, so nothing is copied or calculated.
+
+    :param binary_dictionary: binary dictionary to read
+    :return: tuple of (uint32 array of word bits, object array of words)
+    """
+    word_masks = np.frombuffer(binary_dictionary.get_masks(), dtype=np.uint32)
+    words = np.array(binary_dictionary.get_words(), dtype=object)
+    return word_masks, words
+
+
+def get_puzzle_masks_numpy(puzzles: list[tuple[str, str]]) -> np.ndarray:
+    """
+    Converts a list of (center, others) puzzles into an array of bit representations for the batch solver.
+
+    :param puzzles: list of (center, others) tuples
+    :return: uint32 array of shape (number of puzzles, 2) where column 0 is the center bits and column 1 is the other
+    bits
+    """
+    puzzle_masks = np.empty((len(puzzles), 2), dtype=np.uint32)
+    for i, (center, others) in enumerate(puzzles):
+        validate_character_args(center, others)
+        puzzle_masks[i, 0] = get_letter_bits(center)
+        puzzle_masks[i, 1] = get_letter_bits(others)
+    return puzzle_masks
+
+
+def _get_invalid_bits_numpy(center_bits: np.ndarray, other_bits: np.ndarray, word_masks: np.ndarray) -> np.ndarray:
+    """
+    Evaluates the SoP equation from `get_bee_solutions_bitwise` for every word at once:
+        ~O & ((~W & C) | (W & ~C))
+    A word is valid wherever the result is 0. The arguments broadcast, so this works for one puzzle or many.
+    """
+    return ~other_bits & NOT_MASK & ((~word_masks & center_bits) | (word_masks & ~center_bits))
+
+
+def get_bee_solutions_numpy(center: str, others: str, word_masks: np.ndarray, words: np.ndarray) -> list[str]:
+    """
+    Vectorized version of `get_bee_solutions_bitwise`. Instead of looping over the bit dictionary in python, the SoP
+    equation is evaluated over the whole array of word bits in one go.
+
+    :param center: Central character that must appear in word. Length = 1
+    :param others: Other characters that must appear in word. Excludes center character and must be of length = 6
+    :param word_masks: uint32 array of word bits generated by `preprocess_get_numpy_word_masks`
+    :param words: object array of words generated by `preprocess_get_numpy_word_masks`
+    :return: list of solutions
+    """
+    validate_character_args(center, others)
+
+    center_bits = np.uint32(get_letter_bits(center))
+    other_bits = np.uint32(get_letter_bits(others))
+    is_valid = _get_invalid_bits_numpy(center_bits, other_bits, word_masks) == 0
+
+    return words[is_valid].tolist()
+
+
+def iter_bee_solution_matrix_numpy(puzzle_masks: np.ndarray, word_masks: np.ndarray, chunk_size: int = 32) -> \
+        Iterator[tuple[int, np.ndarray]]:
+    """
+    Solves many puzzles at once by broadcasting the puzzles against the words, which gives a puzzles x words boolean
+    matrix where True means the word is a solution for the puzzle.
+
+    The full matrix for thousands of puzzles against a big dictionary would not fit in memory, so it is generated in
+    chunks of at most `chunk_size` puzzles. Each chunk (and its intermediate arrays) takes roughly
+    chunk_size * len(word_masks) * 4 bytes.
+
+    :param puzzle_masks: uint32 array of shape (number of puzzles, 2) generated by `get_puzzle_masks_numpy`
+    :param word_masks: uint32 array of word bits generated by `preprocess_get_numpy_word_masks`
+    :param chunk_size: max number of puzzles per chunk
+    :return: iterator of (index of first puzzle in chunk, boolean matrix of shape (puzzles in chunk, number of words))
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be at least 1. Got {chunk_size}.")
+
+    for start in range(0, len(puzzle_masks), chunk_size):
+        chunk = puzzle_masks[start:start + chunk_size]
+        center_bits = chunk[:, 0:1]
+        other_bits = chunk[:, 1:2]
+        yield start, _get_invalid_bits_numpy(center_bits, other_bits, word_masks[np.newaxis, :]) == 0
+
+
+def get_bee_solutions_numpy_batch(puzzle_masks: np.ndarray, word_masks: np.ndarray, words: np.ndarray,
+                                  chunk_size: int = 32) -> list[list[str]]:
+    """
+    Batch version of `get_bee_solutions_numpy`. See `iter_bee_solution_matrix_numpy`.
+
+    :param puzzle_masks: uint32 array of shape (number of puzzles, 2) generated by `get_puzzle_masks_numpy`
+    :param word_masks: uint32 array of word bits generated by `preprocess_get_numpy_word_masks`
+    :param words: object array of words generated by `preprocess_get_numpy_word_masks`
+    :param chunk_size: max number of puzzles solved at once
+    :return: list of solutions for each puzzle, in the same order as puzzle_masks
+    """
+    all_solutions = []
+    for _, solution_matrix in iter_bee_solution_matrix_numpy(puzzle_masks, word_masks, chunk_size):
+        for is_valid in solution_matrix:
+            all_solutions.append(words[is_valid].tolist())
+
+    return all_solutions
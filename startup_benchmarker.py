@@ -0,0 +1,54 @@
+"""
+Measures the wall time of running solve_nyt_bee.py from the shell, from process start until all output has been written.
+Unlike benchmarker.py, this includes interpreter startup, imports and loading the (cached) indexes, which is what
+actually matters when the script is called from shell pipelines.
+"""
+import subprocess
+import sys
+import time
+
+from tabulate import tabulate
+
+from util.project_path import PROJECT_ROOT
+
+# NYT Spelling Bee Puzzle from 2019/06/08 which had the most official solutions
+benchmark_center = 'o'
+benchmark_others = 'ctpnme'
+# No word uses all of these letters, so it isn't in the answer table and the script falls back to the binary dictionary
+no_pangram_center = 'z'
+no_pangram_others = 'qxjvwk'
+
+repetitions = 50
+
+
+def time_command(command: list[str]) -> list[float]:
+    """
+    :param command: command to run from the project root
+    :return: wall time in seconds of each run
+    """
+    times = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+# make sure the indexes have been cached, so that the first run isn't counted as a cold cache
+subprocess.run([sys.executable, 'solve_nyt_bee.py', '-c', benchmark_center, '-o', benchmark_others], cwd=PROJECT_ROOT,
+               stdout=subprocess.DEVNULL, check=True)
+subprocess.run([sys.executable, 'solve_nyt_bee.py', '-c', no_pangram_center, '-o', no_pangram_others],
+               cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, check=True)
+
+interpreter_times = time_command([sys.executable, '-c', 'pass'])
+answer_table_times = time_command([sys.executable, 'solve_nyt_bee.py', '-c', benchmark_center, '-o', benchmark_others])
+binary_dictionary_times = time_command([sys.executable, 'solve_nyt_bee.py', '-c', no_pangram_center, '-o',
+                                        no_pangram_others])
+
+print(f"Repetitions:\t{repetitions}")
+print()
+print(tabulate([[name, min(times), sorted(times)[len(times) // 2], max(times)]
+                for name, times in [('Empty Interpreter', interpreter_times),
+                                    ('Answer Table', answer_table_times),
+                                    ('Binary Dictionary Fallback', binary_dictionary_times)]],
+               headers=['Command', 'Min Time (s)', 'Median Time (s)', 'Max Time (s)']))
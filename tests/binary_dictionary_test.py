@@ -0,0 +1,46 @@
+"""
+Tests the binary dictionary format against the text dictionary.
+"""
+
+import pytest
+
+from data.binary_dictionary import BinaryDictionary, preprocess_get_binary_dictionary, \
+    preprocess_get_bit_to_word_dict_from_binary, get_bee_solutions_binary_dictionary
+from data.dictionary_utils import get_custom_dictionary
+from data.index_utils import get_cached_binary_dictionary
+from spelling_bee_solvers import get_letter_bits, preprocess_get_bit_to_word_dict, get_bee_solutions_naive
+
+WORDS = get_custom_dictionary()
+
+
+@pytest.fixture(scope='module')
+def binary_dictionary():
+    return BinaryDictionary(preprocess_get_binary_dictionary(WORDS))
+
+
+def test_binary_dictionary_returnsSameWordsAndMasks(binary_dictionary):
+    assert len(binary_dictionary) == len(WORDS)
+    assert binary_dictionary.get_words() == WORDS
+    assert list(binary_dictionary) == WORDS
+    assert list(binary_dictionary.get_masks()) == [get_letter_bits(word) for word in WORDS]
+    assert list(binary_dictionary.get_lengths()) == [len(word) for word in WORDS]
+    assert bytes(binary_dictionary.get_word_bytes(0)) == WORDS[0].encode('utf-8')
+
+
+def test_preprocess_get_bit_to_word_dict_from_binary_returnsSameDictAsPreprocessGetBitToWordDict(binary_dictionary):
+    assert preprocess_get_bit_to_word_dict_from_binary(binary_dictionary) == preprocess_get_bit_to_word_dict(WORDS)
+
+
+@pytest.mark.parametrize('center, others', [('o', 'ctpnme'), ('c', 'aptmhu'), ('z', 'qxjvwk')])
+def test_get_bee_solutions_binary_dictionary_returnsSameSolutionsAsNaive(binary_dictionary, center, others):
+    assert get_bee_solutions_binary_dictionary(center, others, binary_dictionary) == \
+           get_bee_solutions_naive(center, others, WORDS)
+
+
+def test_get_cached_binary_dictionary_returnsSameWordsAsTextDictionary():
+    assert get_cached_binary_dictionary().get_words() == WORDS
+
+
+def test_binary_dictionary_invalidMagic_raisesError():
+    with pytest.raises(ValueError):
+        BinaryDictionary(b'NOPE' + preprocess_get_binary_dictionary(WORDS[:10])[4:])
@@ -0,0 +1,35 @@
+"""
+Fixtures shared by every test module that needs the scraped puzzles or the custom dictionary, so that they are only
+loaded once per session. A test that takes a `puzzle` argument is run once for every scraped puzzle, in date order.
+"""
+import pytest
+
+from data.dictionary_utils import get_custom_dictionary
+from data.puzzles_utils import NYTBeePuzzle, get_puzzles_from_file
+from spelling_bee_solvers import preprocess_get_bit_to_word_dict
+
+PUZZLES = [p[1] for p in sorted(get_puzzles_from_file().items())]
+
+
+def puzzle_id_generator(p: NYTBeePuzzle) -> str:
+    return f'{p.get_center()} | {p.get_others()}'
+
+
+@pytest.fixture(params=PUZZLES, ids=puzzle_id_generator)
+def puzzle(request) -> NYTBeePuzzle:
+    return request.param
+
+
+@pytest.fixture(scope='session')
+def puzzles() -> list[NYTBeePuzzle]:
+    return PUZZLES
+
+
+@pytest.fixture(scope='session')
+def words() -> list[str]:
+    return get_custom_dictionary()
+
+
+@pytest.fixture(scope='session')
+def bit_to_word_dict(words) -> dict[int, [str]]:
+    return preprocess_get_bit_to_word_dict(words)
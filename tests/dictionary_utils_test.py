@@ -0,0 +1,127 @@
+"""
+Tests the journal of dictionary edits on a temporary dictionary.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import data.dictionary_utils
+from data.dictionary_utils import get_dictionary_from_path, write_words_to_dictionary, append_to_dictionary_journal, \
+    get_journal_path, compact_dictionary, get_compacting_journal_path, get_dictionary_journal
+from data.index_utils import get_dictionary_hash
+from util.project_path import project_path
+
+
+@pytest.fixture()
+def dictionary_path():
+    with tempfile.TemporaryDirectory(dir=project_path('data')) as tmp_dir:
+        path = str(Path(tmp_dir).relative_to(project_path('')) / 'test_dictionary.txt')
+        write_words_to_dictionary(['abcd', 'bcde', 'cdef'], path)
+        yield path
+
+
+def test_get_dictionary_from_path_appliesJournal(dictionary_path):
+    append_to_dictionary_journal(['efgh', 'Defg', 'abc'], ['bcde'], dictionary_path)
+    append_to_dictionary_journal(['bcde'], ['cdef', 'efgh'], dictionary_path)
+
+    # words that are too small are filtered out, the same as when writing the dictionary
+    assert get_dictionary_from_path(dictionary_path) == ['abcd', 'bcde', 'defg']
+    with open(project_path(dictionary_path), 'r') as f:
+        assert f.read() == 'abcd\nbcde\ncdef\n'
+
+
+def test_get_dictionary_from_path_ignoresIncompleteLastRecord(dictionary_path):
+    append_to_dictionary_journal(['defg'], [], dictionary_path)
+    with open(project_path(get_journal_path(dictionary_path)), 'a') as f:
+        f.write('-abc')
+
+    assert get_dictionary_from_path(dictionary_path) == ['abcd', 'bcde', 'cdef', 'defg']
+
+
+@pytest.mark.parametrize('torn_journal, expected', [('-abc', ['abcd', 'cdef']),
+                                                     ('+defg\n-abc', ['abcd', 'cdef', 'defg'])])
+def test_append_to_dictionary_journal_afterIncompleteLastRecord_appliesNewEdits(dictionary_path, torn_journal,
+                                                                                 expected):
+    with open(project_path(get_journal_path(dictionary_path)), 'w') as f:
+        f.write(torn_journal)
+
+    append_to_dictionary_journal([], ['bcde'], dictionary_path)
+
+    assert get_dictionary_from_path(dictionary_path) == expected
+
+
+def test_compact_dictionary_mergesJournalAndRemovesIt(dictionary_path):
+    append_to_dictionary_journal(['defg'], ['abcd'], dictionary_path)
+    merged = get_dictionary_from_path(dictionary_path)
+
+    compact_dictionary(dictionary_path)
+
+    assert not project_path(get_journal_path(dictionary_path)).exists()
+    assert get_dictionary_from_path(dictionary_path) == merged
+    with open(project_path(dictionary_path), 'r') as f:
+        assert f.read() == 'bcde\ncdef\ndefg\n'
+
+
+def test_compact_dictionary_keepsEditsAppendedWhileCompacting(dictionary_path, monkeypatch):
+    append_to_dictionary_journal(['defg'], [], dictionary_path)
+    write_words = data.dictionary_utils._write_words
+
+    def append_then_write_words(word_list, path):
+        append_to_dictionary_journal(['efgh'], ['abcd'], dictionary_path)
+        write_words(word_list, path)
+
+    monkeypatch.setattr(data.dictionary_utils, '_write_words', append_then_write_words)
+    compact_dictionary(dictionary_path)
+
+    with open(project_path(dictionary_path), 'r') as f:
+        assert f.read() == 'abcd\nbcde\ncdef\ndefg\n'
+    assert not project_path(get_compacting_journal_path(dictionary_path)).exists()
+    assert get_dictionary_from_path(dictionary_path) == ['bcde', 'cdef', 'defg', 'efgh']
+
+
+def test_append_to_dictionary_journal_journalMovedForCompaction_appendsAgainToNewJournal(dictionary_path,
+                                                                                      monkeypatch):
+    append_to_dictionary_journal(['defg'], [], dictionary_path)
+    truncate_incomplete_record = data.dictionary_utils._truncate_incomplete_record
+
+    def move_journal_then_truncate(f):
+        # the first time, the journal is moved aside after it was opened, the same as a compaction starting
+        monkeypatch.setattr(data.dictionary_utils, '_truncate_incomplete_record', truncate_incomplete_record)
+        os.replace(project_path(get_journal_path(dictionary_path)),
+                   project_path(get_compacting_journal_path(dictionary_path)))
+        truncate_incomplete_record(f)
+
+    monkeypatch.setattr(data.dictionary_utils, '_truncate_incomplete_record', move_journal_then_truncate)
+    append_to_dictionary_journal(['efgh'], [], dictionary_path)
+
+    assert get_dictionary_journal(dictionary_path) == [('+', 'defg'), ('+', 'efgh'), ('+', 'efgh')]
+    assert get_dictionary_from_path(dictionary_path) == ['abcd', 'bcde', 'cdef', 'defg', 'efgh']
+
+
+def test_compact_dictionary_afterCrashWhileCompacting_mergesBothJournals(dictionary_path):
+    append_to_dictionary_journal(['defg'], ['abcd'], dictionary_path)
+    os.replace(project_path(get_journal_path(dictionary_path)),
+               project_path(get_compacting_journal_path(dictionary_path)))
+    append_to_dictionary_journal(['abcd'], ['cdef'], dictionary_path)
+    merged = get_dictionary_from_path(dictionary_path)
+
+    compact_dictionary(dictionary_path)
+    assert get_dictionary_from_path(dictionary_path) == merged
+    compact_dictionary(dictionary_path)
+
+    assert merged == ['abcd', 'bcde', 'defg']
+    assert get_dictionary_journal(dictionary_path) == []
+    with open(project_path(dictionary_path), 'r') as f:
+        assert f.read() == 'abcd\nbcde\ndefg\n'
+
+
+def test_get_dictionary_hash_changesWithJournal(dictionary_path):
+    original_hash = get_dictionary_hash(dictionary_path)
+    append_to_dictionary_journal(['defg'], [], dictionary_path)
+    journal_hash = get_dictionary_hash(dictionary_path)
+    compact_dictionary(dictionary_path)
+
+    assert journal_hash != original_hash
+    assert get_dictionary_hash(dictionary_path) not in (original_hash, journal_hash)
@@ -0,0 +1,231 @@
+"""
+Tests connection reuse and conditional requests against a local stand-in server.
+"""
+import http.client
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.error import HTTPError
+
+import pytest
+
+from scraper.http_client import HttpClient
+from util.project_path import project_path
+
+LAST_MODIFIED = 'Wed, 01 Jan 2020 00:00:00 GMT'
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.request_counts[self.path] += 1
+            server.client_ports.add(self.client_address[1])
+            server.conditional_headers.append((self.headers.get('If-None-Match'),
+                                               self.headers.get('If-Modified-Since')))
+            version = server.versions[self.path]
+
+        if self.path == '/missing':
+            self.__send(404, b'not found')
+        elif self.path == '/redirect':
+            self.__send(301, b'', {'Location': '/etag'})
+        elif self.path == '/not_modified':
+            self.__send(304, b'')
+        elif self.path == '/truncated':
+            # the rest of the body never arrives, so the client times out part way through reading it
+            self.send_response(200)
+            self.send_header('Content-Length', '100')
+            self.end_headers()
+            self.wfile.write(b'truncated')
+        elif self.path.startswith('/etag'):
+            etag = f'"v{version}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.__send(304, b'', {'ETag': etag})
+            else:
+                self.__send(200, f'etag page v{version}'.encode('utf-8'), {'ETag': etag})
+        elif self.path == '/last_modified':
+            if self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+                self.__send(304, b'')
+            else:
+                self.__send(200, b'last modified page', {'Last-Modified': LAST_MODIFIED})
+        else:
+            self.__send(200, f'page {self.path}'.encode('utf-8'))
+
+    def __send(self, status: int, body: bytes, headers: dict[str, str] | None = None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _ClosingIdleConnectionsHandler(_StandInHandler):
+    # closes connections that are idle for longer than this
+    timeout = 0.2
+
+
+def _start_server(handler_class: type[BaseHTTPRequestHandler]) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+    server.lock = threading.Lock()
+    server.request_counts = Counter()
+    server.client_ports = set()
+    server.conditional_headers = []
+    server.versions = Counter()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture()
+def server():
+    server = _start_server(_StandInHandler)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get_url(server: ThreadingHTTPServer, path: str) -> str:
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+def test_get_reusesConnection(server):
+    with HttpClient() as client:
+        pages = [client.get(_get_url(server, f'/page_{i}')) for i in range(10)]
+
+    assert pages == [f'page /page_{i}'.encode('utf-8') for i in range(10)]
+    assert len(server.client_ports) == 1
+
+
+def test_get_reconnectsWhenIdleConnectionIsClosed():
+    server = _start_server(_ClosingIdleConnectionsHandler)
+    try:
+        with HttpClient() as client:
+            assert client.get(_get_url(server, '/page_0')) == b'page /page_0'
+            time.sleep(0.5)
+            assert client.get(_get_url(server, '/page_1')) == b'page /page_1'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(server.client_ports) == 2
+
+
+@pytest.mark.parametrize('path, expected', [('/etag', b'etag page v0'), ('/last_modified', b'last modified page')])
+def test_get_sendsConditionalRequestAndReturnsCachedPageOn304(server, path, expected):
+    with HttpClient() as client:
+        assert client.get(_get_url(server, path)) == expected
+        assert client.get(_get_url(server, path)) == expected
+
+    assert server.conditional_headers[0] == (None, None)
+    assert server.conditional_headers[1] in [('"v0"', None), (None, LAST_MODIFIED)]
+    assert server.request_counts[path] == 2
+
+
+def test_get_returnsNewPageWhenChanged(server):
+    with HttpClient() as client:
+        assert client.get(_get_url(server, '/etag')) == b'etag page v0'
+        server.versions['/etag'] += 1
+        assert client.get(_get_url(server, '/etag')) == b'etag page v1'
+        assert client.get(_get_url(server, '/etag')) == b'etag page v1'
+
+    assert [h[0] for h in server.conditional_headers] == [None, '"v0"', '"v1"']
+
+
+def test_get_keepsCacheOnDiskAcrossClients(server):
+    with tempfile.TemporaryDirectory(dir=project_path('data')) as tmp_dir:
+        cache_dir = Path(tmp_dir).relative_to(project_path(''))
+        with HttpClient(cache_dir=cache_dir) as client:
+            assert client.get(_get_url(server, '/etag')) == b'etag page v0'
+        with HttpClient(cache_dir=cache_dir) as client:
+            assert client.get(_get_url(server, '/etag')) == b'etag page v0'
+
+    assert [h[0] for h in server.conditional_headers] == [None, '"v0"']
+
+
+def test_get_refetchesPageWhenCachedBodyIsMissing(server):
+    with tempfile.TemporaryDirectory(dir=project_path('data')) as tmp_dir:
+        cache_dir = Path(tmp_dir).relative_to(project_path(''))
+        with HttpClient(cache_dir=cache_dir) as client:
+            assert client.get(_get_url(server, '/etag')) == b'etag page v0'
+        for body_path in Path(tmp_dir).glob('*.body'):
+            body_path.unlink()
+        with HttpClient(cache_dir=cache_dir) as client:
+            assert client.get(_get_url(server, '/etag')) == b'etag page v0'
+            assert client.get(_get_url(server, '/etag')) == b'etag page v0'
+
+    assert [h[0] for h in server.conditional_headers] == [None, '"v0"', None, '"v0"']
+
+
+def test_get_raisesHttpErrorOnNotModifiedWithoutCachedPage(server):
+    with HttpClient() as client:
+        for _ in range(2):
+            with pytest.raises(HTTPError) as e:
+                client.get(_get_url(server, '/not_modified'))
+            assert e.value.code == 304
+
+    assert server.conditional_headers == [(None, None), (None, None)]
+
+
+def test_get_closesConnectionWhenReadingResponseFails(server, monkeypatch):
+    closed_connections = []
+    close = http.client.HTTPConnection.close
+
+    def close_and_record(connection):
+        closed_connections.append(connection)
+        close(connection)
+
+    monkeypatch.setattr(http.client.HTTPConnection, 'close', close_and_record)
+    with HttpClient(timeout=0.2) as client:
+        with pytest.raises(TimeoutError):
+            client.get(_get_url(server, '/truncated'))
+        assert len(closed_connections) == 1
+        assert client.get(_get_url(server, '/page_0')) == b'page /page_0'
+
+    assert len(server.client_ports) == 2
+
+
+@pytest.mark.parametrize('max_cache_entries, max_cache_bytes', [(2, None), (8192, 30)])
+def test_get_evictsLeastRecentlyUsedPages(server, max_cache_entries, max_cache_bytes):
+    # every page is 12 bytes, so either limit fits 2 pages
+    with HttpClient(max_cache_entries=max_cache_entries, max_cache_bytes=max_cache_bytes) as client:
+        for path in ['/etag_0', '/etag_1', '/etag_0', '/etag_2', '/etag_1', '/etag_2']:
+            assert client.get(_get_url(server, path)) == b'etag page v0'
+
+    assert [h[0] for h in server.conditional_headers] == [None, None, '"v0"', None, None, '"v0"']
+
+
+def test_get_evictsLeastRecentlyUsedPagesOnDiskAcrossClients(server):
+    with tempfile.TemporaryDirectory(dir=project_path('data')) as tmp_dir:
+        cache_dir = Path(tmp_dir).relative_to(project_path(''))
+        with HttpClient(cache_dir=cache_dir, max_cache_entries=2) as client:
+            for path in ['/etag_0', '/etag_1', '/etag_2']:
+                client.get(_get_url(server, path))
+        assert len(list(Path(tmp_dir).glob('*.json'))) == len(list(Path(tmp_dir).glob('*.body'))) == 2
+
+        with HttpClient(cache_dir=cache_dir, max_cache_entries=2) as client:
+            for path in ['/etag_0', '/etag_2']:
+                assert client.get(_get_url(server, path)) == b'etag page v0'
+        assert len(list(Path(tmp_dir).glob('*.json'))) == len(list(Path(tmp_dir).glob('*.body'))) == 2
+
+    assert [h[0] for h in server.conditional_headers] == [None, None, None, None, '"v0"']
+
+
+def test_get_followsRedirectsAndRaisesHttpErrorOnErrorStatus(server):
+    with HttpClient() as client:
+        assert client.get(_get_url(server, '/redirect')) == b'etag page v0'
+        with pytest.raises(HTTPError) as e:
+            client.get(_get_url(server, '/missing'))
+        assert e.value.code == 404
+        # the connection is still usable after an error response
+        assert client.get(_get_url(server, '/page_0')) == b'page /page_0'
+
+    assert len(server.client_ports) == 1
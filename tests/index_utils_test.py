@@ -0,0 +1,97 @@
+"""
+Tests the on disk cache of preprocessed indexes.
+"""
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import data.index_utils
+from data.dictionary_utils import get_custom_dictionary, write_words_to_dictionary
+from data.index_utils import INDEX_BUILDERS, MEMORY_MAPPED_INDEXES, get_cached_index, get_index_cache_path
+from util.project_path import project_path
+
+
+@pytest.fixture(scope='module', autouse=True)
+def index_cache_directory():
+    # keeps the real cache in data/cache untouched
+    with tempfile.TemporaryDirectory(dir=project_path('data')) as tmp_dir, pytest.MonkeyPatch.context() as mp:
+        cache_directory = Path(tmp_dir).relative_to(project_path(''))
+        mp.setattr(data.index_utils, 'INDEX_CACHE_DIRECTORY', str(cache_directory))
+        yield cache_directory
+
+
+def _get_cached_index_contents(structure):
+    index = get_cached_index(structure)
+    # memory mapped indexes are compared by their bytes
+    return index[:] if structure in MEMORY_MAPPED_INDEXES else index
+
+
+@pytest.mark.parametrize("structure", ['bit_to_word_dict', 'radix_tree', 'compact_trie', 'answer_table',
+                                       'binary_dictionary'])
+def test_get_cached_index_returnsSameStructureAsPreprocessing(structure):
+    expected = INDEX_BUILDERS[structure](get_custom_dictionary())
+
+    # first call may generate the index, second call must load it from the cache
+    assert _get_cached_index_contents(structure) == expected
+    assert project_path(get_index_cache_path(structure)).exists()
+    assert _get_cached_index_contents(structure) == expected
+
+
+def test_get_cached_index_rebuildsWhenDictionaryChanges(index_cache_directory):
+    with tempfile.TemporaryDirectory(dir=project_path(index_cache_directory)) as tmp_dir:
+        dictionary_path = Path(tmp_dir).relative_to(project_path('')) / 'test_dictionary.txt'
+
+        write_words_to_dictionary(['abcd', 'bcde'], str(dictionary_path))
+        old_cache_path = get_index_cache_path('bit_to_word_dict', dictionary_path)
+        assert sum(len(words) for words in get_cached_index('bit_to_word_dict', dictionary_path).values()) == 2
+
+        write_words_to_dictionary(['abcd', 'bcde', 'cdef'], str(dictionary_path))
+        new_cache_path = get_index_cache_path('bit_to_word_dict', dictionary_path)
+        assert new_cache_path != old_cache_path
+        assert sum(len(words) for words in get_cached_index('bit_to_word_dict', dictionary_path).values()) == 3
+        assert not project_path(old_cache_path).exists()
+
+        project_path(new_cache_path).unlink()
+
+
+def test_get_cached_index_keepsIndexesOfSameNamedDictionariesInDifferentDirectories(index_cache_directory):
+    with tempfile.TemporaryDirectory(dir=project_path(index_cache_directory)) as tmp_dir:
+        first_path = Path(tmp_dir).relative_to(project_path('')) / 'first' / 'test_dictionary.txt'
+        second_path = Path(tmp_dir).relative_to(project_path('')) / 'second' / 'test_dictionary.txt'
+        for path, words in [(first_path, ['abcd']), (second_path, ['abcd', 'bcde'])]:
+            project_path(path.parent).mkdir()
+            write_words_to_dictionary(words, str(path))
+
+        assert get_index_cache_path('bit_to_word_dict', first_path) != \
+               get_index_cache_path('bit_to_word_dict', second_path)
+        get_cached_index('bit_to_word_dict', first_path)
+        get_cached_index('bit_to_word_dict', second_path)
+
+        assert project_path(get_index_cache_path('bit_to_word_dict', first_path)).exists()
+        assert project_path(get_index_cache_path('bit_to_word_dict', second_path)).exists()
+
+
+@pytest.mark.parametrize("structure, contents", [('radix_tree', b''), ('radix_tree', b'\x80\x05not a pickle'),
+                                                 ('answer_table', b''), ('answer_table', b'NYTA\x01'),
+                                                 ('binary_dictionary', b'NOPE' + bytes(8))])
+def test_get_cached_index_corruptCache_rebuildsIndex(index_cache_directory, structure, contents):
+    with tempfile.TemporaryDirectory(dir=project_path(index_cache_directory)) as tmp_dir:
+        dictionary_path = Path(tmp_dir).relative_to(project_path('')) / 'test_dictionary.txt'
+        write_words_to_dictionary(['abcdefg', 'bcdefga'], str(dictionary_path))
+        cache_path = project_path(get_index_cache_path(structure, dictionary_path))
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(contents)
+
+        index = get_cached_index(structure, dictionary_path)
+
+        expected = INDEX_BUILDERS[structure](['abcdefg', 'bcdefga'])
+        assert (index[:] if structure in MEMORY_MAPPED_INDEXES else index) == expected
+        assert cache_path.read_bytes() != contents
+        if structure in MEMORY_MAPPED_INDEXES:
+            index.close()
+
+
+def test_get_index_cache_path_invalidStructure_raisesError():
+    with pytest.raises(ValueError):
+        get_index_cache_path('not_a_structure')
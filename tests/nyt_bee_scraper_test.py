@@ -0,0 +1,143 @@
+"""
+Tests fetching pages concurrently against a local stand-in for nytbee.com.
+"""
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.error import HTTPError
+
+import pytest
+
+from scraper.http_client import HttpClient
+from scraper.nyt_bee_scraper import TokenBucket, get_raw_pages
+from util.project_path import project_path
+
+MISSING_PATH = '/Bee_missing.html'
+FLAKY_PATH = '/Bee_flaky.html'
+RESPONSE_DELAY = 0.2
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.request_counts[self.path] += 1
+            request_count = server.request_counts[self.path]
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+
+        time.sleep(RESPONSE_DELAY)
+        with server.lock:
+            server.in_flight -= 1
+
+        if self.path == MISSING_PATH:
+            self.send_error(404)
+        elif self.path == FLAKY_PATH and request_count == 1:
+            self.send_error(503)
+        else:
+            body = f'page {self.path}'.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+    server.lock = threading.Lock()
+    server.request_counts = Counter()
+    server.in_flight = 0
+    server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def client():
+    # keeps the pages of the stand-in server out of the default client's cache in data/cache
+    with tempfile.TemporaryDirectory(dir=project_path('data')) as tmp_dir:
+        with HttpClient(cache_dir=Path(tmp_dir).relative_to(project_path(''))) as client:
+            yield client
+
+
+def _get_url(server: ThreadingHTTPServer, path: str) -> str:
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+def test_get_raw_pages_returnsPagesInOrderConcurrently(server, client):
+    paths = [f'/Bee_{i}.html' for i in range(8)]
+
+    start = time.monotonic()
+    pages = [future.result() for future in get_raw_pages([_get_url(server, p) for p in paths], max_workers=4,
+                                                         requests_per_second=1000, client=client)]
+    elapsed = time.monotonic() - start
+
+    assert pages == [f'page {p}'.encode('utf-8') for p in paths]
+    assert 1 < server.max_in_flight <= 4
+    assert elapsed < len(paths) * RESPONSE_DELAY
+
+
+def test_get_raw_pages_givesUpOnMissingPagesAndRetriesOtherErrors(server, client):
+    paths = ['/Bee_0.html', MISSING_PATH, FLAKY_PATH]
+
+    futures = list(get_raw_pages([_get_url(server, p) for p in paths], requests_per_second=1000, client=client))
+
+    assert futures[0].result() == b'page /Bee_0.html'
+    with pytest.raises(HTTPError) as e:
+        futures[1].result()
+    assert e.value.code == 404
+    assert futures[2].result() == f'page {FLAKY_PATH}'.encode('utf-8')
+    assert server.request_counts[MISSING_PATH] == 1
+    assert server.request_counts[FLAKY_PATH] == 2
+
+
+def test_get_raw_pages_fetchesAtMostWindowAhead(server, client):
+    paths = [f'/Bee_{i}.html' for i in range(20)]
+
+    raw_pages = get_raw_pages([_get_url(server, p) for p in paths], max_workers=2, requests_per_second=1000,
+                              window=3, client=client)
+    assert next(raw_pages).result() == b'page /Bee_0.html'
+    time.sleep(3 * RESPONSE_DELAY)
+    raw_pages.close()
+
+    assert sum(server.request_counts.values()) <= 4
+
+
+def test_get_raw_pages_closeDoesNotWaitForPagesBeingFetched(server, client):
+    paths = [f'/Bee_{i}.html' for i in range(20)]
+
+    raw_pages = get_raw_pages([_get_url(server, p) for p in paths], max_workers=2, requests_per_second=1000,
+                              client=client)
+    assert next(raw_pages).result() == b'page /Bee_0.html'
+    start = time.monotonic()
+    raw_pages.close()
+    elapsed = time.monotonic() - start
+    time.sleep(3 * RESPONSE_DELAY)
+
+    assert elapsed < RESPONSE_DELAY / 2
+    # pages 0 and 1 were fetched, and only the pages the 2 workers were already on when it was closed are fetched after
+    assert sum(server.request_counts.values()) <= 4
+
+
+def test_TokenBucket_limitsRate():
+    rate_limiter = TokenBucket(rate=20, capacity=2)
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=rate_limiter.acquire) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # the first 2 tokens are available straight away, the other 10 are added at 20 per second
+    assert time.monotonic() - start >= 10 / 20 - 0.01
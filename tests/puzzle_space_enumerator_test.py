@@ -0,0 +1,37 @@
+"""
+Tests the puzzle space statistics against the solutions and scores for every puzzle we have in our database.
+"""
+
+import pytest
+
+from puzzle_space_enumerator import get_letter_set_statistics, get_puzzle_space_statistics
+from spelling_bee_scoring import preprocess_get_bit_to_score_dict, get_bee_score
+from spelling_bee_solvers import get_bee_solutions_bitwise_submask, get_letter_bits, is_bee_pangram
+
+
+@pytest.fixture(scope='module')
+def bit_to_score_dict(bit_to_word_dict):
+    return preprocess_get_bit_to_score_dict(bit_to_word_dict)
+
+
+def test_get_letter_set_statistics_matchesSolutions(bit_to_word_dict, bit_to_score_dict, puzzle):
+    letter_bits = get_letter_bits(puzzle.get_center() + puzzle.get_others())
+    statistics = get_letter_set_statistics(letter_bits, bit_to_score_dict)
+
+    _, _, solution_count, score, pangram_count = next(s for s in statistics if s[1] == puzzle.get_center())
+    sols = get_bee_solutions_bitwise_submask(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict)
+    assert solution_count == len(sols)
+    assert score == get_bee_score(sols)
+    assert pangram_count == len([s for s in sols if is_bee_pangram(s)])
+
+
+def test_get_puzzle_space_statistics_returnsSortedStatisticsForEveryPangramLetterSet():
+    words = ['abcdefg', 'gfedcba', 'bead', 'faced', 'hijklmn', 'hijk', 'abcd']
+
+    statistics = get_puzzle_space_statistics(words, max_workers=2, chunk_size=1)
+
+    expected_puzzles = [('abcdefg', c) for c in 'abcdefg'] + [('hijklmn', c) for c in 'hijklmn']
+    assert [(s[0], s[1]) for s in statistics] == expected_puzzles
+    assert statistics[0] == ('abcdefg', 'a', 5, 1 + 5 + 1 + 14 + 14, 2)
+    assert statistics[6] == ('abcdefg', 'g', 2, 28, 2)
+    assert statistics[7] == ('hijklmn', 'h', 2, 1 + 14, 1)
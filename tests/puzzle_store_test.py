@@ -0,0 +1,133 @@
+"""
+Tests the puzzle store on a temporary database against the scraped puzzles JSON file.
+"""
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+import data.puzzle_store
+from data.puzzle_store import PuzzleStore, get_puzzle_store, PUZZLE_STORE_PATH, UnexportedPuzzlesError
+from data.puzzles_utils import NYTBeePuzzle, PUZZLES_PATH, write_puzzles_to_file
+from util.project_path import project_path
+
+
+@pytest.fixture()
+def tmp_dir():
+    with tempfile.TemporaryDirectory(dir=project_path('data')) as tmp_dir:
+        yield Path(tmp_dir).relative_to(project_path(''))
+
+
+@pytest.fixture()
+def puzzle_store(tmp_dir):
+    with PuzzleStore(tmp_dir / 'puzzles.sqlite3') as puzzle_store:
+        puzzle_store.import_from_json()
+        yield puzzle_store
+
+
+def test_import_from_json_returnsSamePuzzles(puzzle_store, puzzles):
+    assert len(puzzle_store) == len(puzzles)
+    assert list(puzzle_store.iter_puzzles()) == puzzles
+    assert puzzle_store.get_puzzle_dates() == {p.get_puzzle_date() for p in puzzles}
+    for puzzle in puzzles[:50]:
+        assert puzzle.get_puzzle_date() in puzzle_store
+        assert puzzle_store.get_puzzle(puzzle.get_puzzle_date()) == puzzle
+
+    assert date(year=1900, month=1, day=1) not in puzzle_store
+    assert puzzle_store.get_puzzle(date(year=1900, month=1, day=1)) is None
+
+
+def test_iter_puzzles_returnsPuzzlesInRange(puzzle_store, puzzles):
+    dates = [p.get_puzzle_date() for p in puzzles]
+    start, end = dates[10], dates[20]
+
+    assert [p.get_puzzle_date() for p in puzzle_store.iter_puzzles(start, end)] == dates[10:21]
+    assert [p.get_puzzle_date() for p in puzzle_store.iter_puzzles(end=start)] == dates[:11]
+    assert [p.get_puzzle_date() for p in puzzle_store.iter_puzzles(start=end)] == dates[20:]
+
+
+def test_get_puzzles_by_center_and_letters_returnsMatchingPuzzles(puzzle_store, puzzles):
+    puzzle = puzzles[0]
+    letters = set(puzzle.get_center() + puzzle.get_others())
+
+    assert puzzle_store.get_puzzles_by_center(puzzle.get_center()) == \
+           [p for p in puzzles if p.get_center() == puzzle.get_center()]
+    assert puzzle_store.get_puzzles_by_letters(letters) == \
+           [p for p in puzzles if set(p.get_center() + p.get_others()) == letters]
+
+
+def test_upsert_puzzle_replacesPuzzleWithSameDate(puzzle_store, puzzles):
+    puzzle_date = puzzles[0].get_puzzle_date()
+    new_puzzle = NYTBeePuzzle(puzzle_date, 'a', 'bcdefg', ['abcd', 'bade'])
+    added_puzzle = NYTBeePuzzle(date(year=1900, month=1, day=1), 'a', 'bcdefg', [])
+
+    puzzle_store.upsert_puzzle(new_puzzle)
+    puzzle_store.upsert_puzzle(added_puzzle)
+
+    assert len(puzzle_store) == len(puzzles) + 1
+    assert puzzle_store.get_puzzle(puzzle_date) == new_puzzle
+    assert puzzle_store.get_puzzle(added_puzzle.get_puzzle_date()) == added_puzzle
+
+
+def test_export_to_json_writesSameFileAsWritePuzzlesToFile(puzzle_store, puzzles, tmp_dir):
+    puzzle_store.export_to_json(tmp_dir / 'exported.json')
+    write_puzzles_to_file(puzzles, tmp_dir / 'written.json')
+
+    with open(project_path(tmp_dir / 'exported.json'), 'r') as exported, \
+            open(project_path(tmp_dir / 'written.json'), 'r') as written:
+        assert exported.read() == written.read()
+
+
+def test_get_puzzle_store_importsJsonOnlyWhenChanged(puzzles, tmp_dir):
+    json_path = tmp_dir / 'puzzles.json'
+    write_puzzles_to_file(puzzles[:10], json_path)
+
+    with get_puzzle_store(tmp_dir / 'puzzles.sqlite3', json_path) as puzzle_store:
+        assert len(puzzle_store) == 10
+        assert not puzzle_store.has_unexported_upserts()
+        # puzzles only in the store are kept until the JSON file changes
+        puzzle_store.upsert_puzzle(puzzles[10])
+
+    with get_puzzle_store(tmp_dir / 'puzzles.sqlite3', json_path) as puzzle_store:
+        assert len(puzzle_store) == 11
+        assert puzzle_store.has_unexported_upserts()
+
+    write_puzzles_to_file(puzzles[:20], json_path)
+    # the upsert was never exported, so it isn't dropped without asking
+    with pytest.raises(UnexportedPuzzlesError):
+        get_puzzle_store(tmp_dir / 'puzzles.sqlite3', json_path)
+    with PuzzleStore(tmp_dir / 'puzzles.sqlite3') as puzzle_store:
+        puzzle_store.import_from_json(json_path)
+        assert not puzzle_store.has_unexported_upserts()
+    with get_puzzle_store(tmp_dir / 'puzzles.sqlite3', json_path) as puzzle_store:
+        assert list(puzzle_store.iter_puzzles()) == puzzles[:20]
+
+    # puzzles dropped from the JSON file are dropped from the store too
+    write_puzzles_to_file(puzzles[5:15], json_path)
+    with get_puzzle_store(tmp_dir / 'puzzles.sqlite3', json_path) as puzzle_store:
+        assert list(puzzle_store.iter_puzzles()) == puzzles[5:15]
+
+
+def test_export_to_json_clearsUnexportedUpsertsAndSyncSkipsUnchangedFile(puzzle_store, puzzles, tmp_dir,
+                                                                         monkeypatch):
+    json_path = tmp_dir / 'exported.json'
+    puzzle_store.upsert_puzzle(NYTBeePuzzle(date(year=1900, month=1, day=1), 'a', 'bcdefg', []))
+    assert puzzle_store.has_unexported_upserts()
+
+    puzzle_store.export_to_json(json_path)
+
+    assert not puzzle_store.has_unexported_upserts()
+    assert [p.name for p in project_path(tmp_dir).iterdir() if p.suffix == '.tmp'] == []
+    # the file hasn't changed since it was exported, so it isn't even hashed
+    monkeypatch.setattr(data.puzzle_store, '_get_file_hash', lambda path: pytest.fail("File was hashed."))
+    puzzle_store.sync_from_json(json_path)
+    assert len(puzzle_store) == len(puzzles) + 1
+
+
+def test_get_puzzle_store_defaultsToScrapedPuzzles(puzzles, tmp_dir):
+    assert PUZZLES_PATH == 'data/puzzles/scraped_puzzles.json'
+    assert PUZZLE_STORE_PATH == 'data/puzzles/scraped_puzzles.sqlite3'
+    # the store is a temporary one, so running the tests never touches the real store
+    with get_puzzle_store(tmp_dir / 'puzzles.sqlite3') as puzzle_store:
+        assert len(puzzle_store) == len(puzzles)
@@ -0,0 +1,73 @@
+"""
+Tests the compact puzzle representation against the scraped puzzles.
+"""
+import pickle
+from datetime import date
+
+import pytest
+
+from data.puzzles_utils import NYTBeePuzzle
+from data.vocabulary import SHARED_VOCABULARY
+
+def test_NYTBeePuzzle_isImmutable():
+    puzzle = NYTBeePuzzle(date(year=2020, month=1, day=1), 'a', 'gfedcb', ['abcd', 'bade'])
+
+    with pytest.raises(AttributeError):
+        puzzle.center = 'b'
+    with pytest.raises(AttributeError):
+        del puzzle._NYTBeePuzzle__center
+    with pytest.raises(TypeError):
+        puzzle.get_solution_ids()[0] = 1
+    assert not hasattr(puzzle, '__dict__')
+    assert puzzle.get_others() == 'bcdefg'
+
+
+def test_NYTBeePuzzle_storesSortedUniqueSolutionIds():
+    puzzle = NYTBeePuzzle(date(year=2020, month=1, day=1), 'a', 'bcdefg', ['bade', 'abcd', 'bade'])
+    solution_ids = list(puzzle.get_solution_ids())
+
+    assert solution_ids == sorted(SHARED_VOCABULARY.get_word_ids(['abcd', 'bade']))
+    assert puzzle.get_solution_count() == 2
+    assert puzzle.get_solutions() == {'abcd', 'bade'}
+    assert puzzle.get_solutions() == NYTBeePuzzle(puzzle.get_puzzle_date(), 'a', 'bcdefg', {'abcd', 'bade'}) \
+        .get_solutions()
+
+
+def test_NYTBeePuzzle_equalityAndHashDependOnAllFields():
+    puzzle = NYTBeePuzzle(date(year=2020, month=1, day=1), 'a', 'bcdefg', ['abcd', 'bade'])
+    same_puzzle = NYTBeePuzzle(date(year=2020, month=1, day=1), 'a', 'gfedcb', ['bade', 'abcd'])
+
+    assert puzzle == same_puzzle
+    assert hash(puzzle) == hash(same_puzzle)
+    assert len({puzzle, same_puzzle}) == 1
+    assert puzzle != NYTBeePuzzle(date(year=2020, month=1, day=2), 'a', 'bcdefg', ['abcd', 'bade'])
+    assert puzzle != NYTBeePuzzle(date(year=2020, month=1, day=1), 'b', 'acdefg', ['abcd', 'bade'])
+    assert puzzle != NYTBeePuzzle(date(year=2020, month=1, day=1), 'a', 'bcdefg', ['abcd'])
+
+
+def test_NYTBeePuzzle_pickleRoundTripReturnsEqualPuzzle(puzzles):
+    for puzzle in puzzles[:100]:
+        unpickled = pickle.loads(pickle.dumps(puzzle))
+
+        assert unpickled == puzzle
+        assert hash(unpickled) == hash(puzzle)
+
+
+def test_NYTBeePuzzle_setOperationsReturnSameAsStringSets(puzzles):
+    for puzzle, other in zip(puzzles, puzzles[1:]):
+        solutions, other_solutions = set(puzzle.get_solutions()), set(other.get_solutions())
+
+        assert puzzle.get_common_solutions(other) == solutions & other_solutions
+        assert puzzle.get_all_solutions(other) == solutions | other_solutions
+        assert puzzle.get_solutions_not_in(other) == solutions - other_solutions
+        assert other.get_solutions_not_in(puzzle) == other_solutions - solutions
+    assert puzzles[0].get_solutions_not_in(puzzles[0]) == frozenset()
+
+
+def test_NYTBeePuzzle_getSolutions_isBuiltOnceAndDoesNotChangeEquality(puzzles):
+    puzzle = puzzles[0]
+    copy = NYTBeePuzzle(puzzle.get_puzzle_date(), puzzle.get_center(), puzzle.get_others(), puzzle.get_solutions())
+
+    assert puzzle.get_solutions() is puzzle.get_solutions()
+    assert copy == puzzle
+    assert hash(copy) == hash(puzzle)
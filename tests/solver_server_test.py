@@ -0,0 +1,278 @@
+"""
+Tests the solver server against the radix tree solver, over a real local socket.
+"""
+import asyncio
+import json
+import socket
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from solver_server import SolverServer
+from spelling_bee_cache import BeeSolutionCache
+from spelling_bee_scoring import get_bee_score
+from spelling_bee_solvers import preprocess_get_radix_tree_from_sorted, get_bee_solutions_radix_tree
+
+@pytest.fixture(scope='module')
+def radix_tree(words):
+    return preprocess_get_radix_tree_from_sorted(words)
+
+
+async def _get(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, target: str) -> tuple[int, dict]:
+    writer.write(f'GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode('latin-1'))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) != b'\r\n':
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return status, json.loads(await reader.readexactly(int(headers['content-length'])))
+
+
+async def _get_concurrently(connect, targets: list[str]) -> list[tuple[int, dict]]:
+    async def get_one(target):
+        reader, writer = await connect()
+        try:
+            return await _get(reader, writer, target)
+        finally:
+            writer.close()
+
+    return await asyncio.gather(*(get_one(target) for target in targets))
+
+
+def test_solver_server_concurrentRequests_returnsSameAnswersAsRadixTreeSolverInBatches(puzzles, radix_tree):
+    puzzles = puzzles[:40]
+    # duplicate puzzles and different centers for the same letters should end up in the same batch
+    puzzles = puzzles + puzzles[:5]
+    targets = [f'/solve?center={p.get_center()}&others={p.get_others()}' for p in puzzles]
+    targets += [f'/solve?center={others[0]}&others={center + others[1:]}'
+                for center, others in ((p.get_center(), p.get_others()) for p in puzzles[:5])]
+
+    async def run():
+        solver_server = SolverServer(radix_tree, batch_window=0.05)
+        server = await solver_server.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await _get_concurrently(lambda: asyncio.open_connection('127.0.0.1', port), targets), solver_server
+        finally:
+            await solver_server.stop()
+
+    responses, solver_server = asyncio.run(run())
+
+    assert solver_server.batch_count < len(targets)
+    for target, (status, body) in zip(targets, responses):
+        assert status == 200
+        expected = get_bee_solutions_radix_tree(body['center'], body['others'], radix_tree)
+        assert body['solutions'] == sorted(expected)
+        assert body['max_score'] == get_bee_score(expected)
+        assert all(len(set(pangram)) == 7 for pangram in body['pangrams'])
+
+
+@pytest.mark.parametrize("target, expected_status",
+                         [('/solve?center=o&others=ctpnm', 400),
+                          ('/solve?center=o&others=ctpnmo', 400),
+                          ('/solve?center=O&others=ctpnme', 400),
+                          ('/solve?center=%C3%B6&others=ctpnme', 400),
+                          ('/solve', 400),
+                          ('/unknown?center=o&others=ctpnme', 404)])
+def test_solver_server_invalidRequests_returnsError(radix_tree, target, expected_status):
+    async def run():
+        solver_server = SolverServer(radix_tree)
+        server = await solver_server.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            # the connection is kept alive after an error
+            responses = [await _get(reader, writer, target),
+                         await _get(reader, writer, '/solve?center=o&others=ctpnme')]
+            writer.close()
+            return responses
+        finally:
+            await solver_server.stop()
+
+    (status, body), (next_status, _) = asyncio.run(run())
+
+    assert status == expected_status
+    assert 'error' in body
+    assert next_status == 200
+
+
+def test_solver_server_malformedRequestLine_returnsErrorAndClosesConnection(radix_tree):
+    async def run():
+        solver_server = SolverServer(radix_tree)
+        server = await solver_server.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'GET /solve\r\nHost: localhost\r\n\r\n')
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+        finally:
+            await solver_server.stop()
+
+    response = asyncio.run(run())
+
+    assert response.startswith(b'HTTP/1.1 400 Bad Request\r\n')
+    assert b'Connection: close\r\n' in response
+    assert 'error' in json.loads(response.partition(b'\r\n\r\n')[2])
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="Unix domain sockets are not supported")
+def test_solver_server_unixSocket_returnsSameAnswersAsRadixTreeSolver(puzzles, radix_tree):
+    puzzle = puzzles[0]
+
+    async def run(unix_socket_path):
+        solver_server = SolverServer(radix_tree)
+        await solver_server.start(unix_socket_path=unix_socket_path)
+        try:
+            return await _get_concurrently(lambda: asyncio.open_unix_connection(unix_socket_path),
+                                           [f'/solve?center={puzzle.get_center()}&others={puzzle.get_others()}'])
+        finally:
+            await solver_server.stop()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        [(status, body)] = asyncio.run(run(str(Path(tmp_dir) / 'solver.sock')))
+
+    assert status == 200
+    assert body['solutions'] == sorted(get_bee_solutions_radix_tree(puzzle.get_center(), puzzle.get_others(),
+                                                                    radix_tree))
+
+
+def test_solve_batch_sameLettersDifferentCenters_returnsSameAnswersAsRadixTreeSolver(puzzles, radix_tree):
+    letters = puzzles[0].get_center() + puzzles[0].get_others()
+    puzzles = [(center, ''.join(sorted(letters.replace(center, '')))) for center in letters]
+
+    results = SolverServer(radix_tree).solve_batch(puzzles)
+
+    for (center, others), result in zip(puzzles, results):
+        assert result['center'] == center
+        assert result['solutions'] == sorted(get_bee_solutions_radix_tree(center, others, radix_tree))
+
+
+def test_solve_batch_failingGroup_onlyFailsItsOwnPuzzles(puzzles, radix_tree, monkeypatch):
+    failing, working = puzzles[0], puzzles[1]
+
+    def get_bee_solutions_radix_tree_failing(center, others, tree):
+        if center == failing.get_center() and others == failing.get_others():
+            raise RuntimeError("Failed to solve.")
+        return get_bee_solutions_radix_tree(center, others, tree)
+
+    monkeypatch.setattr('solver_server.get_bee_solutions_radix_tree', get_bee_solutions_radix_tree_failing)
+
+    async def run():
+        solver_server = SolverServer(radix_tree, batch_window=0.05)
+        await solver_server.start('127.0.0.1', 0)
+        try:
+            return await asyncio.gather(*(solver_server.solve(p.get_center(), p.get_others())
+                                          for p in (failing, working)), return_exceptions=True)
+        finally:
+            await solver_server.stop()
+
+    failing_result, working_result = asyncio.run(run())
+
+    assert isinstance(failing_result, RuntimeError)
+    assert working_result['solutions'] == sorted(get_bee_solutions_radix_tree(working.get_center(),
+                                                                              working.get_others(), radix_tree))
+
+
+def test_solver_server_failingSolver_returnsInternalServerError(puzzles, radix_tree, monkeypatch):
+    failing, working = puzzles[0], puzzles[1]
+
+    def get_bee_solutions_radix_tree_failing(center, others, tree):
+        if center == failing.get_center() and others == failing.get_others():
+            raise KeyError('missing')
+        return get_bee_solutions_radix_tree(center, others, tree)
+
+    monkeypatch.setattr('solver_server.get_bee_solutions_radix_tree', get_bee_solutions_radix_tree_failing)
+
+    async def run():
+        solver_server = SolverServer(radix_tree)
+        server = await solver_server.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            # the connection is kept alive after an error
+            responses = [await _get(reader, writer, f'/solve?center={p.get_center()}&others={p.get_others()}')
+                         for p in (failing, working)]
+            writer.close()
+            return responses
+        finally:
+            await solver_server.stop()
+
+    (status, body), (next_status, _) = asyncio.run(run())
+
+    assert status == 500
+    assert 'KeyError' in body['error']
+    assert next_status == 200
+
+
+def test_stop_failsQueuedPuzzles(puzzles, radix_tree):
+    puzzle = puzzles[0]
+
+    async def run():
+        # the batch is still being gathered when the server is stopped
+        solver_server = SolverServer(radix_tree, batch_window=60)
+        await solver_server.start('127.0.0.1', 0)
+        solves = [asyncio.create_task(solver_server.solve(puzzle.get_center(), puzzle.get_others()))
+                  for _ in range(3)]
+        await asyncio.sleep(0.05)
+        await solver_server.stop()
+        return await asyncio.wait_for(asyncio.gather(*solves, return_exceptions=True), 1)
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_solver_server_repeatedRequests_servedFromCache(puzzles, radix_tree):
+    puzzle = puzzles[0]
+    target = f'/solve?center={puzzle.get_center()}&others={puzzle.get_others()}'
+
+    async def run():
+        solver_server = SolverServer(radix_tree, cache=BeeSolutionCache(), dictionary_version='test')
+        server = await solver_server.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            responses = [await _get(reader, writer, target) for _ in range(3)]
+            stats = await _get(reader, writer, '/stats')
+            writer.close()
+            return responses, stats
+        finally:
+            await solver_server.stop()
+
+    responses, (stats_status, stats) = asyncio.run(run())
+
+    assert all(response == responses[0] for response in responses)
+    assert responses[0][1]['solutions'] == sorted(get_bee_solutions_radix_tree(puzzle.get_center(),
+                                                                               puzzle.get_others(), radix_tree))
+    assert stats_status == 200
+    assert stats['batches'] == 1
+    assert (stats['cache']['hits'], stats['cache']['misses']) == (2, 1)
+
+
+def test_apply_dictionary_edits_nextRequestsUseEditedTree(puzzles, words):
+    puzzle = puzzles[0]
+    # the edits are applied in place, so the shared module fixture must not be used
+    radix_tree = preprocess_get_radix_tree_from_sorted(words)
+    before = get_bee_solutions_radix_tree(puzzle.get_center(), puzzle.get_others(), radix_tree)
+    new_word = puzzle.get_center() * 4
+
+    async def run():
+        solver_server = SolverServer(radix_tree, cache=BeeSolutionCache(), dictionary_version='v1')
+        await solver_server.start('127.0.0.1', 0)
+        try:
+            first = await solver_server.solve(puzzle.get_center(), puzzle.get_others())
+            await solver_server.apply_dictionary_edits([new_word], before[:1], 'v2')
+            second = await solver_server.solve(puzzle.get_center(), puzzle.get_others())
+            return first, second
+        finally:
+            await solver_server.stop()
+
+    first, second = asyncio.run(run())
+
+    assert first['solutions'] == sorted(before)
+    assert second['solutions'] == sorted(set(before[1:]) | {new_word})
@@ -0,0 +1,35 @@
+"""
+Tests the batch solver against the serial radix tree solver.
+"""
+
+import random
+
+import pytest
+
+from spelling_bee_batch_solver import solve_puzzles_in_parallel
+from spelling_bee_solvers import preprocess_get_radix_tree_from_sorted, get_bee_solutions_radix_tree
+
+@pytest.fixture(scope='module')
+def radix_tree(words):
+    return preprocess_get_radix_tree_from_sorted(words)
+
+
+# the tree is passed to the workers, so the tests never write to the index cache in data/cache
+def test_solve_puzzles_in_parallel_returnsSameAnswersAsSerialSolverInDateOrder(puzzles, radix_tree):
+    puzzles = puzzles[:200]
+    shuffled_puzzles = random.Random(0).sample(puzzles, len(puzzles))
+
+    results = list(solve_puzzles_in_parallel(shuffled_puzzles, max_workers=2, chunk_size=16, radix_tree=radix_tree))
+
+    assert [puzzle for puzzle, _ in results] == puzzles
+    for puzzle, sols in results:
+        assert sols == get_bee_solutions_radix_tree(puzzle.get_center(), puzzle.get_others(), radix_tree)
+
+
+def test_solve_puzzles_in_parallel_canStopEarly(puzzles, radix_tree):
+    results = solve_puzzles_in_parallel(puzzles, max_workers=2, chunk_size=16, radix_tree=radix_tree)
+
+    first_puzzle, _ = next(results)
+    results.close()
+
+    assert first_puzzle == puzzles[0]
@@ -0,0 +1,93 @@
+"""
+Tests the LRU solution cache.
+"""
+
+import pytest
+
+from spelling_bee_cache import BeeSolutionCache
+from spelling_bee_solvers import preprocess_get_radix_tree_from_sorted, get_bee_solutions_radix_tree
+
+@pytest.fixture(scope='module')
+def radix_tree(words):
+    return preprocess_get_radix_tree_from_sorted(words)
+
+
+def test_get_or_solve_returnsSameAnswersAsSolverAndOnlySolvesOnce(puzzles, radix_tree):
+    cache = BeeSolutionCache()
+    solver_calls = []
+
+    def solver(center, others):
+        solver_calls.append((center, others))
+        return get_bee_solutions_radix_tree(center, others, radix_tree)
+
+    for p in puzzles[:50]:
+        expected = get_bee_solutions_radix_tree(p.get_center(), p.get_others(), radix_tree)
+        assert cache.get_or_solve(p.get_center(), p.get_others(), solver) == expected
+        # the order of the other letters doesn't matter
+        assert cache.get_or_solve(p.get_center(), p.get_others()[::-1], solver) == expected
+
+    assert len(solver_calls) == 50
+    assert cache.get_stats() == {'entries': 50, 'bytes': cache.get_stats()['bytes'], 'hits': 50, 'misses': 50,
+                                 'evictions': 0, 'hit_rate': 0.5}
+
+
+def test_get_differentDictionaryVersion_isMiss():
+    cache = BeeSolutionCache()
+    cache.put('o', 'ctpnme', ['come'], dictionary_version='v1')
+
+    assert cache.get('o', 'ctpnme', dictionary_version='v1') == ['come']
+    assert cache.get('o', 'ctpnme', dictionary_version='v2') is None
+    assert cache.get('o', 'ctpnme') is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_get_returnsCopy():
+    cache = BeeSolutionCache()
+    solutions = ['come']
+    cache.put('o', 'ctpnme', solutions)
+    solutions.append('cone')
+    cache.get('o', 'ctpnme').append('comet')
+
+    assert cache.get('o', 'ctpnme') == ['come']
+
+
+def test_put_moreThanMaxEntries_evictsLeastRecentlyUsed():
+    cache = BeeSolutionCache(max_entries=2)
+    cache.put('a', 'bcdefg', ['a'])
+    cache.put('b', 'acdefg', ['b'])
+    # 'a' is now more recently used than 'b'
+    cache.get('a', 'bcdefg')
+    cache.put('c', 'abdefg', ['c'])
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get('b', 'acdefg') is None
+    assert cache.get('a', 'bcdefg') == ['a']
+    assert cache.get('c', 'abdefg') == ['c']
+
+
+def test_put_moreThanMaxBytes_evictsUntilWithinBound():
+    one_entry_size = BeeSolutionCache(max_entries=1)
+    one_entry_size.put('a', 'bcdefg', ['abcd'] * 10)
+    cache = BeeSolutionCache(max_bytes=one_entry_size.get_stats()['bytes'] * 2)
+
+    for center in 'abc':
+        cache.put(center, 'defghi', ['abcd'] * 10)
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get_stats()['bytes'] <= one_entry_size.get_stats()['bytes'] * 2
+    assert cache.get('a', 'defghi') is None
+
+
+def test_put_solutionsBiggerThanMaxBytes_notCached():
+    cache = BeeSolutionCache(max_bytes=10)
+    cache.put('a', 'bcdefg', ['abcd'])
+
+    assert len(cache) == 0
+    assert cache.get('a', 'bcdefg') is None
+
+
+def test_init_invalidMaxEntries_raisesError():
+    with pytest.raises(ValueError):
+        BeeSolutionCache(max_entries=0)
@@ -0,0 +1,48 @@
+"""
+Tests the scoring functions. The puzzle totals are checked against the scores of the actual solutions for every puzzle
+we have in our database.
+"""
+
+import pytest
+
+from spelling_bee_scoring import get_word_score, get_bee_score, preprocess_get_bit_to_score_dict, \
+    get_bee_puzzle_totals, get_bee_rank_thresholds, get_bee_rank
+from spelling_bee_solvers import get_bee_solutions_bitwise_submask, is_bee_pangram
+
+
+@pytest.fixture(scope='module')
+def bit_to_score_dict(bit_to_word_dict):
+    return preprocess_get_bit_to_score_dict(bit_to_word_dict)
+
+
+@pytest.mark.parametrize('word, score', [('moon', 1), ('comet', 5), ('potion', 6), ('competent', 9 + 7)])
+def test_get_word_score_followsNytRules(word, score):
+    assert get_word_score(word) == score
+
+
+def test_get_bee_puzzle_totals_matchesScoreOfSolutions(bit_to_word_dict, bit_to_score_dict, puzzle):
+    sols = get_bee_solutions_bitwise_submask(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict)
+
+    max_score, solution_count, pangram_count = get_bee_puzzle_totals(puzzle.get_center(), puzzle.get_others(),
+                                                                     bit_to_score_dict)
+
+    assert max_score == get_bee_score(sols)
+    assert solution_count == len(sols)
+    assert pangram_count == len([s for s in sols if is_bee_pangram(s)])
+
+
+def test_get_bee_rank_thresholds_roundsToNearestPoint():
+    thresholds = get_bee_rank_thresholds(150)
+
+    assert thresholds['Beginner'] == 0
+    assert thresholds['Good Start'] == 3
+    assert thresholds['Solid'] == 23  # 22.5 rounds up
+    assert thresholds['Genius'] == 105
+    assert thresholds['Queen Bee'] == 150
+
+
+def test_get_bee_rank_returnsHighestRankReached():
+    assert get_bee_rank(0, 150) == 'Beginner'
+    assert get_bee_rank(104, 150) == 'Amazing'
+    assert get_bee_rank(105, 150) == 'Genius'
+    assert get_bee_rank(150, 150) == 'Queen Bee'
@@ -0,0 +1,53 @@
+"""
+Tests the NumPy solvers against every puzzle we have in our database. NumPy is an optional dependency, so these are
+skipped if it isn't installed.
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from data.binary_dictionary import BinaryDictionary, preprocess_get_binary_dictionary
+from spelling_bee_solvers import get_bee_solutions_naive
+from spelling_bee_solvers_numpy import preprocess_get_numpy_word_masks, get_bee_solutions_numpy, \
+    get_puzzle_masks_numpy, get_bee_solutions_numpy_batch, preprocess_get_numpy_word_masks_from_binary
+
+
+@pytest.fixture(scope='module')
+def numpy_word_masks(words):
+    return preprocess_get_numpy_word_masks(words)
+
+
+def test_get_bee_solutions_numpy_returnsAllSolutionsFromOfficialSolutionList(numpy_word_masks, puzzle):
+    sols = get_bee_solutions_numpy(puzzle.get_center(), puzzle.get_others(), *numpy_word_masks)
+
+    # our solvers can have more than the valid NYT solutions, but never less
+    missing_solutions = puzzle.get_solutions() - set(sols)
+    assert len(
+        missing_solutions) == 0, (f"Generated solutions did not contain the following words from the official answers "
+                                  f"list: {puzzle.get_solutions() - set(sols)}")
+
+
+def test_get_bee_solutions_numpy_returnsSameAnswersAsNaive(numpy_word_masks, words, puzzle):
+    sols = get_bee_solutions_numpy(puzzle.get_center(), puzzle.get_others(), *numpy_word_masks)
+
+    assert sols == get_bee_solutions_naive(puzzle.get_center(), puzzle.get_others(), words)
+
+
+def test_get_bee_solutions_numpy_batch_returnsSameAnswersAsSingleSolver(numpy_word_masks, puzzles):
+    puzzle_masks = get_puzzle_masks_numpy([(p.get_center(), p.get_others()) for p in puzzles])
+
+    # odd chunk size so the last chunk is partial
+    batch_sols = get_bee_solutions_numpy_batch(puzzle_masks, *numpy_word_masks, chunk_size=7)
+
+    assert len(batch_sols) == len(puzzles)
+    for puzzle, sols in zip(puzzles, batch_sols):
+        assert sols == get_bee_solutions_numpy(puzzle.get_center(), puzzle.get_others(), *numpy_word_masks)
+
+
+def test_preprocess_get_numpy_word_masks_from_binary_returnsSameArrays(numpy_word_masks, words):
+    word_masks, words = preprocess_get_numpy_word_masks_from_binary(
+        BinaryDictionary(preprocess_get_binary_dictionary(words)))
+
+    assert np.array_equal(word_masks, numpy_word_masks[0])
+    assert np.array_equal(words, numpy_word_masks[1])
@@ -6,29 +6,49 @@ This is mostly a safeguard against when I make changes to the solvers. It's some
 something because you might be missing only a few of the correct answers.
 """
 
+import random
+
 import pytest
 
-from data.dictionary_utils import get_custom_dictionary
-from data.puzzles_utils import get_puzzles_from_file, NYTBeePuzzle
+from data.index_utils import serialize_dawg, deserialize_dawg
 from spelling_bee_solvers import get_bee_solutions_naive, preprocess_get_bit_to_word_dict, get_bee_solutions_bitwise, \
     preprocess_get_prefix_tree, get_bee_solutions_prefix_tree, preprocess_get_nested_prefix_tree, \
-    get_bee_solutions_nested_prefix_tree, preprocess_get_radix_tree, get_bee_solutions_radix_tree
+    get_bee_solutions_nested_prefix_tree, preprocess_get_radix_tree, get_bee_solutions_radix_tree, \
+    get_bee_solutions_bitwise_submask, preprocess_get_answer_table, get_bee_solutions_answer_table, \
+    preprocess_get_annotated_radix_tree, get_bee_solutions_annotated_radix_tree, \
+    preprocess_get_compact_trie, get_bee_solutions_compact_trie, preprocess_get_dawg, get_bee_solutions_dawg, \
+    preprocess_get_prefix_tree_from_sorted, preprocess_get_nested_prefix_tree_from_sorted, \
+    preprocess_get_radix_tree_from_sorted, iter_bee_solutions_radix_tree, iter_bee_solutions_bitwise_submask, \
+    get_first_bee_pangram, get_first_n_bee_solutions, get_longest_bee_solutions, is_bee_pangram, \
+    get_bee_solutions_all_centers_radix_tree, insert_word_into_radix_tree, delete_word_from_radix_tree, \
+    update_radix_tree, insert_word_into_bit_to_word_dict, delete_word_from_bit_to_word_dict, update_bit_to_word_dict
+
+def test_get_bee_solutions_naive_returnsAllSolutionsFromOfficialSolutionList(words, puzzle):
+    sols = get_bee_solutions_naive(puzzle.get_center(), puzzle.get_others(), words)
 
-PUZZLES = [p[1] for p in sorted(get_puzzles_from_file().items())]
-WORDS = get_custom_dictionary()
+    # our solvers can have more than the valid NYT solutions, but never less
+    missing_solutions = puzzle.get_solutions() - set(sols)
+    assert len(
+        missing_solutions) == 0, (f"Generated solutions did not contain the following words from the official answers "
+                                  f"list: {puzzle.get_solutions() - set(sols)}")
 
 
-def puzzle_generator() -> NYTBeePuzzle:
-    yield from PUZZLES
+def test_get_bee_solutions_naive_allReturnedSolutionsAreValid(words, puzzle):
+    sols = get_bee_solutions_naive(puzzle.get_center(), puzzle.get_others(), words)
 
+    invalid_sols = set()
+    valid_letters = set(puzzle.get_center() + puzzle.get_others())
+    for sol in sols:
+        if len(set(sol) - valid_letters) > 0:
+            invalid_sols.add(sol)
 
-def puzzle_id_generator(p: NYTBeePuzzle) -> str:
-    return f'{p.get_center()} | {p.get_others()}'
+    assert len(
+        invalid_sols) == 0, (f"The following solutions had letters that were not in the set of valid letters ("
+                             f"{valid_letters}: {invalid_sols})")
 
 
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
-def test_get_bee_solutions_naive_returnsAllSolutionsFromOfficialSolutionList(puzzle):
-    sols = get_bee_solutions_naive(puzzle.get_center(), puzzle.get_others(), WORDS)
+def test_get_bee_solutions_bitwise_returnsAllSolutionsFromOfficialSolutionList(bit_to_word_dict, puzzle):
+    sols = get_bee_solutions_bitwise(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict)
 
     # our solvers can have more than the valid NYT solutions, but never less
     missing_solutions = puzzle.get_solutions() - set(sols)
@@ -37,9 +57,8 @@ def test_get_bee_solutions_naive_returnsAllSolutionsFromOfficialSolutionList(puz
                                   f"list: {puzzle.get_solutions() - set(sols)}")
 
 
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
-def test_get_bee_solutions_naive_allReturnedSolutionsAreValid(puzzle):
-    sols = get_bee_solutions_naive(puzzle.get_center(), puzzle.get_others(), WORDS)
+def test_get_bee_solutions_bitwise_allReturnedSolutionsAreValid(bit_to_word_dict, puzzle):
+    sols = get_bee_solutions_bitwise(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict)
 
     invalid_sols = set()
     valid_letters = set(puzzle.get_center() + puzzle.get_others())
@@ -52,14 +71,8 @@ def test_get_bee_solutions_naive_allReturnedSolutionsAreValid(puzzle):
                              f"{valid_letters}: {invalid_sols})")
 
 
-@pytest.fixture(scope='module')
-def bit_to_word_dict():
-    return preprocess_get_bit_to_word_dict(WORDS)
-
-
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
-def test_get_bee_solutions_bitwise_returnsAllSolutionsFromOfficialSolutionList(bit_to_word_dict, puzzle):
-    sols = get_bee_solutions_bitwise(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict)
+def test_get_bee_solutions_bitwise_submask_returnsAllSolutionsFromOfficialSolutionList(bit_to_word_dict, puzzle):
+    sols = get_bee_solutions_bitwise_submask(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict)
 
     # our solvers can have more than the valid NYT solutions, but never less
     missing_solutions = puzzle.get_solutions() - set(sols)
@@ -68,9 +81,8 @@ def test_get_bee_solutions_bitwise_returnsAllSolutionsFromOfficialSolutionList(b
                                   f"list: {puzzle.get_solutions() - set(sols)}")
 
 
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
-def test_get_bee_solutions_bitwise_allReturnedSolutionsAreValid(bit_to_word_dict, puzzle):
-    sols = get_bee_solutions_bitwise(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict)
+def test_get_bee_solutions_bitwise_submask_allReturnedSolutionsAreValid(bit_to_word_dict, puzzle):
+    sols = get_bee_solutions_bitwise_submask(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict)
 
     invalid_sols = set()
     valid_letters = set(puzzle.get_center() + puzzle.get_others())
@@ -84,11 +96,10 @@ def test_get_bee_solutions_bitwise_allReturnedSolutionsAreValid(bit_to_word_dict
 
 
 @pytest.fixture(scope='module')
-def prefix_tree():
-    return preprocess_get_prefix_tree(WORDS)
+def prefix_tree(words):
+    return preprocess_get_prefix_tree(words)
 
 
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
 def test_get_bee_solutions_prefix_tree_returnsAllSolutionsFromOfficialSolutionList(prefix_tree, puzzle):
     sols = get_bee_solutions_prefix_tree(puzzle.get_center(), puzzle.get_others(), prefix_tree)
 
@@ -99,7 +110,6 @@ def test_get_bee_solutions_prefix_tree_returnsAllSolutionsFromOfficialSolutionLi
                                   f"list: {puzzle.get_solutions() - set(sols)}")
 
 
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
 def test_get_bee_solutions_prefix_tree_allReturnedSolutionsAreValid(prefix_tree, puzzle):
     sols = get_bee_solutions_prefix_tree(puzzle.get_center(), puzzle.get_others(), prefix_tree)
 
@@ -115,11 +125,10 @@ def test_get_bee_solutions_prefix_tree_allReturnedSolutionsAreValid(prefix_tree,
 
 
 @pytest.fixture(scope='module')
-def nested_prefix_tree():
-    return preprocess_get_nested_prefix_tree('', WORDS, {})
+def nested_prefix_tree(words):
+    return preprocess_get_nested_prefix_tree('', words, {})
 
 
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
 def test_get_bee_solutions_nested_prefix_tree_returnsAllSolutionsFromOfficialSolutionList(nested_prefix_tree, puzzle):
     sols = get_bee_solutions_nested_prefix_tree(puzzle.get_center(), puzzle.get_others(), nested_prefix_tree)
 
@@ -130,7 +139,6 @@ def test_get_bee_solutions_nested_prefix_tree_returnsAllSolutionsFromOfficialSol
                                   f"list: {puzzle.get_solutions() - set(sols)}")
 
 
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
 def test_get_bee_solutions_nested_prefix_tree_allReturnedSolutionsAreValid(nested_prefix_tree, puzzle):
     sols = get_bee_solutions_nested_prefix_tree(puzzle.get_center(), puzzle.get_others(), nested_prefix_tree)
 
@@ -146,11 +154,10 @@ def test_get_bee_solutions_nested_prefix_tree_allReturnedSolutionsAreValid(neste
 
 
 @pytest.fixture(scope='module')
-def radix_tree():
-    return preprocess_get_radix_tree(WORDS, {})
+def radix_tree(words):
+    return preprocess_get_radix_tree(words, {})
 
 
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
 def test_get_bee_solutions_radix_tree_returnsAllSolutionsFromOfficialSolutionList(radix_tree, puzzle):
     sols = get_bee_solutions_radix_tree(puzzle.get_center(), puzzle.get_others(), radix_tree)
 
@@ -161,7 +168,6 @@ def test_get_bee_solutions_radix_tree_returnsAllSolutionsFromOfficialSolutionLis
                                   f"list: {puzzle.get_solutions() - set(sols)}")
 
 
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
 def test_get_bee_solutions_radix_tree_allReturnedSolutionsAreValid(radix_tree, puzzle):
     sols = get_bee_solutions_radix_tree(puzzle.get_center(), puzzle.get_others(), radix_tree)
 
@@ -176,21 +182,253 @@ def test_get_bee_solutions_radix_tree_allReturnedSolutionsAreValid(radix_tree, p
                              f"{valid_letters}: {invalid_sols})")
 
 
-@pytest.mark.parametrize('puzzle', puzzle_generator(), ids=puzzle_id_generator)
-def test_all_solvers_return_the_same_answers(bit_to_word_dict, prefix_tree, nested_prefix_tree, radix_tree, puzzle):
+@pytest.fixture(scope='module')
+def annotated_radix_tree(words):
+    return preprocess_get_annotated_radix_tree(preprocess_get_radix_tree(words, {}))
+
+
+def test_get_bee_solutions_annotated_radix_tree_returnsAllSolutionsFromOfficialSolutionList(annotated_radix_tree,
+                                                                                            puzzle):
+    sols = get_bee_solutions_annotated_radix_tree(puzzle.get_center(), puzzle.get_others(), annotated_radix_tree)
+
+    # our solvers can have more than the valid NYT solutions, but never less
+    missing_solutions = puzzle.get_solutions() - set(sols)
+    assert len(
+        missing_solutions) == 0, (f"Generated solutions did not contain the following words from the official answers "
+                                  f"list: {puzzle.get_solutions() - set(sols)}")
+
+
+def test_get_bee_solutions_annotated_radix_tree_allReturnedSolutionsAreValid(annotated_radix_tree, puzzle):
+    sols = get_bee_solutions_annotated_radix_tree(puzzle.get_center(), puzzle.get_others(), annotated_radix_tree)
+
+    invalid_sols = set()
+    valid_letters = set(puzzle.get_center() + puzzle.get_others())
+    for sol in sols:
+        if len(set(sol) - valid_letters) > 0:
+            invalid_sols.add(sol)
+
+    assert len(
+        invalid_sols) == 0, (f"The following solutions had letters that were not in the set of valid letters ("
+                             f"{valid_letters}: {invalid_sols})")
+
+
+@pytest.fixture(scope='module')
+def answer_table(words):
+    return preprocess_get_answer_table(words)
+
+
+def test_get_bee_solutions_answer_table_returnsAllSolutionsFromOfficialSolutionList(answer_table, puzzle):
+    sols = get_bee_solutions_answer_table(puzzle.get_center(), puzzle.get_others(), answer_table)
+
+    # our solvers can have more than the valid NYT solutions, but never less
+    missing_solutions = puzzle.get_solutions() - set(sols)
+    assert len(
+        missing_solutions) == 0, (f"Generated solutions did not contain the following words from the official answers "
+                                  f"list: {puzzle.get_solutions() - set(sols)}")
+
+
+def test_get_bee_solutions_answer_table_allReturnedSolutionsAreValid(answer_table, puzzle):
+    sols = get_bee_solutions_answer_table(puzzle.get_center(), puzzle.get_others(), answer_table)
+
+    invalid_sols = set()
+    valid_letters = set(puzzle.get_center() + puzzle.get_others())
+    for sol in sols:
+        if len(set(sol) - valid_letters) > 0:
+            invalid_sols.add(sol)
+
+    assert len(
+        invalid_sols) == 0, (f"The following solutions had letters that were not in the set of valid letters ("
+                             f"{valid_letters}: {invalid_sols})")
+
+
+def test_get_bee_solutions_answer_table_raisesLookupErrorForLettersWithoutPangram(answer_table):
+    with pytest.raises(LookupError):
+        get_bee_solutions_answer_table('q', 'jkvwxz', answer_table)
+
+
+@pytest.fixture(scope='module')
+def compact_trie(words):
+    return preprocess_get_compact_trie(words)
+
+
+def test_get_bee_solutions_compact_trie_returnsAllSolutionsFromOfficialSolutionList(compact_trie, puzzle):
+    sols = get_bee_solutions_compact_trie(puzzle.get_center(), puzzle.get_others(), compact_trie)
+
+    # our solvers can have more than the valid NYT solutions, but never less
+    missing_solutions = puzzle.get_solutions() - set(sols)
+    assert len(
+        missing_solutions) == 0, (f"Generated solutions did not contain the following words from the official answers "
+                                  f"list: {puzzle.get_solutions() - set(sols)}")
+
+
+def test_get_bee_solutions_compact_trie_allReturnedSolutionsAreValid(compact_trie, puzzle):
+    sols = get_bee_solutions_compact_trie(puzzle.get_center(), puzzle.get_others(), compact_trie)
+
+    invalid_sols = set()
+    valid_letters = set(puzzle.get_center() + puzzle.get_others())
+    for sol in sols:
+        if len(set(sol) - valid_letters) > 0:
+            invalid_sols.add(sol)
+
+    assert len(
+        invalid_sols) == 0, (f"The following solutions had letters that were not in the set of valid letters ("
+                             f"{valid_letters}: {invalid_sols})")
+
+
+@pytest.fixture(scope='module')
+def dawg(words):
+    return preprocess_get_dawg(words)
+
+
+def test_get_bee_solutions_dawg_returnsAllSolutionsFromOfficialSolutionList(dawg, puzzle):
+    sols = get_bee_solutions_dawg(puzzle.get_center(), puzzle.get_others(), dawg)
+
+    # our solvers can have more than the valid NYT solutions, but never less
+    missing_solutions = puzzle.get_solutions() - set(sols)
+    assert len(
+        missing_solutions) == 0, (f"Generated solutions did not contain the following words from the official answers "
+                                  f"list: {puzzle.get_solutions() - set(sols)}")
+
+
+def test_get_bee_solutions_dawg_allReturnedSolutionsAreValid(dawg, puzzle):
+    sols = get_bee_solutions_dawg(puzzle.get_center(), puzzle.get_others(), dawg)
+
+    invalid_sols = set()
+    valid_letters = set(puzzle.get_center() + puzzle.get_others())
+    for sol in sols:
+        if len(set(sol) - valid_letters) > 0:
+            invalid_sols.add(sol)
+
+    assert len(
+        invalid_sols) == 0, (f"The following solutions had letters that were not in the set of valid letters ("
+                             f"{valid_letters}: {invalid_sols})")
+
+
+def test_deserialize_dawg_returnsSameDawgAsSerialized(dawg):
+    deserialized_dawg = deserialize_dawg(serialize_dawg(dawg))
+
+    assert deserialized_dawg == dawg
+    # shared nodes should still be shared, i.e. serializing again should give exactly the same nodes
+    assert serialize_dawg(deserialized_dawg) == serialize_dawg(dawg)
+
+
+def test_preprocess_get_prefix_tree_from_sorted_returnsSameTreeAsPreprocessGetPrefixTree(words, prefix_tree):
+    assert preprocess_get_prefix_tree_from_sorted(words) == prefix_tree
+
+
+def test_preprocess_get_nested_prefix_tree_from_sorted_returnsSameTreeAsPreprocessGetNestedPrefixTree(
+        words, nested_prefix_tree):
+    assert preprocess_get_nested_prefix_tree_from_sorted(words) == nested_prefix_tree
+
+
+def test_preprocess_get_radix_tree_from_sorted_returnsSameTreeAsPreprocessGetRadixTree(words, radix_tree):
+    assert preprocess_get_radix_tree_from_sorted(words) == radix_tree
+
+
+@pytest.mark.parametrize('builder', [preprocess_get_prefix_tree_from_sorted,
+                                     preprocess_get_nested_prefix_tree_from_sorted,
+                                     preprocess_get_radix_tree_from_sorted])
+def test_preprocess_from_sorted_raisesValueErrorForUnsortedWords(builder):
+    with pytest.raises(ValueError):
+        builder(['bee', 'ant'])
+
+
+def test_iter_bee_solutions_returnSameAnswersAsListVersions(bit_to_word_dict, radix_tree, puzzle):
+    assert list(iter_bee_solutions_radix_tree(puzzle.get_center(), puzzle.get_others(), radix_tree)) == \
+           get_bee_solutions_radix_tree(puzzle.get_center(), puzzle.get_others(), radix_tree)
+    assert list(iter_bee_solutions_bitwise_submask(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict)) == \
+           get_bee_solutions_bitwise_submask(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict)
+
+
+def test_iter_bee_solutions_radix_tree_raisesValueErrorBeforeIterating(radix_tree):
+    with pytest.raises(ValueError):
+        iter_bee_solutions_radix_tree('o', 'ctpnm', radix_tree)
+
+
+def test_early_termination_helpers_returnExpectedSolutions(radix_tree):
+    all_sols = get_bee_solutions_radix_tree('o', 'ctpnme', radix_tree)
+
+    assert get_first_bee_pangram(iter_bee_solutions_radix_tree('o', 'ctpnme', radix_tree)) == \
+           next(s for s in all_sols if is_bee_pangram(s))
+    assert get_first_n_bee_solutions(iter_bee_solutions_radix_tree('o', 'ctpnme', radix_tree), 5) == all_sols[:5]
+    assert [len(s) for s in get_longest_bee_solutions(iter_bee_solutions_radix_tree('o', 'ctpnme', radix_tree), 3)] \
+           == sorted((len(s) for s in all_sols), reverse=True)[:3]
+
+
+def test_get_bee_solutions_all_centers_radix_tree_returnsSameAnswersAsEachCenterSeparately(radix_tree, puzzle):
+    letters = puzzle.get_center() + puzzle.get_others()
+
+    all_center_sols = get_bee_solutions_all_centers_radix_tree(letters, radix_tree)
+
+    assert set(all_center_sols) == set(letters)
+    for center in letters:
+        others = letters.replace(center, '')
+        assert all_center_sols[center] == get_bee_solutions_radix_tree(center, others, radix_tree)
+
+
+def test_update_radix_tree_and_bit_to_word_dict_returnSameStructuresAsRegenerating(words):
+    shuffled_words = random.Random(0).sample(words, len(words))
+    words_to_add = set(shuffled_words[:500])
+    words_to_delete = set(shuffled_words[500:1000])
+    starting_words = sorted(set(words) - words_to_add)
+    updated_words = sorted(set(words) - words_to_delete)
+
+    radix_tree = preprocess_get_radix_tree_from_sorted(starting_words)
+    update_radix_tree(radix_tree, words_to_add, words_to_delete)
+    bit_to_word_dict = preprocess_get_bit_to_word_dict(starting_words)
+    update_bit_to_word_dict(bit_to_word_dict, words_to_add, words_to_delete)
+
+    # deleted words must not leave any empty branches behind
+    assert radix_tree == preprocess_get_radix_tree_from_sorted(updated_words)
+    assert bit_to_word_dict == preprocess_get_bit_to_word_dict(updated_words)
+
+
+def test_insert_and_delete_word_returnWhetherTreeChanged():
+    radix_tree = preprocess_get_radix_tree_from_sorted(['comet', 'cometh'])
+    bit_to_word_dict = preprocess_get_bit_to_word_dict(['comet', 'cometh'])
+
+    assert not insert_word_into_radix_tree('comet', radix_tree)
+    assert not insert_word_into_bit_to_word_dict('comet', bit_to_word_dict)
+    assert not delete_word_from_radix_tree('come', radix_tree)
+    assert not delete_word_from_bit_to_word_dict('come', bit_to_word_dict)
+    assert not delete_word_from_radix_tree('comets', radix_tree)
+
+    assert delete_word_from_radix_tree('cometh', radix_tree)
+    assert delete_word_from_bit_to_word_dict('cometh', bit_to_word_dict)
+    assert radix_tree == preprocess_get_radix_tree_from_sorted(['comet'])
+    assert bit_to_word_dict == preprocess_get_bit_to_word_dict(['comet'])
+
+    assert delete_word_from_radix_tree('comet', radix_tree)
+    assert radix_tree == {}
+
+
+def test_all_solvers_return_the_same_answers(words, bit_to_word_dict, prefix_tree, nested_prefix_tree, radix_tree,
+                                             annotated_radix_tree, answer_table, compact_trie, dawg, puzzle):
     """
     Tests the unlikely corner case where a change we make means that one solver returns more/less answers than the
     others, while still returning all the correct answers as per the official list.
     """
-    naive_sols = set(get_bee_solutions_naive(puzzle.get_center(), puzzle.get_others(), WORDS))
+    naive_sols = set(get_bee_solutions_naive(puzzle.get_center(), puzzle.get_others(), words))
     bitwise_sols = set(get_bee_solutions_bitwise(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict))
+    bitwise_submask_sols = set(
+        get_bee_solutions_bitwise_submask(puzzle.get_center(), puzzle.get_others(), bit_to_word_dict))
     prefix_sols = set(get_bee_solutions_prefix_tree(puzzle.get_center(), puzzle.get_others(), prefix_tree))
     nested_prefix_sols = set(
         get_bee_solutions_nested_prefix_tree(puzzle.get_center(), puzzle.get_others(), nested_prefix_tree))
     radix_sols = set(get_bee_solutions_radix_tree(puzzle.get_center(), puzzle.get_others(), radix_tree))
+    annotated_radix_sols = set(
+        get_bee_solutions_annotated_radix_tree(puzzle.get_center(), puzzle.get_others(), annotated_radix_tree))
+    answer_table_sols = set(get_bee_solutions_answer_table(puzzle.get_center(), puzzle.get_others(), answer_table))
+    compact_trie_sols = set(get_bee_solutions_compact_trie(puzzle.get_center(), puzzle.get_others(), compact_trie))
+    dawg_sols = set(get_bee_solutions_dawg(puzzle.get_center(), puzzle.get_others(), dawg))
 
     # list out separately for nicer error messages
     assert naive_sols == bitwise_sols
+    assert naive_sols == bitwise_submask_sols
     assert naive_sols == prefix_sols
     assert naive_sols == nested_prefix_sols
     assert naive_sols == radix_sols
+    assert naive_sols == annotated_radix_sols
+    assert naive_sols == answer_table_sols
+    assert naive_sols == compact_trie_sols
+    assert naive_sols == dawg_sols
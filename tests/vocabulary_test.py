@@ -0,0 +1,36 @@
+"""
+Tests interning words in a vocabulary.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from data.dictionary_utils import get_dictionary_from_path
+from data.vocabulary import Vocabulary
+
+WORDS = get_dictionary_from_path('data/custom/nyt_spelling_bee_dictionary.txt')
+
+
+def test_get_word_ids_assignsIdsInOrderFirstSeen():
+    vocabulary = Vocabulary(['bcde', 'abcd'])
+
+    assert vocabulary.get_word_ids(['abcd', 'cdef', 'bcde', 'cdef']) == [1, 2, 0, 2]
+    assert len(vocabulary) == 3
+    assert 'cdef' in vocabulary
+    assert 'defg' not in vocabulary
+
+
+def test_get_words_returnsWordsOfIds():
+    vocabulary = Vocabulary()
+    word_ids = vocabulary.get_word_ids(WORDS)
+
+    assert vocabulary.get_words(word_ids) == WORDS
+    assert vocabulary.get_word(word_ids[-1]) == WORDS[-1]
+
+
+def test_get_word_id_assignsEachWordOneIdAcrossThreads():
+    vocabulary = Vocabulary()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        all_word_ids = list(executor.map(vocabulary.get_word_ids, [WORDS, WORDS[::-1], WORDS, WORDS[::-1]]))
+
+    assert len(vocabulary) == len(WORDS)
+    assert all_word_ids[0] == all_word_ids[2] == all_word_ids[1][::-1] == all_word_ids[3][::-1]
+    assert vocabulary.get_words(all_word_ids[0]) == WORDS
@@ -0,0 +1,51 @@
+"""
+Tests the streaming word list pipeline against the in memory versions.
+"""
+import json
+import random
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from data.dictionary_utils import get_dictionary_from_path, write_words_to_dictionary
+from data.wordlist_pipeline import read_json_words, sort_words, process_wordlist, write_words
+from util.project_path import project_path
+
+RAW_JSON_PATH = 'data/raw_word_lists/2of12id.json'
+WORDS = get_dictionary_from_path('data/processed/words_2of12id.txt')
+
+
+@pytest.mark.parametrize('run_size', [1, 7, 1000, 1_000_000])
+def test_sort_words_returnsSameAsSorted(run_size):
+    words = random.Random(0).sample(WORDS, 5000) * 2
+
+    assert list(sort_words(words, run_size=run_size)) == sorted(set(words))
+    assert list(sort_words(words, unique=False, run_size=run_size)) == sorted(words)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 13, 1 << 20])
+def test_read_json_words_returnsSameWordsAsJsonLoad(chunk_size):
+    with open(project_path(RAW_JSON_PATH), 'r') as f:
+        expected = [word for words in json.load(f).values() for word in words]
+
+    if chunk_size == 1:
+        # reading one character at a time is slow, so only check the start of the file
+        words = read_json_words(RAW_JSON_PATH, chunk_size)
+        assert [next(words) for _ in range(1000)] == expected[:1000]
+    else:
+        assert list(read_json_words(RAW_JSON_PATH, chunk_size)) == expected
+
+
+def test_process_wordlist_returnsSameWordsAsWriteWordsToDictionary():
+    with tempfile.TemporaryDirectory(dir=project_path('data')) as tmp_dir:
+        tmp_dir = Path(tmp_dir).relative_to(project_path(''))
+        source_path = str(tmp_dir / 'source.txt')
+        write_words(random.Random(0).sample(WORDS, len(WORDS)), source_path)
+
+        word_count = process_wordlist(source_path, str(tmp_dir / 'streamed.txt'), run_size=10_000)
+        write_words_to_dictionary(WORDS, str(tmp_dir / 'in_memory.txt'))
+
+        streamed = get_dictionary_from_path(tmp_dir / 'streamed.txt')
+        assert len(streamed) == word_count
+        assert streamed == get_dictionary_from_path(tmp_dir / 'in_memory.txt')